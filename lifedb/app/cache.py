@@ -0,0 +1,118 @@
+"""Caching helpers for keeping web application data fresh without blocking requests."""
+
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def ttl_lru_cache(
+    *,
+    maxsize: int,
+    ttl_seconds: float,
+    clock: Callable[[], float] = time.monotonic,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Cache results of a function by its arguments, for at most `ttl_seconds`.
+
+    Like `functools.lru_cache`, the least recently used entry is evicted once
+    `maxsize` entries are cached, and the wrapped function gains `cache_clear`. Safe to
+    call from multiple threads, though concurrent misses on the same key may each call
+    the function. Ages are measured in seconds of `clock`.
+    """
+
+    def decorator(function: Callable[..., T]) -> Callable[..., T]:
+        entries: "OrderedDict[tuple, tuple[float, T]]" = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs) -> T:
+            key = (args, tuple(sorted(kwargs.items())))
+            now = clock()
+
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and now - entry[0] < ttl_seconds:
+                    entries.move_to_end(key)
+                    return entry[1]
+
+            value = function(*args, **kwargs)
+
+            with lock:
+                entries[key] = (now, value)
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+
+            return value
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+
+        return wrapper
+
+    return decorator
+
+
+class BackgroundRefreshedValue(Generic[T]):
+    """A value that is reloaded on a background thread at a fixed interval.
+
+    The first `get` loads the value in the calling thread. After that, `get` always
+    returns the latest loaded value immediately while a daemon thread reloads it every
+    `interval_seconds`. If a reload fails the previous value is kept.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], T],
+        *,
+        interval_seconds: float,
+        on_refresh: Optional[Callable[[T], None]] = None,
+    ):
+        self._load = load
+        self._interval_seconds = interval_seconds
+        self._on_refresh = on_refresh
+        self._value: Optional[T] = None
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self) -> T:
+        """Get the latest loaded value, loading it first if needed."""
+        if not self._loaded.is_set():
+            with self._lock:
+                if not self._loaded.is_set():
+                    self._set(self._load())
+                    self._thread = threading.Thread(
+                        target=self._refresh_forever, daemon=True
+                    )
+                    self._thread.start()
+
+        return self._value  # type: ignore[return-value]
+
+    def _set(self, value: T):
+        self._value = value
+        self._loaded.set()
+
+        if self._on_refresh is not None:
+            self._on_refresh(value)
+
+    def refresh(self):
+        """Reload the value now, keeping the previous value if that fails."""
+        try:
+            self._set(self._load())
+        except Exception:
+            logger.exception("Background refresh failed, keeping previous value.")
+
+    def _refresh_forever(self):
+        while True:
+            time.sleep(self._interval_seconds)
+            self.refresh()
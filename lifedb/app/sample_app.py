@@ -1,116 +1,363 @@
 """Sample Dash application using example HR data."""
 
 import os
+import re
+from datetime import date
+from math import ceil
+from typing import Any, Callable, Optional
 
 import pandas as pd
 import plotly.express as px
+import polars as pl
 import psycopg
-from dash import Dash, Input, Output, callback, dash_table, dcc, html
+from dash import Dash, Input, Output, State, callback, dash_table, dcc, html
+from dash.exceptions import PreventUpdate
 from dotenv import find_dotenv, load_dotenv
+from psycopg import sql
 
-from lifedb.core.exceptions import DBError
+from lifedb.app.cache import BackgroundRefreshedValue, ttl_lru_cache
+from lifedb.core.db import get_db_connection
+from lifedb.core.registry import REGISTRY_SQL, read_registry_snapshot
 
-DATA_SQL = """
+REGISTRY_COLUMNS = {
+    "employee_id": "numeric",
+    "employee_name": "text",
+    "employee_email": "text",
+    "department": "text",
+    "job_title": "text",
+    "employee_hire_date": "datetime",
+    "tenure": "numeric",
+    "mo_salary": "numeric",
+}
+
+# Unique and never null, so it makes any sort order total for keyset paging.
+REGISTRY_KEY_COLUMN = "employee_id"
+
+# Dash filter operators mapped to SQL, with "{}" standing in for the column.
+FILTER_OPERATORS = {
+    "=": "{} = %s",
+    "eq": "{} = %s",
+    "!=": "{} <> %s",
+    "ne": "{} <> %s",
+    "<": "{} < %s",
+    "lt": "{} < %s",
+    "<=": "{} <= %s",
+    "le": "{} <= %s",
+    ">": "{} > %s",
+    "gt": "{} > %s",
+    ">=": "{} >= %s",
+    "ge": "{} >= %s",
+    # Matched literally rather than with like, so % and _ in a value aren't wildcards.
+    "contains": "strpos(lower({}::text), lower(%s)) > 0",
+    "datestartswith": "starts_with({}::text, %s)",
+}
+
+# The same operators applied to a column of the registry snapshot.
+SNAPSHOT_FILTER_OPERATORS: dict[str, Callable[[pl.Expr, Any], pl.Expr]] = {
+    "=": lambda column, value: column == value,
+    "eq": lambda column, value: column == value,
+    "!=": lambda column, value: column != value,
+    "ne": lambda column, value: column != value,
+    "<": lambda column, value: column < value,
+    "lt": lambda column, value: column < value,
+    "<=": lambda column, value: column <= value,
+    "le": lambda column, value: column <= value,
+    ">": lambda column, value: column > value,
+    "gt": lambda column, value: column > value,
+    ">=": lambda column, value: column >= value,
+    "ge": lambda column, value: column >= value,
+    "contains": lambda column, value: column.cast(pl.String)
+    .str.to_lowercase()
+    .str.contains(str(value).lower(), literal=True),
+    "datestartswith": lambda column, value: column.cast(pl.String).str.starts_with(
+        str(value)
+    ),
+}
+
+FILTER_PART_PATTERN = re.compile(
+    r"^\{(?P<column>[^}]+)\}\s+[si]?(?P<operator>\S+)\s+(?P<value>.+)$"
+)
+
+# Department averages shown in the graph.
+DEPARTMENT_METRICS_SQL = """
 select
-    emps.employee_id,
-    emps.first_name as employee_first_name,
-    emps.last_name as employee_last_name,
-    emps.email as employee_email,
-    emps.phone_number as employee_phone_number,
-    emps.hire_date as employee_hire_date,
-    jobs.job_title,
-    depts.department_name as department,
-    locs.street_address as office_address,
-    locs.postal_code as office_postal_code,
-    locs.city as office_city,
-    locs.state_province as office_state_province,
-    locs.country_id as office_country_code,
-    emps.manager_id,
-    mans.first_name as manager_first_name,
-    mans.last_name as manager_last_name,
-    emps.salary as mo_salary,
-    -- Picking a random date in 2005 for interesting tenure.
-    date '2005-03-08' as data_as_of_date
-from sample.employees as emps
-left join sample.jobs
-    on emps.job_id = jobs.job_id
-left join sample.departments as depts
-    on emps.department_id = depts.department_id
-left join sample.locations as locs
-    on depts.location_id = locs.location_id
-left join sample.employees as mans
-    on emps.manager_id = mans.employee_id
+    department,
+    avg(mo_salary) as mo_salary,
+    avg(tenure) as tenure
+from ({registry_sql}) as registry
+group by department
+order by department
 """
 
 
 load_dotenv(find_dotenv())
 
+REFRESH_SECONDS = float(os.getenv("LIFEDB_APP_REFRESH_SECONDS", "300"))
+
+
+def _parse_filter_parts(filter_query: str) -> list[tuple[str, str, Any]]:
+    """Split a DataTable filter query into (column, operator, value) conditions.
+
+    Raises ValueError for columns or operators that aren't supported.
+    """
+    filter_parts = []
+
+    for filter_part in filter_query.split(" && ") if filter_query else []:
+        match = FILTER_PART_PATTERN.match(filter_part.strip())
+        if match is None:
+            raise ValueError(f"Unsupported filter {filter_part}.")
+
+        column = match["column"]
+        operator = match["operator"]
+        value: Any = match["value"].strip()
+
+        if column not in REGISTRY_COLUMNS or operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter {filter_part}.")
+
+        if len(value) > 1 and value[0] == value[-1] and value[0] in "\"'`":
+            value = value[1:-1].replace("\\" + value[0], value[0])
+        elif REGISTRY_COLUMNS[column] == "numeric":
+            value = float(value)
+
+        filter_parts.append((column, operator, value))
+
+    return filter_parts
+
+
+def parse_filter_query(filter_query: str) -> tuple[sql.Composable, tuple]:
+    """Translate a DataTable filter query into a SQL condition and its parameters.
+
+    Raises ValueError for columns or operators that aren't supported.
+    """
+    filter_parts = _parse_filter_parts(filter_query)
+
+    if not filter_parts:
+        return sql.SQL("true"), ()
+
+    return (
+        sql.SQL(" and ").join(
+            sql.SQL(FILTER_OPERATORS[operator]).format(sql.Identifier(column))
+            for column, operator, _ in filter_parts
+        ),
+        tuple(value for _, _, value in filter_parts),
+    )
+
+
+def get_filter_expression(filter_query: str) -> pl.Expr:
+    """Translate a DataTable filter query into a Polars filter on the snapshot.
+
+    Raises ValueError for columns or operators that aren't supported, and for values
+    that can't be compared with their column.
+    """
+    expression = pl.lit(True)
+
+    for column, operator, value in _parse_filter_parts(filter_query):
+        # Postgres parses values compared with date and numeric columns, even quoted
+        # ones, so they're parsed up front here.
+        if operator not in ("contains", "datestartswith"):
+            if REGISTRY_COLUMNS[column] == "datetime":
+                value = date.fromisoformat(str(value))
+            elif REGISTRY_COLUMNS[column] == "numeric":
+                value = float(value)
+
+        expression &= SNAPSHOT_FILTER_OPERATORS[operator](pl.col(column), value)
+
+    return expression
+
+
+def _get_keyset_condition(
+    sort_column: Optional[str], descending: bool, after_key: Optional[tuple]
+) -> tuple[sql.Composable, tuple]:
+    key = sql.Identifier(REGISTRY_KEY_COLUMN)
+
+    if after_key is None:
+        return sql.SQL("true"), ()
+
+    if sort_column is None:
+        return sql.SQL("{} > %s").format(key), (after_key[-1],)
+
+    column = sql.Identifier(sort_column)
+    last_value, last_key = after_key
+
+    # Nulls sort last, so after a null only nulls with a greater key remain.
+    if last_value is None:
+        return sql.SQL("{} is null and {} > %s").format(column, key), (last_key,)
+
+    return (
+        sql.SQL(
+            "({column} {comparison} %s or ({column} = %s and {key} > %s) "
+            "or {column} is null)"
+        ).format(
+            column=column,
+            comparison=sql.SQL("<" if descending else ">"),
+            key=key,
+        ),
+        (last_value, last_value, last_key),
+    )
+
 
-def get_db_env_var(env_var_name: str) -> str:
-    """Handle errors when environment variable is not populated."""
-    env_var = os.getenv(env_var_name)
+@ttl_lru_cache(maxsize=256, ttl_seconds=REFRESH_SECONDS)
+def load_registry_page(
+    *,
+    filter_query: str,
+    sort_column: Optional[str],
+    descending: bool,
+    after_key: Optional[tuple],
+    offset: int,
+    page_size: int,
+) -> list[dict]:
+    """Query one page of the registry table, from its snapshot if there is one.
 
-    if env_var is None:
-        raise DBError(
-            f"Missing environment variable {env_var_name} required for database "
-            "connection."
+    Pages start after `after_key` (the sort value and employee id of the previous
+    page's last row) when it is known, so the database seeks straight to the page.
+    Otherwise the first `offset` rows are skipped.
+    """
+    if sort_column is not None and sort_column not in REGISTRY_COLUMNS:
+        raise ValueError(f"Unknown column {sort_column}.")
+
+    registry = registry_snapshot.get()
+    if registry is not None:
+        sort_columns = [REGISTRY_KEY_COLUMN]
+        if sort_column is not None:
+            sort_columns.insert(0, sort_column)
+
+        # The snapshot is already in memory, so pages are sliced rather than sought.
+        return (
+            registry.filter(get_filter_expression(filter_query))
+            .sort(
+                sort_columns,
+                descending=[descending, False][-len(sort_columns) :],
+                nulls_last=True,
+            )
+            .slice(offset, page_size)
+            .to_dicts()
         )
 
-    return env_var
+    filter_condition, filter_params = parse_filter_query(filter_query)
+    keyset_condition, keyset_params = _get_keyset_condition(
+        sort_column, descending, after_key
+    )
 
+    order_by = [sql.SQL("{} asc").format(sql.Identifier(REGISTRY_KEY_COLUMN))]
+    if sort_column is not None:
+        order_by.insert(
+            0,
+            sql.SQL("{} {} nulls last").format(
+                sql.Identifier(sort_column), sql.SQL("desc" if descending else "asc")
+            ),
+        )
 
-db_user = get_db_env_var("LIFEDB_DB_USER")
-db_password = get_db_env_var("LIFEDB_DB_PASSWORD")
-db_host = get_db_env_var("LIFEDB_DB_HOST")
-db_port = get_db_env_var("LIFEDB_DB_PORT")
-db_name = get_db_env_var("LIFEDB_DB_NAME")
+    query = sql.SQL(
+        "select * from ({registry_sql}) as registry where {filter} and {keyset} "
+        "order by {order_by} limit %s offset %s"
+    ).format(
+        registry_sql=REGISTRY_SQL,
+        filter=filter_condition,
+        keyset=keyset_condition,
+        order_by=sql.SQL(", ").join(order_by),
+    )
 
-con = psycopg.connect(
-    user=db_user,
-    password=db_password,
-    host=db_host,
-    port=db_port,
-    dbname=db_name,
-    autocommit=True,
-)
-cur = con.cursor()
+    with get_db_connection() as con:
+        cur = con.execute(
+            query,
+            filter_params + keyset_params + (page_size, 0 if after_key else offset),
+        )
+        if cur.description is None:
+            raise ValueError()
+        columns = [desc[0] for desc in cur.description]
+
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+@ttl_lru_cache(maxsize=64, ttl_seconds=REFRESH_SECONDS)
+def count_registry_rows(filter_query: str) -> int:
+    """Count the rows of the registry table matching a filter."""
+    registry = registry_snapshot.get()
+    if registry is not None:
+        return registry.filter(get_filter_expression(filter_query)).height
+
+    filter_condition, filter_params = parse_filter_query(filter_query)
+
+    query = sql.SQL(
+        "select count(*) from ({registry_sql}) as registry where {filter}"
+    ).format(registry_sql=REGISTRY_SQL, filter=filter_condition)
+
+    with get_db_connection() as con:
+        row = con.execute(query, filter_params).fetchone()
+
+    return 0 if row is None else row[0]
+
+
+def load_department_metrics() -> pd.DataFrame:
+    """Query the average of each metric for each department."""
+    registry = registry_snapshot.get()
+    if registry is not None:
+        return (
+            registry.group_by("department")
+            .agg(pl.col("mo_salary").mean(), pl.col("tenure").mean())
+            .sort("department", nulls_last=True)
+            .to_pandas()
+        )
+
+    query = sql.SQL(DEPARTMENT_METRICS_SQL).format(registry_sql=REGISTRY_SQL)
+
+    with get_db_connection() as con:
+        cur = con.execute(query)
+        if cur.description is None:
+            raise ValueError()
+        department_metrics = pd.DataFrame(
+            cur.fetchall(), columns=[desc[0] for desc in cur.description]
+        )
+
+    return department_metrics
 
-cur.execute(DATA_SQL)
-sql_results = cur.fetchall()
-if cur.description is None:
-    raise ValueError()
-data = pd.DataFrame(sql_results, columns=[desc[0] for desc in cur.description])
 
-cur.close()
-con.close()
+def _clear_registry_caches(_: object):
+    # Pages are cached with the same lifetime as the metrics, so they are dropped
+    # together to keep the table and graph consistent.
+    load_registry_page.cache_clear()  # type: ignore[attr-defined]
+    count_registry_rows.cache_clear()  # type: ignore[attr-defined]
 
-data["employee_name"] = data["employee_first_name"] + " " + data["employee_last_name"]
-data["tenure"] = (
-    data["data_as_of_date"] - data["employee_hire_date"]
-) / pd.to_timedelta(365, "days")
+
+# Memory-mapped from the file the sample_app_registry_snapshot asset writes, when
+# LIFEDB_SNAPSHOT_DIR is set, so every worker process shares the same pages and none
+# of them has to query the database. Reloading picks up newly written snapshots.
+registry_snapshot = BackgroundRefreshedValue(
+    read_registry_snapshot,
+    interval_seconds=REFRESH_SECONDS,
+    on_refresh=_clear_registry_caches,
+)
+
+department_metrics = BackgroundRefreshedValue(
+    load_department_metrics,
+    interval_seconds=REFRESH_SECONDS,
+    on_refresh=_clear_registry_caches,
+)
 
 external_stylesheets = ["https://codepen.io/chriddyp/pen/bWLwgP.css"]
 sample_app = Dash(external_stylesheets=external_stylesheets)
+# WSGI application for serving with several workers, e.g. with gunicorn.
+server = sample_app.server
 
 sample_app.layout = [
     html.H1(children="Employee Registry", style={"textAlign": "center"}),
     dash_table.DataTable(
-        data=(
-            data[
-                [
-                    "employee_id",
-                    "employee_name",
-                    "employee_email",
-                    "department",
-                    "job_title",
-                    "employee_hire_date",
-                    "tenure",
-                    "mo_salary",
-                ]
-            ]
-        ).to_dict("records"),
+        id="registry-table",
+        columns=[
+            {"name": column, "id": column, "type": column_type}
+            for column, column_type in REGISTRY_COLUMNS.items()
+        ],
+        page_current=0,
         page_size=5,
+        page_action="custom",
+        sort_action="custom",
+        sort_mode="single",
+        sort_by=[],
+        filter_action="custom",
+        filter_query="",
     ),
+    # Last row key of each page visited, so the next page can seek past it.
+    dcc.Store(id="registry-page-keys", data={}),
     html.Hr(),
     dcc.RadioItems(
         options=["mo_salary", "tenure"],
@@ -123,11 +370,64 @@ sample_app.layout = [
 ]
 
 
+@callback(
+    Output("registry-table", "data"),
+    Output("registry-table", "page_count"),
+    Output("registry-page-keys", "data"),
+    Input("registry-table", "page_current"),
+    Input("registry-table", "page_size"),
+    Input("registry-table", "sort_by"),
+    Input("registry-table", "filter_query"),
+    State("registry-page-keys", "data"),
+)
+def update_table(page_current, page_size, sort_by, filter_query, page_keys):
+    """Fetch the requested page of the registry table."""
+    sort_column = sort_by[0]["column_id"] if sort_by else None
+    descending = bool(sort_by) and sort_by[0]["direction"] == "desc"
+
+    # Keys are only valid for the ordering and filter they were recorded under.
+    view = [sort_column, descending, filter_query, page_size]
+    if page_keys.get("view") != view:
+        page_keys = {"view": view, "keys": {}}
+
+    after_key = page_keys["keys"].get(str(page_current - 1))
+
+    # Values the filter can't compare with a column, like `{employee_hire_date} > abc`,
+    # are rejected here or by Postgres. Either way the typo just leaves the table as is.
+    try:
+        row_count = count_registry_rows(filter_query)
+        rows = load_registry_page(
+            filter_query=filter_query,
+            sort_column=sort_column,
+            descending=descending,
+            after_key=None if after_key is None else tuple(after_key),
+            offset=page_current * page_size,
+            page_size=page_size,
+        )
+    except (ValueError, psycopg.DataError):
+        raise PreventUpdate
+
+    if rows:
+        last_row = rows[-1]
+        page_keys["keys"][str(page_current)] = (
+            [last_row[REGISTRY_KEY_COLUMN]]
+            if sort_column is None
+            else [last_row[sort_column], last_row[REGISTRY_KEY_COLUMN]]
+        )
+
+    return rows, max(ceil(row_count / page_size), 1), page_keys
+
+
 @callback(
     Output(component_id="controls-and-graph", component_property="figure"),
     Input(component_id="controls-and-radio-item", component_property="value"),
 )
 def update_graph(col_chosen):
     """Update graph based on desired metric."""
-    fig = px.histogram(data, x="department", y=col_chosen, histfunc="avg")
+    fig = px.bar(
+        department_metrics.get(),
+        x="department",
+        y=col_chosen,
+        labels={col_chosen: f"avg of {col_chosen}"},
+    )
     return fig
@@ -0,0 +1 @@
+"""Benchmarks for LifeDB data flows."""
@@ -0,0 +1,204 @@
+"""Synthetic data shaped like the APIs LifeDB ingests from."""
+
+import json
+import random
+from datetime import date, timedelta
+from typing import Iterable
+
+import numpy as np
+import polars as pl
+
+from lifedb.core import api
+
+BUXFER_ACCOUNTS = [
+    (1, "Checking"),
+    (2, "Savings"),
+    (3, "Credit Card"),
+    (4, "Brokerage"),
+]
+
+BUXFER_TAGS = ["food", "coffee", "rent", "utilities", "travel", "salary", "gifts"]
+
+BUXFER_TRANSACTION_TYPES = ["expense", "income", "transfer", "refund"]
+
+
+def make_buxfer_transaction(transaction_id: int) -> dict:
+    """Make one transaction as returned by the Buxfer API (camelcase fields).
+
+    Output is deterministic for a given `transaction_id` so payloads can be regenerated
+    on demand instead of held in memory.
+    """
+    rng = random.Random(transaction_id)
+
+    account_id, account_name = rng.choice(BUXFER_ACCOUNTS)
+    transaction_type = rng.choice(BUXFER_TRANSACTION_TYPES)
+    amount = round(rng.uniform(1, 500), 2)
+    tag_names = rng.sample(BUXFER_TAGS, rng.randint(0, 3))
+
+    if transaction_type == "transfer":
+        to_account_id, to_account_name = rng.choice(BUXFER_ACCOUNTS)
+        from_account = {"id": account_id, "name": account_name}
+        to_account = {"id": to_account_id, "name": to_account_name}
+    else:
+        from_account = None
+        to_account = None
+
+    return {
+        "id": transaction_id,
+        "description": f"Synthetic transaction {transaction_id}",
+        "date": (date(2015, 1, 1) + timedelta(days=transaction_id // 50)).isoformat(),
+        "type": transaction_type,
+        "transactionType": transaction_type,
+        "amount": amount,
+        "expenseAmount": -amount if transaction_type == "income" else amount,
+        "accountId": account_id,
+        "accountName": account_name,
+        "tags": ",".join(tag_names),
+        "tagNames": tag_names,
+        "status": "cleared",
+        "isFutureDated": False,
+        "isPending": rng.random() < 0.05,
+        "fromAccount": from_account,
+        "toAccount": to_account,
+    }
+
+
+def make_buxfer_transactions_response(
+    transaction_ids: Iterable[int], *, transaction_count: int
+) -> bytes:
+    """Make a raw /transactions response body holding the given transactions."""
+    return json.dumps(
+        {
+            "response": {
+                "status": "OK",
+                "numTransactions": str(transaction_count),
+                "transactions": [
+                    make_buxfer_transaction(transaction_id)
+                    for transaction_id in transaction_ids
+                ],
+            }
+        }
+    ).encode()
+
+
+def make_buxfer_transactions_frame(
+    row_count: int, *, seed: int = 0, first_id: int = 0
+) -> pl.DataFrame:
+    """Make flattened Buxfer transactions, as returned by `get_buxfer_transactions`.
+
+    Built with vectorized operations so millions of rows can be made quickly. Values
+    follow the same distributions as `make_buxfer_transaction`, but rows are not
+    identical to it.
+    """
+    rng = np.random.default_rng(seed)
+
+    account_ids = [account_id for account_id, _ in BUXFER_ACCOUNTS]
+    account_names = [account_name for _, account_name in BUXFER_ACCOUNTS]
+    tags = ["", *BUXFER_TAGS, "food,coffee", "rent,utilities"]
+
+    def pick(values: list, index_column: str) -> pl.Expr:
+        return (
+            pl.lit(pl.Series(values)).gather(pl.col(index_column)).alias(index_column)
+        )
+
+    raw = pl.DataFrame(
+        {
+            "id": np.arange(first_id, first_id + row_count, dtype=np.int64),
+            "account": rng.integers(0, len(BUXFER_ACCOUNTS), row_count),
+            "to_account": rng.integers(0, len(BUXFER_ACCOUNTS), row_count),
+            "type": rng.integers(0, len(BUXFER_TRANSACTION_TYPES), row_count),
+            "tags": rng.integers(0, len(tags), row_count),
+            "amount": np.round(rng.uniform(1, 500, row_count), 2),
+            "is_pending": rng.random(row_count) < 0.05,
+        }
+    )
+
+    is_transfer = pl.col("type") == "transfer"
+
+    return raw.with_columns(
+        pick(BUXFER_TRANSACTION_TYPES, "type"),
+        pick(tags, "tags"),
+        pick(account_ids, "account").alias("account_id"),
+        pick(account_names, "account").alias("account_name"),
+        pick(account_ids, "to_account").alias("to_account_id"),
+        pick(account_names, "to_account").alias("to_account_name"),
+    ).select(
+        "id",
+        pl.format("Synthetic transaction {}", "id").alias("description"),
+        (pl.lit(date(2015, 1, 1)) + pl.duration(days=pl.col("id") // 50))
+        .dt.date()
+        .alias("date"),
+        pl.col("type").cast(pl.Categorical),
+        pl.col("type").cast(pl.Categorical).alias("transaction_type"),
+        pl.col("amount").cast(api.BUXFER_API_AMOUNT_TYPE),
+        pl.when(pl.col("type") == "income")
+        .then(-pl.col("amount"))
+        .otherwise(pl.col("amount"))
+        .cast(api.BUXFER_API_AMOUNT_TYPE)
+        .alias("expense_amount"),
+        "account_id",
+        pl.col("account_name").cast(pl.Categorical),
+        "tags",
+        pl.col("tags").alias("tag_names"),
+        pl.lit("cleared", dtype=pl.Categorical).alias("status"),
+        pl.lit(False).alias("is_future_dated"),
+        "is_pending",
+        pl.when(is_transfer).then(pl.col("account_id")).alias("from_account_id"),
+        pl.when(is_transfer).then(pl.col("account_name")).alias("from_account_name"),
+        pl.when(is_transfer).then(pl.col("to_account_id")).alias("to_account_id"),
+        pl.when(is_transfer).then(pl.col("to_account_name")).alias("to_account_name"),
+    )
+
+
+def make_buxfer_transactions_response_from_frame(
+    transactions: pl.DataFrame, *, transaction_count: int
+) -> bytes:
+    """Make a raw /transactions response body from flattened transactions.
+
+    The inverse of parsing a response in `get_buxfer_transactions`, so frames from
+    `make_buxfer_transactions_frame` can be served as API pages without building
+    dicts row by row.
+    """
+
+    def account(prefix: str) -> pl.Expr:
+        return (
+            pl.when(pl.col(f"{prefix}_id").is_not_null())
+            .then(
+                pl.struct(
+                    pl.col(f"{prefix}_id").alias("id"),
+                    pl.col(f"{prefix}_name").alias("name"),
+                )
+            )
+            .alias(f"{prefix.split('_')[0]}Account")
+        )
+
+    records = transactions.select(
+        "id",
+        "description",
+        "date",
+        "type",
+        pl.col("transaction_type").alias("transactionType"),
+        # The API sends amounts as JSON numbers, but Polars writes decimals as strings.
+        pl.col("amount").cast(pl.Float64),
+        pl.col("expense_amount").cast(pl.Float64).alias("expenseAmount"),
+        pl.col("account_id").alias("accountId"),
+        pl.col("account_name").alias("accountName"),
+        "tags",
+        pl.col("tag_names")
+        .str.split(",")
+        .list.eval(pl.element().filter(pl.element() != ""))
+        .alias("tagNames"),
+        "status",
+        pl.col("is_future_dated").alias("isFutureDated"),
+        pl.col("is_pending").alias("isPending"),
+        account("from_account"),
+        account("to_account"),
+    )
+
+    return (
+        b'{"response": {"status": "OK", "numTransactions": "'
+        + str(transaction_count).encode()
+        + b'", "transactions": '
+        + records.write_json().encode()
+        + b"}}"
+    )
@@ -0,0 +1,69 @@
+"""Benchmark for writing to the database."""
+
+import time
+
+import polars as pl
+from psycopg import sql
+
+from lifedb.bench.data import make_buxfer_transactions_frame
+from lifedb.bench.scratch import check_bench_database, run_in_bench_database
+from lifedb.core import db
+
+BENCH_SCHEMA = "landing"
+BENCH_TABLE_NAME = "bench_buxfer_api_transactions"
+
+
+def _write_database_seconds(df: pl.DataFrame) -> float:
+    # The write path used before the COPY writer: SQLAlchemy over psycopg2.
+    start = time.perf_counter()
+    df.write_database(
+        f"{BENCH_SCHEMA}.{BENCH_TABLE_NAME}",
+        connection=db.get_db_connection_uri(),
+        if_table_exists="replace",
+    )
+
+    return time.perf_counter() - start
+
+
+def benchmark_write(row_count: int, *, compare_write_database: bool = True) -> dict:
+    """Time loading synthetic landing rows with each bulk write mode.
+
+    Writes to a table in the scratch database, which is dropped afterwards, see
+    `benchmark_write_in_subprocess`. Returns rows per second for each mode, and for
+    `DataFrame.write_database` if `compare_write_database`.
+    """
+    check_bench_database("write")
+
+    df = make_buxfer_transactions_frame(row_count)
+
+    results: dict = {"rows": row_count}
+
+    try:
+        for mode in ("replace", "swap"):
+            write_result = db.bulk_write_table(
+                df,
+                BENCH_TABLE_NAME,
+                schema=BENCH_SCHEMA,
+                mode=mode,
+                primary_key=["id"],
+            )
+            results[f"copy_{mode}_rows_per_second"] = write_result.rows_per_second
+
+        if compare_write_database:
+            results["write_database_rows_per_second"] = row_count / (
+                _write_database_seconds(df)
+            )
+    finally:
+        with db.get_db_connection() as con:
+            con.execute(
+                sql.SQL("drop table if exists {}").format(
+                    sql.Identifier(BENCH_SCHEMA, BENCH_TABLE_NAME)
+                )
+            )
+
+    return results
+
+
+def benchmark_write_in_subprocess(row_count: int, **kwargs) -> dict:
+    """Run `benchmark_write` in a fresh process against a fresh scratch database."""
+    return run_in_bench_database(benchmark_write, row_count, **kwargs)
@@ -0,0 +1,91 @@
+"""Benchmark for parsing Buxfer API responses."""
+
+import json
+import statistics
+import time
+from io import StringIO
+from typing import Callable
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from lifedb.bench.data import make_buxfer_transactions_response
+from lifedb.core import api
+
+
+def _parse_page_json_round_trip(content: bytes) -> pl.DataFrame:
+    # The parse path used before responses were read directly from bytes: decode to
+    # Python objects, re-encode the records, then decode again with Polars.
+    response_json = json.loads(content)
+
+    reverse_renames = {
+        rename: name
+        for name, rename in api.BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES.items()
+    }
+    norename_schema: dict = {
+        reverse_renames[field]: data_type
+        for field, data_type in api.BUXFER_API_TRANSACTIONS_SCHEMA.items()
+    }
+
+    df = pl.read_json(
+        StringIO(json.dumps(response_json["response"]["transactions"])),
+        schema=norename_schema,
+    )
+    df = df.rename(api.BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES)
+    df = api._unnest_all_structs(df)
+    df = api._join_all_string_lists(df)
+
+    return df
+
+
+def _parse_page_from_bytes(content: bytes) -> pl.DataFrame:
+    _, df = api._parse_buxfer_api_data(
+        content,
+        records_field="transactions",
+        camelcase_renames=api.BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES,
+        schema=api.BUXFER_API_TRANSACTIONS_SCHEMA,
+        metadata_fields=["numTransactions"],
+    )
+
+    return df
+
+
+def _median_seconds(function: Callable[[], object], *, repeat: int) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def benchmark_parse(row_count: int, *, repeat: int = 20) -> dict:
+    """Time the JSON round-trip and direct parse paths on one synthetic page.
+
+    Returns median seconds for both paths along with the speedup of the direct path.
+    """
+    content = make_buxfer_transactions_response(
+        range(row_count), transaction_count=row_count
+    )
+
+    # Guard against benchmarking two paths that don't produce the same data.
+    assert_frame_equal(
+        _parse_page_json_round_trip(content), _parse_page_from_bytes(content)
+    )
+
+    round_trip_seconds = _median_seconds(
+        lambda: _parse_page_json_round_trip(content), repeat=repeat
+    )
+    from_bytes_seconds = _median_seconds(
+        lambda: _parse_page_from_bytes(content), repeat=repeat
+    )
+
+    return {
+        "rows": row_count,
+        "payload_bytes": len(content),
+        "json_round_trip_seconds": round_trip_seconds,
+        "from_bytes_seconds": from_bytes_seconds,
+        "speedup": round_trip_seconds / from_bytes_seconds,
+    }
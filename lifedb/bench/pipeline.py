@@ -0,0 +1,164 @@
+"""Benchmark for the full ingestion pipeline, from API to analytics."""
+
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from math import ceil
+from typing import Callable
+
+import polars as pl
+from psycopg import sql
+
+from lifedb.bench.scratch import check_bench_database, run_in_bench_database
+from lifedb.bench.server import serve_buxfer_api
+from lifedb.core import api, load
+
+PIPELINE_STAGES = ("fetch", "land", "transform")
+
+
+def _get_peak_rss_mb() -> float:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS bytes.
+    return peak_rss / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def _time_stage(stages: dict, name: str, run: Callable[[], int]):
+    start = time.perf_counter()
+    rows = run()
+    seconds = time.perf_counter() - start
+
+    stages[name] = {
+        "seconds": seconds,
+        "rows": rows,
+        "rows_per_second": rows / seconds if seconds else None,
+        "peak_rss_mb": _get_peak_rss_mb(),
+    }
+
+
+def benchmark_pipeline(row_count: int, *, max_concurrency: int = 8) -> dict:
+    """Run synthetic transactions through the steps the Dagster assets run.
+
+    Transactions are served by a stand-in Buxfer API and fetched with
+    `get_buxfer_transactions`. They are landed with `land_buxfer_api_transactions`
+    and conformed into analytics with `load_financial_transactions`, so every write
+    goes to the real tables. It must run against the migrated scratch database
+    `scratch.BENCH_DB_NAME`, see `benchmark_pipeline_in_subprocess`.
+
+    Returns wall time, rows, rows per second and the process's peak RSS so far for
+    each stage. Peak RSS only grows, so run each scale in a fresh process to compare
+    them.
+    """
+    check_bench_database("pipeline")
+
+    stages: dict = {}
+    transactions = pl.DataFrame()
+
+    def fetch() -> int:
+        nonlocal transactions
+
+        with serve_buxfer_api(row_count):
+            transactions = api.get_buxfer_transactions(
+                page_limit=max(ceil(row_count / api.BUXFER_API_PAGE_SIZE), 1),
+                max_concurrency=max_concurrency,
+            )
+
+        return transactions.height
+
+    _time_stage(stages, "fetch", fetch)
+    _time_stage(
+        stages, "land", lambda: load.land_buxfer_api_transactions([transactions])
+    )
+    del transactions
+
+    _time_stage(
+        stages,
+        "transform",
+        lambda: load.load_financial_transactions(
+            lambda source: sql.SQL("true"), params=[]
+        ),
+    )
+
+    total_seconds = sum(stage["seconds"] for stage in stages.values())
+
+    return {
+        "rows": row_count,
+        "total_seconds": total_seconds,
+        "rows_per_second": row_count / total_seconds,
+        "peak_rss_mb": _get_peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+def benchmark_pipeline_in_subprocess(row_count: int, **kwargs) -> dict:
+    """Run `benchmark_pipeline` in a fresh process against a fresh scratch database.
+
+    The scratch database is created and migrated (in a process of its own, so peak RSS
+    only covers the one scale) before the run and dropped after.
+    """
+    return run_in_bench_database(benchmark_pipeline, row_count, **kwargs)
+
+
+def _get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_report(results: list[dict]) -> dict:
+    """Wrap benchmark results with what's needed to compare them across commits."""
+    return {
+        "created_ts": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _get_git_commit(),
+        "python_version": platform.python_version(),
+        "polars_version": pl.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+def compare_reports(baseline: dict, candidate: dict) -> list[dict]:
+    """Compare stage times of two reports, for each scale present in both.
+
+    A `speedup` above 1 means the candidate is faster.
+    """
+    baseline_results = {result["rows"]: result for result in baseline["results"]}
+    comparisons = []
+
+    for candidate_result in candidate["results"]:
+        baseline_result = baseline_results.get(candidate_result["rows"])
+        if baseline_result is None:
+            continue
+
+        for stage in (*PIPELINE_STAGES, "total"):
+            if stage == "total":
+                baseline_stage = {"seconds": baseline_result["total_seconds"]}
+                candidate_stage = {"seconds": candidate_result["total_seconds"]}
+            elif stage in baseline_result["stages"].keys() & candidate_result["stages"]:
+                baseline_stage = baseline_result["stages"][stage]
+                candidate_stage = candidate_result["stages"][stage]
+            else:
+                continue
+
+            comparisons.append(
+                {
+                    "rows": candidate_result["rows"],
+                    "stage": stage,
+                    "baseline_seconds": baseline_stage["seconds"],
+                    "candidate_seconds": candidate_stage["seconds"],
+                    "speedup": baseline_stage["seconds"] / candidate_stage["seconds"],
+                }
+            )
+
+    return comparisons
@@ -0,0 +1,156 @@
+"""Entrypoint for benchmark commands."""
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+bench_typer_app = typer.Typer()
+
+
+@bench_typer_app.command()
+def parse(
+    rows: List[int] = typer.Option([100, 10_000], help="Rows per synthetic page."),
+    repeat: int = typer.Option(20, help="Timed repetitions per measurement."),
+):
+    """Compare Buxfer API response parse paths."""
+    from lifedb.bench.parse import benchmark_parse
+
+    for row_count in rows:
+        result = benchmark_parse(row_count, repeat=repeat)
+
+        typer.echo(
+            f"{result['rows']:>8} rows ({result['payload_bytes']:,} bytes): "
+            f"json round trip {result['json_round_trip_seconds'] * 1000:.2f} ms, "
+            f"from bytes {result['from_bytes_seconds'] * 1000:.2f} ms "
+            f"({result['speedup']:.2f}x)"
+        )
+
+
+@bench_typer_app.command()
+def pipeline(
+    rows: List[int] = typer.Option(
+        [1_000, 100_000], help="Synthetic transactions per run, up to 10M."
+    ),
+    max_concurrency: int = typer.Option(8, help="API pages requested at once."),
+    output: Optional[Path] = typer.Option(None, help="Write a JSON report here."),
+):
+    """Run synthetic transactions from a stand-in API through to analytics."""
+    from lifedb.bench.pipeline import benchmark_pipeline_in_subprocess, make_report
+
+    results = []
+
+    for row_count in rows:
+        result = benchmark_pipeline_in_subprocess(
+            row_count, max_concurrency=max_concurrency
+        )
+        results.append(result)
+
+        typer.echo(
+            f"{result['rows']:>10,} rows: {result['total_seconds']:.2f} s, "
+            f"{result['rows_per_second']:,.0f} rows/s, "
+            f"peak RSS {result['peak_rss_mb']:,.0f} MB"
+        )
+        for stage, stage_result in result["stages"].items():
+            typer.echo(
+                f"  {stage:<9} {stage_result['seconds']:8.2f} s "
+                f"{stage_result['rows_per_second'] or 0:>12,.0f} rows/s "
+                f"{stage_result['peak_rss_mb']:>8,.0f} MB"
+            )
+
+    if output is not None:
+        output.write_text(json.dumps(make_report(results), indent=2))
+
+
+@bench_typer_app.command()
+def compare(
+    baseline: Path = typer.Argument(..., help="Report from `bench pipeline`."),
+    candidate: Path = typer.Argument(..., help="Report to compare against it."),
+):
+    """Compare stage times between two pipeline reports."""
+    from lifedb.bench.pipeline import compare_reports
+
+    comparisons = compare_reports(
+        json.loads(baseline.read_text()), json.loads(candidate.read_text())
+    )
+
+    for comparison in comparisons:
+        typer.echo(
+            f"{comparison['rows']:>10,} rows {comparison['stage']:<9} "
+            f"{comparison['baseline_seconds']:8.2f} s -> "
+            f"{comparison['candidate_seconds']:8.2f} s "
+            f"({comparison['speedup']:.2f}x)"
+        )
+
+
+@bench_typer_app.command()
+def startup(
+    module: str = typer.Option("lifedb.run", help="Module to import."),
+    repeat: int = typer.Option(5, help="Fresh interpreters to import in."),
+    budget_seconds: Optional[float] = typer.Option(
+        None, help="Fail if importing takes longer. Defaults to the startup budget."
+    ),
+):
+    """Measure import time of the CLI with python -X importtime."""
+    from lifedb.bench.startup import STARTUP_IMPORT_BUDGET_SECONDS, measure_import_time
+
+    if budget_seconds is None:
+        budget_seconds = STARTUP_IMPORT_BUDGET_SECONDS
+
+    result = measure_import_time(module, repeat=repeat)
+
+    typer.echo(
+        f"{result['module']}: {result['seconds'] * 1000:.1f} ms "
+        f"(budget {budget_seconds * 1000:.0f} ms)"
+    )
+    for name, seconds in result["slowest_imports"]:
+        typer.echo(f"  {name:<24} {seconds * 1000:8.1f} ms")
+
+    if result["heavy_modules"]:
+        typer.echo(f"Heavy modules imported: {', '.join(result['heavy_modules'])}")
+
+    if result["seconds"] > budget_seconds or result["heavy_modules"]:
+        raise typer.Exit(code=1)
+
+
+@bench_typer_app.command()
+def uuid5(
+    rows: int = typer.Option(1_000_000, help="Number of ids to generate UUIDs for."),
+):
+    """Compare per-row and batched UUIDv5 generation."""
+    from lifedb.bench.transform import benchmark_uuid5
+
+    result = benchmark_uuid5(rows)
+
+    typer.echo(
+        f"{result['rows']:>8} rows: per row {result['per_row_seconds']:.2f} s, "
+        f"batched {result['batch_seconds']:.2f} s ({result['speedup']:.2f}x)"
+    )
+
+
+@bench_typer_app.command()
+def write(
+    rows: List[int] = typer.Option(
+        [10_000, 100_000, 1_000_000], help="Rows to write per measurement."
+    ),
+    compare_write_database: bool = typer.Option(
+        True, help="Also time DataFrame.write_database for comparison."
+    ),
+):
+    """Compare COPY bulk writes with DataFrame.write_database."""
+    from lifedb.bench.db import benchmark_write_in_subprocess
+
+    for row_count in rows:
+        result = benchmark_write_in_subprocess(
+            row_count, compare_write_database=compare_write_database
+        )
+
+        typer.echo(
+            f"{result['rows']:>8} rows: "
+            + ", ".join(
+                f"{name.removesuffix('_rows_per_second')} {value:,.0f} rows/s"
+                for name, value in result.items()
+                if name.endswith("_rows_per_second")
+            )
+        )
@@ -0,0 +1,70 @@
+"""Scratch database the benchmarks write to, next to the LifeDB database."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+import psycopg
+from psycopg import sql
+
+from lifedb.core import db
+
+BENCH_DB_NAME = "lifedb_bench"
+
+
+def _drop_bench_database():
+    with psycopg.connect(
+        **db.get_db_connection_kwargs(init_db=True), autocommit=True
+    ) as con:
+        con.execute(
+            sql.SQL("drop database if exists {} with (force)").format(
+                sql.Identifier(BENCH_DB_NAME)
+            )
+        )
+
+
+def _use_bench_database():
+    os.environ["LIFEDB_DB_NAME"] = BENCH_DB_NAME
+    # Landing snapshots would otherwise be merged with the real ones.
+    os.environ.pop("LIFEDB_SNAPSHOT_DIR", None)
+
+
+def _migrate_bench_database():
+    from lifedb.db.migrate import ensure_database, migrate
+
+    ensure_database()
+    migrate()
+
+
+def _run_in_bench_process(function: Callable, *args, **kwargs):
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_use_bench_database,
+    ) as executor:
+        return executor.submit(function, *args, **kwargs).result()
+
+
+def check_bench_database(benchmark: str):
+    """Raise unless connected to the scratch database, so real tables are never hit."""
+    if db.get_db_connection_kwargs()["dbname"] != BENCH_DB_NAME:
+        raise db.DBError(
+            f"The {benchmark} benchmark only runs against the {BENCH_DB_NAME} database."
+        )
+
+
+def run_in_bench_database(function: Callable, *args, **kwargs):
+    """Run a benchmark in a fresh process against a fresh scratch database.
+
+    The scratch database is created and migrated (in a process of its own, so peak RSS
+    only covers the benchmark) before the run and dropped after.
+    """
+    _drop_bench_database()
+
+    try:
+        _run_in_bench_process(_migrate_bench_database)
+
+        return _run_in_bench_process(function, *args, **kwargs)
+    finally:
+        _drop_bench_database()
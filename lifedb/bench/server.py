@@ -0,0 +1,102 @@
+"""Local stand-in for the Buxfer API, serving synthetic transactions."""
+
+import multiprocessing
+import os
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import parse_qs, urlsplit
+
+from lifedb.bench.data import (
+    make_buxfer_transactions_frame,
+    make_buxfer_transactions_response_from_frame,
+)
+from lifedb.core.api import BUXFER_API_PAGE_SIZE
+
+
+class _BuxferAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, transaction_count: int):
+        super().__init__(("127.0.0.1", 0), _BuxferAPIHandler)
+        self.transaction_count = transaction_count
+
+
+class _BuxferAPIHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the client's connection pool is exercised like the real API.
+    protocol_version = "HTTP/1.1"
+
+    server: _BuxferAPIServer
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+
+        if url.path != "/api/transactions":
+            self.send_error(404)
+            return
+
+        page = int(parse_qs(url.query).get("page", ["1"])[0])
+        transaction_count = self.server.transaction_count
+
+        first_id = (page - 1) * BUXFER_API_PAGE_SIZE
+        row_count = max(0, min(BUXFER_API_PAGE_SIZE, transaction_count - first_id))
+
+        # Pages are generated on request, seeded by page, so any scale can be served
+        # without holding every transaction in memory.
+        body = make_buxfer_transactions_response_from_frame(
+            make_buxfer_transactions_frame(row_count, seed=page, first_id=first_id),
+            transaction_count=transaction_count,
+        )
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve_buxfer_api(transaction_count: int, ports: multiprocessing.Queue):
+    with _BuxferAPIServer(transaction_count) as server:
+        ports.put(server.server_address[1])
+        server.serve_forever()
+
+
+@contextmanager
+def serve_buxfer_api(transaction_count: int) -> Iterator[str]:
+    """Serve `transaction_count` synthetic transactions from a stand-in Buxfer API.
+
+    The server runs in a separate process, so it doesn't compete with the code being
+    measured for the GIL or count toward its memory. While the block runs,
+    LIFEDB_BUXFER_API_URL points at the server, whose base URL is yielded.
+    """
+    context = multiprocessing.get_context("spawn")
+    ports = context.Queue()
+    process = context.Process(
+        target=_serve_buxfer_api, args=(transaction_count, ports), daemon=True
+    )
+    process.start()
+
+    previous_env = {
+        name: os.environ.get(name)
+        for name in ("LIFEDB_BUXFER_API_URL", "LIFEDB_BUXFER_API_TOKEN")
+    }
+
+    try:
+        api_url = f"http://127.0.0.1:{ports.get(timeout=30)}/api"
+
+        os.environ["LIFEDB_BUXFER_API_URL"] = api_url
+        os.environ.setdefault("LIFEDB_BUXFER_API_TOKEN", "bench")
+
+        yield api_url
+    finally:
+        for name, value in previous_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+        process.terminate()
+        process.join()
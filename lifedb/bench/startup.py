@@ -0,0 +1,79 @@
+"""Benchmark for CLI startup time."""
+
+import subprocess
+import sys
+
+# Cumulative import time allowed for the CLI entrypoint. Typer and rich account for
+# most of it, the data stack should never be part of it.
+STARTUP_IMPORT_BUDGET_SECONDS = 0.5
+
+# Modules that only subcommands actually doing data work should import.
+HEAVY_MODULES = (
+    "polars",
+    "pyarrow",
+    "numpy",
+    "pandas",
+    "httpx",
+    "psycopg",
+    "dash",
+    "dagster",
+)
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    # Lines look like "import time: self [us] | cumulative | imported package", with
+    # nested imports indented under the package name.
+    cumulative_microseconds = {}
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            cumulative_microseconds[module.strip()] = int(cumulative)
+
+    return cumulative_microseconds
+
+
+def measure_import_time(module: str = "lifedb.run", *, repeat: int = 5) -> dict:
+    """Import `module` in fresh interpreters with `python -X importtime`.
+
+    Returns the best cumulative import time over `repeat` runs along with the slowest
+    top-level dependencies and any heavy modules that were imported.
+    """
+    runs = []
+
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                f"import sys, {module}; print(' '.join(sys.modules))",
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        runs.append(
+            (_parse_importtime(completed.stderr), set(completed.stdout.split()))
+        )
+
+    import_times, imported_modules = min(runs, key=lambda run: run[0][module])
+
+    return {
+        "module": module,
+        "seconds": import_times[module] / 1e6,
+        "slowest_imports": sorted(
+            (
+                (name, microseconds / 1e6)
+                for name, microseconds in import_times.items()
+                if "." not in name and name != module.split(".")[0]
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:10],
+        "heavy_modules": sorted(set(HEAVY_MODULES) & imported_modules),
+    }
@@ -0,0 +1,48 @@
+"""Benchmark for transformation steps."""
+
+import time
+import uuid
+
+import numpy as np
+import polars as pl
+
+from lifedb.core import transform
+
+
+def _uuid5_per_row(ids: pl.Series) -> pl.Series:
+    # The per-row path used before UUIDs were generated in batches.
+    def generate_uuid(id: int) -> str:
+        return str(uuid.uuid5(transform.BUXFER_API_TRANSACTION_UUID_NAMESPACE, str(id)))
+
+    return ids.map_elements(generate_uuid, return_dtype=pl.datatypes.String)
+
+
+def benchmark_uuid5(row_count: int, *, seed: int = 0) -> dict:
+    """Time per-row and batched UUIDv5 generation over random int64 ids.
+
+    Returns seconds for both paths along with the speedup of the batched path.
+    """
+    rng = np.random.default_rng(seed)
+    ids = pl.Series(
+        "id", rng.integers(np.iinfo(np.int64).min, np.iinfo(np.int64).max, row_count)
+    )
+
+    start = time.perf_counter()
+    per_row_uuids = _uuid5_per_row(ids)
+    per_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_uuids = transform.uuid5_batch(
+        ids, transform.BUXFER_API_TRANSACTION_UUID_NAMESPACE
+    )
+    batch_seconds = time.perf_counter() - start
+
+    if not per_row_uuids.equals(batch_uuids):
+        raise AssertionError("Batched UUIDs do not match per-row UUIDs.")
+
+    return {
+        "rows": row_count,
+        "per_row_seconds": per_row_seconds,
+        "batch_seconds": batch_seconds,
+        "speedup": per_row_seconds / batch_seconds,
+    }
@@ -1,3 +1,27 @@
-"""Core business logic for manipulating LifeDB data."""
+"""Core business logic for manipulating LifeDB data.
 
-from . import api, db, transform
+The submodules pull in the data stack (polars, httpx, psycopg), so they are only
+imported on first attribute access to keep CLI startup fast.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import api, api_cache, db, load, metrics, registry, transform
+
+__all__ = ["api", "api_cache", "db", "load", "metrics", "registry", "transform"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+
+        return module
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,16 +1,27 @@
 """Functions/variables for working with APIs."""
 
-import json
+import asyncio
+import contextvars
+import hashlib
 import os
-from datetime import date
-from io import StringIO
+import queue
+import random
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
 from math import ceil
-from typing import Optional
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence, TypeVar
 
 import httpx
 import polars as pl
 
+from lifedb.core import metrics
+from lifedb.core.api_cache import ResponseCache
+
 BUXFER_API_URL = "https://www.buxfer.com/api"
+BUXFER_API_PAGE_SIZE = 100
+BUXFER_API_RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
 
 
 class APIError(Exception):
@@ -29,19 +40,28 @@ def _get_buxfer_api_token_env_var() -> str:
     return api_token
 
 
+def _get_buxfer_api_url() -> str:
+    # Overridable so the client can be pointed at a stand-in server.
+    return os.getenv("LIFEDB_BUXFER_API_URL", BUXFER_API_URL)
+
+
+# Amounts have at most two decimal places, so they're kept exact rather than as floats.
+BUXFER_API_AMOUNT_TYPE = pl.datatypes.Decimal(18, 2)
+
+# Short, often repeated values are categorical, so each page stores them once.
 BUXFER_API_TRANSACTIONS_SCHEMA = {
     "id": pl.datatypes.Int64,
     "description": pl.datatypes.String,
-    "date": pl.datatypes.String,
-    "type": pl.datatypes.String,
-    "transaction_type": pl.datatypes.String,
-    "amount": pl.datatypes.Float64,
-    "expense_amount": pl.datatypes.Float64,
+    "date": pl.datatypes.Date,
+    "type": pl.datatypes.Categorical,
+    "transaction_type": pl.datatypes.Categorical,
+    "amount": BUXFER_API_AMOUNT_TYPE,
+    "expense_amount": BUXFER_API_AMOUNT_TYPE,
     "account_id": pl.datatypes.Int64,
-    "account_name": pl.datatypes.String,
+    "account_name": pl.datatypes.Categorical,
     "tags": pl.datatypes.String,
     "tag_names": pl.datatypes.List(pl.datatypes.String),
-    "status": pl.datatypes.String,
+    "status": pl.datatypes.Categorical,
     "is_future_dated": pl.datatypes.Boolean,
     "is_pending": pl.datatypes.Boolean,
     "from_account": pl.datatypes.Struct(
@@ -77,8 +97,43 @@ BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES = {
     "toAccount": "to_account",
 }
 
+BUXFER_API_ACCOUNTS_SCHEMA = {
+    "id": pl.datatypes.Int64,
+    "name": pl.datatypes.String,
+    "bank": pl.datatypes.String,
+    "balance": pl.datatypes.Float64,
+    "currency": pl.datatypes.String,
+    "last_synced": pl.datatypes.String,
+}
+
+BUXFER_API_ACCOUNTS_CAMELCASE_RENAMES = {
+    "id": "id",
+    "name": "name",
+    "bank": "bank",
+    "balance": "balance",
+    "currency": "currency",
+    "lastSynced": "last_synced",
+}
+
+
+FrameT = TypeVar("FrameT", pl.DataFrame, pl.LazyFrame)
+
 
-def _parse_buxfer_api_data(api_json, *, camelcase_renames, schema) -> pl.DataFrame:
+def _parse_buxfer_api_data(
+    content: bytes,
+    *,
+    records_field: str,
+    camelcase_renames,
+    schema,
+    metadata_fields: Sequence[str] = (),
+) -> tuple[dict[str, Optional[str]], pl.DataFrame]:
+    """Parse a raw Buxfer API response body into a flat, typed dataframe.
+
+    Buxfer wraps every payload as `{"response": {<metadata>, <records_field>: [...]}}`.
+    The body is decoded once by Polars straight into Arrow memory, and renaming,
+    struct unnesting and list joining are collected as a single lazy plan. Values for
+    `metadata_fields` are returned as strings alongside the records.
+    """
     reverse_renames = {rename: name for name, rename in camelcase_renames.items()}
 
     # Following code will break if camelcase_renames and schema don't have matching keys
@@ -92,17 +147,69 @@ def _parse_buxfer_api_data(api_json, *, camelcase_renames, schema) -> pl.DataFra
         reverse_renames[field]: data_type for field, data_type in schema.items()
     }
 
-    df = pl.read_json(StringIO(json.dumps(api_json)), schema=norename_schema)
+    # Polars reads a malformed date in JSON as null, so dates are read as strings and
+    # parsed strictly afterwards.
+    date_fields = [
+        field for field, data_type in schema.items() if data_type == pl.datatypes.Date
+    ]
+    # Older Polars can't read JSON into categoricals, so they are cast from strings
+    # afterwards too.
+    categorical_fields = [
+        field
+        for field, data_type in schema.items()
+        if data_type == pl.datatypes.Categorical
+    ]
+    for field in date_fields + categorical_fields:
+        norename_schema[reverse_renames[field]] = pl.datatypes.String
+
+    # Nor into decimals. Numbers are read as floats and cast through their shortest
+    # string form, which holds the exact amount sent.
+    decimal_fields = {
+        field: data_type
+        for field, data_type in schema.items()
+        if isinstance(data_type, pl.datatypes.Decimal)
+    }
+    for field in decimal_fields:
+        norename_schema[reverse_renames[field]] = pl.datatypes.Float64
+
+    response_schema: dict = {field: pl.datatypes.String for field in metadata_fields}
+    response_schema[records_field] = pl.datatypes.List(
+        pl.datatypes.Struct(norename_schema)
+    )
+
+    response = pl.read_json(
+        content, schema={"response": pl.datatypes.Struct(response_schema)}
+    ).get_column("response")
 
-    df = df.rename(camelcase_renames)
+    metadata = {field: response.struct.field(field)[0] for field in metadata_fields}
+
+    # Taking the single list element (rather than exploding) keeps an empty page as an
+    # empty frame instead of a row of nulls.
+    records = response.struct.field(records_field)[0].struct.unnest()
+
+    df = (
+        records.lazy()
+        .rename(camelcase_renames)
+        .with_columns(
+            pl.col(date_fields).str.to_date("%Y-%m-%d"),
+            pl.col(categorical_fields).cast(pl.datatypes.Categorical),
+            *[
+                pl.col(field).cast(pl.datatypes.String).cast(data_type)
+                for field, data_type in decimal_fields.items()
+            ],
+        )
+        .pipe(_unnest_all_structs)
+        .pipe(_join_all_string_lists)
+        .collect()
+    )
 
-    return df
+    return metadata, df
 
 
-def _unnest_all_structs(df: pl.DataFrame) -> pl.DataFrame:
+def _unnest_all_structs(df: FrameT) -> FrameT:
     struct_fields = {
         field_name: field_datatype
-        for field_name, field_datatype in df.schema.items()
+        for field_name, field_datatype in df.collect_schema().items()
         if isinstance(field_datatype, pl.datatypes.Struct)
     }
 
@@ -116,10 +223,10 @@ def _unnest_all_structs(df: pl.DataFrame) -> pl.DataFrame:
     return unnested_df
 
 
-def _join_all_string_lists(df: pl.DataFrame) -> pl.DataFrame:
+def _join_all_string_lists(df: FrameT) -> FrameT:
     list_fields = {
         field_name: field_datatype
-        for field_name, field_datatype in df.schema.items()
+        for field_name, field_datatype in df.collect_schema().items()
         if (
             isinstance(field_datatype, pl.datatypes.List)
             and field_datatype.inner == pl.datatypes.String
@@ -136,18 +243,309 @@ def _join_all_string_lists(df: pl.DataFrame) -> pl.DataFrame:
     return joined_df
 
 
-def get_buxfer_transactions(
+class _RateLimiter:
+    """Spaces out request start times to stay under a requests-per-second budget."""
+
+    def __init__(self, requests_per_second: Optional[float]):
+        if requests_per_second is not None and requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive.")
+
+        self._interval = 0.0 if requests_per_second is None else 1 / requests_per_second
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if self._interval == 0.0:
+            return
+
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._interval
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _get_retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    retry_after = response.headers.get("Retry-After")
+
+    try:
+        return None if retry_after is None else max(float(retry_after), 0.0)
+    except ValueError:
+        # Retry-After can also be an HTTP date, which isn't worth parsing here.
+        return None
+
+
+async def _get_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    params: dict,
+    rate_limiter: _RateLimiter,
+    max_retries: int,
+    backoff_seconds: float,
+    headers: Optional[dict] = None,
+) -> httpx.Response:
+    for attempt in range(max_retries + 1):
+        await rate_limiter.wait()
+        delay = backoff_seconds * 2**attempt
+
+        try:
+            response = await client.get(url, params=params, headers=headers)
+        except httpx.TransportError:
+            if attempt == max_retries:
+                raise
+        else:
+            # Only sent in reply to a conditional request, the caller has the body.
+            if response.status_code == 304 and headers:
+                return response
+
+            if (
+                response.status_code not in BUXFER_API_RETRY_STATUS_CODES
+                or attempt == max_retries
+            ):
+                return response.raise_for_status()
+
+            retry_after = _get_retry_after_seconds(response)
+            if retry_after is not None:
+                delay = retry_after
+
+        metrics.increment("api.retries")
+
+        # Jitter keeps concurrently failing pages from retrying in lockstep.
+        await asyncio.sleep(delay + random.uniform(0, backoff_seconds))
+
+    raise AssertionError("Unreachable, final attempt always returns or raises.")
+
+
+async def _get_content(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    params: dict,
+    cache: Optional[ResponseCache],
+    **retry_kwargs,
+) -> bytes:
+    if cache is None:
+        with metrics.span("api.request"):
+            response = await _get_with_retries(
+                client, url, params=params, **retry_kwargs
+            )
+
+        metrics.increment("api.bytes", len(response.content))
+
+        return response.content
+
+    cached_response = cache.get(url, params)
+
+    if cached_response is not None and (cached_response.is_fresh or cache.offline):
+        metrics.increment("api.cache_hits")
+        return cached_response.content
+
+    if cache.offline:
+        raise APIError(
+            f"Response for {url} with {params} is not cached, and the API cache is "
+            "offline."
+        )
+
+    with metrics.span("api.request"):
+        response = await _get_with_retries(
+            client,
+            url,
+            params=params,
+            headers=(
+                None if cached_response is None else cached_response.validator_headers
+            ),
+            **retry_kwargs,
+        )
+
+    metrics.increment("api.bytes", len(response.content))
+
+    if response.status_code == 304 and cached_response is not None:
+        metrics.increment("api.cache_revalidations")
+        cache.refresh(url, params)
+
+        return cached_response.content
+
+    metrics.increment("api.cache_misses")
+    cache.put(
+        url,
+        params,
+        response.content,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+    return response.content
+
+
+@asynccontextmanager
+async def _get_client(
+    client: Optional[httpx.AsyncClient], *, max_concurrency: int
+) -> AsyncIterator[httpx.AsyncClient]:
+    if client is not None:
+        yield client
+        return
+
+    limits = httpx.Limits(
+        max_connections=max_concurrency,
+        max_keepalive_connections=max_concurrency,
+    )
+    async with httpx.AsyncClient(limits=limits) as pooled_client:
+        yield pooled_client
+
+
+def _validate_fetch_args(*, page_limit: int, max_concurrency: int, max_retries: int):
+    if page_limit < 1:
+        raise ValueError("page_limit must be a positive integer of at least 1.")
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be a positive integer of at least 1.")
+    if max_retries < 0:
+        raise ValueError("max_retries must not be negative.")
+
+
+def _get_buxfer_transactions_params(
+    *,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[int] = None,
+) -> dict:
+    request_params: dict = {"token": _get_buxfer_api_token_env_var()}
+
+    if start_date is not None:
+        request_params["startDate"] = start_date.strftime("%Y-%m-%d")
+    if end_date is not None:
+        request_params["endDate"] = end_date.strftime("%Y-%m-%d")
+    if account_id is not None:
+        request_params["accountId"] = account_id
+
+    return request_params
+
+
+async def _get_buxfer_transactions_page(
+    client: httpx.AsyncClient,
+    request_params: dict,
+    *,
+    page: Optional[int] = None,
+    semaphore: asyncio.Semaphore,
+    cache: Optional[ResponseCache],
+    **retry_kwargs,
+) -> tuple[int, pl.DataFrame]:
+    page_params = {key: value for key, value in request_params.items()}
+
+    if page is not None:
+        page_params["page"] = page
+
+    async with semaphore:
+        content = await _get_content(
+            client,
+            _get_buxfer_api_url() + "/transactions",
+            params=page_params,
+            cache=cache,
+            **retry_kwargs,
+        )
+
+    metrics.increment("api.pages")
+
+    with metrics.span("api.parse"):
+        metadata, page_transactions = _parse_buxfer_api_data(
+            content,
+            records_field="transactions",
+            camelcase_renames=BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES,
+            schema=BUXFER_API_TRANSACTIONS_SCHEMA,
+            metadata_fields=["numTransactions"],
+        )
+
+    metrics.increment("api.rows", page_transactions.height)
+    response_transaction_count = int(metadata["numTransactions"] or 0)
+
+    return response_transaction_count, page_transactions
+
+
+def _get_page_count(
+    transaction_count: int, *, page_limit: Optional[int], allow_partial_data: bool
+) -> int:
+    page_count = ceil(transaction_count / BUXFER_API_PAGE_SIZE)
+
+    if page_limit is not None and page_count > page_limit:
+        if not allow_partial_data:
+            raise APIError(
+                "More pages returned than allowed by page_limit. Increase "
+                "page_limit or query a shorter period of time to avoid incomplete "
+                "data."
+            )
+        else:
+            page_count = page_limit
+
+    return page_count
+
+
+async def _get_buxfer_transactions_pages(
+    client: httpx.AsyncClient,
+    request_params: dict,
+    *,
+    page_limit: int,
+    allow_partial_data: bool,
+    **page_kwargs,
+) -> pl.DataFrame:
+    with metrics.span("api.fetch"):
+        transaction_count, first_page_transactions = (
+            await _get_buxfer_transactions_page(client, request_params, **page_kwargs)
+        )
+
+        page_count = _get_page_count(
+            transaction_count,
+            page_limit=page_limit,
+            allow_partial_data=allow_partial_data,
+        )
+
+        if page_count > 1:
+            # gather returns results in the order the awaitables were given, so pages
+            # stay in API order regardless of which request finishes first.
+            remaining_pages = await asyncio.gather(
+                *[
+                    _get_buxfer_transactions_page(
+                        client, request_params, page=page_index, **page_kwargs
+                    )
+                    for page_index in range(2, page_count + 1)
+                ]
+            )
+
+            all_transactions = pl.concat(
+                [first_page_transactions]
+                + [page_transactions for _, page_transactions in remaining_pages]
+            )
+        else:
+            all_transactions = first_page_transactions
+
+    return all_transactions
+
+
+async def get_buxfer_transactions_async(
     *,
     start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[int] = None,
     page_limit: int = 1,
     allow_partial_data: bool = False,
+    max_concurrency: int = 4,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> pl.DataFrame:
-    """Retrieve transactions from Buxfer API.
+    """Retrieve transactions from Buxfer API, fetching pages concurrently.
 
     Parameters
     ----------
     start_date: Optional[date]
         The date to filter transactions from (filter includes start date).
+    end_date: Optional[date]
+        The date to filter transactions to (filter includes end date).
+    account_id: Optional[int]
+        If given, only transactions of this account are returned.
     page_limit: int
         Restricts the number of pages that will be queried from the API. Buxfer returns
         transactions in pages of 100, so the max transactions returned by this function
@@ -155,60 +553,511 @@ def get_buxfer_transactions(
     allow_partial_data: bool
         If True, will not throw error when the queried data returns more pages than
         `page_limit`, and will instead return transactions up to `page_limit`.
+    max_concurrency: int
+        Maximum number of page requests in flight at once.
+    requests_per_second: Optional[float]
+        If given, request start times are spaced out to stay under this rate
+        (retries included).
+    max_retries: int
+        Number of times a page is retried after a 429/5xx response or a transport
+        error before giving up.
+    backoff_seconds: float
+        Base delay for exponential backoff between retries. A `Retry-After` header on
+        the response takes precedence.
+    client: Optional[httpx.AsyncClient]
+        Client to send requests with. If not given, a pooled client sized to
+        `max_concurrency` is created for the duration of the call.
+    cache: Optional[ResponseCache]
+        Cache to serve raw pages from and store them in. If not given, the cache
+        configured by LIFEDB_BUXFER_API_CACHE is used, which is off by default.
     """
-    if page_limit < 1:
-        raise ValueError("page_limit must be a positive integer of at least 1.")
+    _validate_fetch_args(
+        page_limit=page_limit, max_concurrency=max_concurrency, max_retries=max_retries
+    )
 
-    request_url = BUXFER_API_URL + "/transactions"
-    api_token = _get_buxfer_api_token_env_var()
+    if cache is None:
+        cache = ResponseCache.from_env()
 
-    request_params = {"token": api_token}
-    if start_date is not None:
-        request_params["startDate"] = start_date.strftime("%Y-%m-%d")
+    async with _get_client(client, max_concurrency=max_concurrency) as api_client:
+        transactions = await _get_buxfer_transactions_pages(
+            api_client,
+            _get_buxfer_transactions_params(
+                start_date=start_date, end_date=end_date, account_id=account_id
+            ),
+            page_limit=page_limit,
+            allow_partial_data=allow_partial_data,
+            semaphore=asyncio.Semaphore(max_concurrency),
+            cache=cache,
+            rate_limiter=_RateLimiter(requests_per_second),
+            max_retries=max_retries,
+            backoff_seconds=backoff_seconds,
+        )
 
-    def get_transactions_page(page=None):
-        page_params = {key: value for key, value in request_params.items()}
+    if cache is not None:
+        cache.evict()
 
-        if page is not None:
-            page_params["page"] = page
+    return transactions
 
-        raw_response = httpx.get(request_url, params=page_params)
-        response = raw_response.raise_for_status()
-        response_json = response.json()
 
-        response_transaction_count = int(response_json["response"]["numTransactions"])
-        page_transactions = _parse_buxfer_api_data(
-            response_json["response"]["transactions"],
-            camelcase_renames=BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES,
-            schema=BUXFER_API_TRANSACTIONS_SCHEMA,
+async def iter_buxfer_transactions_async(
+    *,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[int] = None,
+    page_limit: Optional[int] = None,
+    allow_partial_data: bool = False,
+    max_concurrency: int = 4,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[ResponseCache] = None,
+) -> AsyncIterator[pl.DataFrame]:
+    """Yield transactions from Buxfer API one page at a time, in API order.
+
+    Pages are never collected together. At most `max_concurrency` pages are requested
+    ahead of the one being consumed, so memory stays at a few pages however long the
+    history is, and `page_limit` can be None to read every page.
+
+    Parameters are as for `get_buxfer_transactions_async`.
+    """
+    _validate_fetch_args(
+        page_limit=1 if page_limit is None else page_limit,
+        max_concurrency=max_concurrency,
+        max_retries=max_retries,
+    )
+
+    if cache is None:
+        cache = ResponseCache.from_env()
+
+    async with _get_client(client, max_concurrency=max_concurrency) as api_client:
+        request_params = _get_buxfer_transactions_params(
+            start_date=start_date, end_date=end_date, account_id=account_id
+        )
+        page_kwargs: dict[str, Any] = {
+            "semaphore": asyncio.Semaphore(max_concurrency),
+            "cache": cache,
+            "rate_limiter": _RateLimiter(requests_per_second),
+            "max_retries": max_retries,
+            "backoff_seconds": backoff_seconds,
+        }
+
+        transaction_count, page_transactions = await _get_buxfer_transactions_page(
+            api_client, request_params, **page_kwargs
+        )
+        page_count = _get_page_count(
+            transaction_count,
+            page_limit=page_limit,
+            allow_partial_data=allow_partial_data,
         )
-        page_transactions = _unnest_all_structs(page_transactions)
-        page_transactions = _join_all_string_lists(page_transactions)
 
-        return response_transaction_count, page_transactions
+        yield page_transactions
 
-    transaction_count, first_page_transactions = get_transactions_page()
+        pending: deque[asyncio.Future] = deque()
+        next_page = 2
 
-    page_count = ceil(transaction_count / 100)
+        try:
+            while next_page <= page_count or pending:
+                while next_page <= page_count and len(pending) < max_concurrency:
+                    pending.append(
+                        asyncio.ensure_future(
+                            _get_buxfer_transactions_page(
+                                api_client,
+                                request_params,
+                                page=next_page,
+                                **page_kwargs,
+                            )
+                        )
+                    )
+                    next_page += 1
 
-    if page_count > page_limit:
-        if not allow_partial_data:
-            raise APIError(
-                "More pages returned than allowed by page_limit. Increase page_limit "
-                "or query a shorter period of time to avoid incomplete data."
+                _, page_transactions = await pending.popleft()
+
+                yield page_transactions
+        finally:
+            # The consumer may stop early, requests it won't read are abandoned.
+            for future in pending:
+                future.cancel()
+
+    if cache is not None:
+        cache.evict()
+
+
+async def _get_buxfer_accounts(
+    client: httpx.AsyncClient, *, cache: Optional[ResponseCache], **retry_kwargs
+) -> pl.DataFrame:
+    content = await _get_content(
+        client,
+        _get_buxfer_api_url() + "/accounts",
+        params={"token": _get_buxfer_api_token_env_var()},
+        cache=cache,
+        **retry_kwargs,
+    )
+
+    _, accounts = _parse_buxfer_api_data(
+        content,
+        records_field="accounts",
+        camelcase_renames=BUXFER_API_ACCOUNTS_CAMELCASE_RENAMES,
+        schema=BUXFER_API_ACCOUNTS_SCHEMA,
+    )
+
+    return accounts
+
+
+async def get_buxfer_accounts_async(
+    *,
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[ResponseCache] = None,
+) -> pl.DataFrame:
+    """Retrieve accounts from Buxfer API.
+
+    Parameters are as for `get_buxfer_transactions_async`.
+    """
+    if cache is None:
+        cache = ResponseCache.from_env()
+
+    async with _get_client(client, max_concurrency=1) as api_client:
+        return await _get_buxfer_accounts(
+            api_client,
+            cache=cache,
+            rate_limiter=_RateLimiter(None),
+            max_retries=max_retries,
+            backoff_seconds=backoff_seconds,
+        )
+
+
+async def get_buxfer_transactions_fingerprint_async(
+    *,
+    start_date: Optional[date] = None,
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+    client: Optional[httpx.AsyncClient] = None,
+) -> str:
+    """Cheaply summarize transactions since `start_date`, to tell whether any changed.
+
+    Only the first page is requested, and never from the cache. The fingerprint
+    combines the number of transactions with a hash of that page, which holds the
+    newest transactions, so both new transactions and edits to recent ones change it.
+
+    Other parameters are as for `get_buxfer_transactions_async`.
+    """
+    async with _get_client(client, max_concurrency=1) as api_client:
+        content = await _get_content(
+            api_client,
+            _get_buxfer_api_url() + "/transactions",
+            params=_get_buxfer_transactions_params(start_date=start_date),
+            cache=None,
+            rate_limiter=_RateLimiter(None),
+            max_retries=max_retries,
+            backoff_seconds=backoff_seconds,
+        )
+
+    metadata, _ = _parse_buxfer_api_data(
+        content,
+        records_field="transactions",
+        camelcase_renames=BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES,
+        schema=BUXFER_API_TRANSACTIONS_SCHEMA,
+        metadata_fields=["numTransactions"],
+    )
+
+    return f"{metadata['numTransactions'] or 0}:{hashlib.sha256(content).hexdigest()}"
+
+
+def _get_date_windows(
+    start_date: date, end_date: date, window_days: int
+) -> list[tuple[date, date]]:
+    windows = []
+    window_start = start_date
+
+    while window_start <= end_date:
+        window_end = min(window_start + timedelta(days=window_days - 1), end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+
+    return windows
+
+
+async def get_buxfer_transactions_split_async(
+    *,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    split_by_account: bool = True,
+    account_ids: Optional[Sequence[int]] = None,
+    window_days: Optional[int] = None,
+    page_limit: int = 1,
+    allow_partial_data: bool = False,
+    max_concurrency: int = 4,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[ResponseCache] = None,
+) -> pl.DataFrame:
+    """Retrieve transactions from Buxfer API in pieces fetched concurrently.
+
+    The query is split into one piece per account and per window of dates, and the
+    pages of every piece are requested at once, sharing `max_concurrency` and
+    `requests_per_second`. Pieces are merged in order and de-duplicated by `id`, as a
+    transfer between two accounts is listed under both.
+
+    Parameters
+    ----------
+    split_by_account: bool
+        Fetch each account separately. Accounts are listed from the API unless
+        `account_ids` is given.
+    account_ids: Optional[Sequence[int]]
+        Accounts to fetch, each separately.
+    window_days: Optional[int]
+        If given, fetch each window of this many days separately. Requires
+        `start_date`, and `end_date` defaults to today.
+    page_limit: int
+        Limits the number of pages of each piece, otherwise as for
+        `get_buxfer_transactions_async`.
+
+    Other parameters are as for `get_buxfer_transactions_async`.
+    """
+    _validate_fetch_args(
+        page_limit=page_limit, max_concurrency=max_concurrency, max_retries=max_retries
+    )
+    if account_ids is not None and not account_ids:
+        raise ValueError("account_ids must not be empty.")
+
+    windows: list[tuple[Optional[date], Optional[date]]]
+    if window_days is None:
+        windows = [(start_date, end_date)]
+    else:
+        if window_days < 1:
+            raise ValueError("window_days must be a positive integer of at least 1.")
+        if start_date is None:
+            raise ValueError("start_date is required to split by window_days.")
+
+        windows = list(
+            _get_date_windows(start_date, end_date or date.today(), window_days)
+        )
+
+    if cache is None:
+        cache = ResponseCache.from_env()
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    retry_kwargs = {
+        "rate_limiter": _RateLimiter(requests_per_second),
+        "max_retries": max_retries,
+        "backoff_seconds": backoff_seconds,
+    }
+
+    async with _get_client(client, max_concurrency=max_concurrency) as api_client:
+        if split_by_account and account_ids is None:
+            accounts = await _get_buxfer_accounts(
+                api_client, cache=cache, **retry_kwargs
+            )
+            # Without any accounts there is nothing to split, a single unfiltered
+            # piece still returns correctly typed (empty) transactions.
+            account_ids = accounts.get_column("id").to_list() or None
+
+        pieces = [
+            _get_buxfer_transactions_params(
+                start_date=window_start, end_date=window_end, account_id=account_id
             )
+            for account_id in ([None] if account_ids is None else account_ids)
+            for window_start, window_end in windows
+        ]
+        metrics.increment("api.pieces", len(pieces))
+
+        piece_transactions = await asyncio.gather(
+            *[
+                _get_buxfer_transactions_pages(
+                    api_client,
+                    request_params,
+                    page_limit=page_limit,
+                    allow_partial_data=allow_partial_data,
+                    semaphore=semaphore,
+                    cache=cache,
+                    **retry_kwargs,
+                )
+                for request_params in pieces
+            ]
+        )
+
+    transactions = pl.concat(piece_transactions)
+    unique_transactions = transactions.unique(
+        subset="id", keep="first", maintain_order=True
+    )
+    metrics.increment(
+        "api.duplicate_rows", transactions.height - unique_transactions.height
+    )
+
+    if cache is not None:
+        cache.evict()
+
+    return unique_transactions
+
+
+def get_buxfer_transactions(
+    *,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[int] = None,
+    page_limit: int = 1,
+    allow_partial_data: bool = False,
+    max_concurrency: int = 4,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = 3,
+    cache: Optional[ResponseCache] = None,
+) -> pl.DataFrame:
+    """Retrieve transactions from Buxfer API.
+
+    Blocking wrapper around `get_buxfer_transactions_async`, which documents the
+    parameters. Must not be called from a running event loop.
+    """
+    return asyncio.run(
+        get_buxfer_transactions_async(
+            start_date=start_date,
+            end_date=end_date,
+            account_id=account_id,
+            page_limit=page_limit,
+            allow_partial_data=allow_partial_data,
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            max_retries=max_retries,
+            cache=cache,
+        )
+    )
+
+
+_END_OF_PAGES = object()
+
+
+def iter_buxfer_transactions(
+    *,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[int] = None,
+    page_limit: Optional[int] = None,
+    allow_partial_data: bool = False,
+    max_concurrency: int = 4,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = 3,
+    cache: Optional[ResponseCache] = None,
+) -> Iterator[pl.DataFrame]:
+    """Yield transactions from Buxfer API one page at a time, in API order.
+
+    Blocking wrapper around `iter_buxfer_transactions_async`, which documents the
+    parameters. Pages are fetched by an event loop in a background thread and handed
+    over through a queue of at most `max_concurrency` pages, so requests keep going
+    while the caller handles each page.
+    """
+    pages: queue.Queue = queue.Queue(maxsize=max_concurrency)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    async def produce():
+        loop = asyncio.get_running_loop()
+
+        try:
+            async for page_transactions in iter_buxfer_transactions_async(
+                start_date=start_date,
+                end_date=end_date,
+                account_id=account_id,
+                page_limit=page_limit,
+                allow_partial_data=allow_partial_data,
+                max_concurrency=max_concurrency,
+                requests_per_second=requests_per_second,
+                max_retries=max_retries,
+                cache=cache,
+            ):
+                # Waiting for room in a worker thread keeps requests in flight going.
+                if not await loop.run_in_executor(None, put, page_transactions):
+                    return
+        except Exception as err:
+            put(err)
         else:
-            page_count = page_limit
+            put(_END_OF_PAGES)
+
+    # The thread runs in a copy of this context, so metrics are still collected.
+    producer = threading.Thread(
+        target=contextvars.copy_context().run, args=(asyncio.run, produce())
+    )
+    producer.start()
 
-    if page_count > 1:
-        transaction_dfs = [first_page_transactions]
+    try:
+        while (item := pages.get()) is not _END_OF_PAGES:
+            if isinstance(item, Exception):
+                raise item
 
-        for page_index in range(2, page_count + 1):
-            _, next_page_transactions = get_transactions_page(page=page_index)
-            transaction_dfs.append(next_page_transactions)
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
 
-        all_transactions = pl.concat(transaction_dfs)
-    else:
-        all_transactions = first_page_transactions
 
-    return all_transactions
+def get_buxfer_accounts(
+    *, max_retries: int = 3, cache: Optional[ResponseCache] = None
+) -> pl.DataFrame:
+    """Retrieve accounts from Buxfer API.
+
+    Blocking wrapper around `get_buxfer_accounts_async`. Must not be called from a
+    running event loop.
+    """
+    return asyncio.run(get_buxfer_accounts_async(max_retries=max_retries, cache=cache))
+
+
+def get_buxfer_transactions_fingerprint(
+    *, start_date: Optional[date] = None, max_retries: int = 3
+) -> str:
+    """Cheaply summarize transactions since `start_date`, to tell whether any changed.
+
+    Blocking wrapper around `get_buxfer_transactions_fingerprint_async`. Must not be
+    called from a running event loop.
+    """
+    return asyncio.run(
+        get_buxfer_transactions_fingerprint_async(
+            start_date=start_date, max_retries=max_retries
+        )
+    )
+
+
+def get_buxfer_transactions_split(
+    *,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    split_by_account: bool = True,
+    account_ids: Optional[Sequence[int]] = None,
+    window_days: Optional[int] = None,
+    page_limit: int = 1,
+    allow_partial_data: bool = False,
+    max_concurrency: int = 4,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = 3,
+    cache: Optional[ResponseCache] = None,
+) -> pl.DataFrame:
+    """Retrieve transactions from Buxfer API in pieces fetched concurrently.
+
+    Blocking wrapper around `get_buxfer_transactions_split_async`, which documents the
+    parameters. Must not be called from a running event loop.
+    """
+    return asyncio.run(
+        get_buxfer_transactions_split_async(
+            start_date=start_date,
+            end_date=end_date,
+            split_by_account=split_by_account,
+            account_ids=account_ids,
+            window_days=window_days,
+            page_limit=page_limit,
+            allow_partial_data=allow_partial_data,
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            max_retries=max_retries,
+            cache=cache,
+        )
+    )
@@ -0,0 +1,204 @@
+"""On-disk cache of raw API responses."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+# Parameters that authenticate a request rather than select data. They are hashed into
+# the key, so accounts never share entries, but never written to disk.
+_SECRET_PARAMS = frozenset({"token"})
+
+DEFAULT_TTL_SECONDS = 900
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A cached response body and what's needed to revalidate it."""
+
+    content: bytes
+    stored_ts: float
+    is_fresh: bool
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def validator_headers(self) -> dict[str, str]:
+        """Headers asking the server to reply 304 if the response is unchanged."""
+        headers = {}
+
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class ResponseCache:
+    """Raw responses stored on disk, keyed by URL and query parameters.
+
+    Entries are fresh for `ttl_seconds` after they are stored. Expired entries are kept
+    while they can be revalidated with an ETag or Last-Modified, and `evict` removes
+    the rest, then the least recently used entries until the cache fits in
+    `max_bytes`. In `offline` mode every cached entry is served regardless of age and
+    nothing may be requested.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        offline: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.offline = offline
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Configure a cache from LIFEDB_BUXFER_API_CACHE* variables, if enabled.
+
+        LIFEDB_BUXFER_API_CACHE is `off` (the default), `on` or `offline`.
+        """
+        mode = os.getenv("LIFEDB_BUXFER_API_CACHE", "off").lower()
+
+        if mode == "off":
+            return None
+
+        if mode not in ("on", "offline"):
+            raise ValueError(
+                "LIFEDB_BUXFER_API_CACHE must be one of off, on or offline."
+            )
+
+        return cls(
+            os.getenv(
+                "LIFEDB_BUXFER_API_CACHE_DIR",
+                Path("~/.cache/lifedb/buxfer_api").expanduser(),
+            ),
+            ttl_seconds=float(
+                os.getenv("LIFEDB_BUXFER_API_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+            ),
+            max_bytes=int(
+                os.getenv("LIFEDB_BUXFER_API_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+            ),
+            offline=mode == "offline",
+        )
+
+    def _get_paths(self, url: str, params: dict) -> tuple[Path, Path]:
+        key = hashlib.sha256(
+            json.dumps(
+                [url, sorted((str(k), str(v)) for k, v in params.items())]
+            ).encode()
+        ).hexdigest()
+
+        return self.directory / f"{key}.body", self.directory / f"{key}.json"
+
+    def get(self, url: str, params: dict) -> Optional[CachedResponse]:
+        """Look up a response, fresh or not, and mark it as recently used."""
+        body_path, meta_path = self._get_paths(url, params)
+
+        try:
+            meta = json.loads(meta_path.read_text())
+            content = body_path.read_bytes()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        os.utime(meta_path)
+
+        return CachedResponse(
+            content=content,
+            stored_ts=meta["stored_ts"],
+            is_fresh=time.time() - meta["stored_ts"] < self.ttl_seconds,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def put(
+        self,
+        url: str,
+        params: dict,
+        content: bytes,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Store a response, replacing any entry for the same request."""
+        body_path, meta_path = self._get_paths(url, params)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        meta = {
+            "url": url,
+            "params": {k: v for k, v in params.items() if k not in _SECRET_PARAMS},
+            "stored_ts": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+
+        # The metadata goes last, as an entry only counts once it exists.
+        self._write_atomic(body_path, content)
+        self._write_atomic(meta_path, json.dumps(meta).encode())
+
+    def refresh(self, url: str, params: dict):
+        """Restart the TTL of an entry the server confirmed is unchanged."""
+        _, meta_path = self._get_paths(url, params)
+
+        meta = json.loads(meta_path.read_text())
+        meta["stored_ts"] = time.time()
+        self._write_atomic(meta_path, json.dumps(meta).encode())
+
+    def _write_atomic(self, path: Path, data: bytes):
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, prefix=f".{path.name}.", delete=False
+        ) as file:
+            file.write(data)
+
+        os.replace(file.name, path)
+
+    def evict(self):
+        """Remove expired entries that can't be revalidated, then trim to size."""
+        if not self.directory.exists():
+            return
+
+        entries = []
+        now = time.time()
+
+        for meta_path in self.directory.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+
+            try:
+                meta = json.loads(meta_path.read_text())
+                size = meta_path.stat().st_size + body_path.stat().st_size
+                last_used = meta_path.stat().st_mtime
+            except (FileNotFoundError, json.JSONDecodeError):
+                meta_path.unlink(missing_ok=True)
+                body_path.unlink(missing_ok=True)
+                continue
+
+            expired = now - meta["stored_ts"] >= self.ttl_seconds
+            revalidatable = meta.get("etag") or meta.get("last_modified")
+
+            # Offline, stale entries are the only copy there is.
+            if expired and not revalidatable and not self.offline:
+                meta_path.unlink(missing_ok=True)
+                body_path.unlink(missing_ok=True)
+            else:
+                entries.append((last_used, size, meta_path, body_path))
+
+        total_bytes = sum(size for _, size, _, _ in entries)
+
+        for _, size, meta_path, body_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+
+            meta_path.unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+            total_bytes -= size
@@ -1,10 +1,30 @@
 """Common functions for interacting with the database."""
 
+import asyncio
+import atexit
+import itertools
+import json
 import os
-from typing import Optional
+import sys
+import threading
+import time
+import uuid
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterable, Iterator, Literal, Optional, Sequence
 
 import polars as pl
+import polars.selectors as cs
 import psycopg
+import pyarrow as pa
+from polars.io.plugins import register_io_source
+from psycopg import sql
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from lifedb.core import metrics
 
 
 class DBError(Exception):
@@ -23,16 +43,167 @@ def _get_db_env_var(env_var_name: str) -> str:
     return env_var
 
 
-def get_db_connection(*, autocommit: bool = False) -> psycopg.Connection:
-    """Get a standard connection to the LifeDB database."""
-    return psycopg.connect(
-        user=_get_db_env_var("LIFEDB_DB_USER"),
-        password=_get_db_env_var("LIFEDB_DB_PASSWORD"),
-        host=_get_db_env_var("LIFEDB_DB_HOST"),
-        port=_get_db_env_var("LIFEDB_DB_PORT"),
-        dbname=_get_db_env_var("LIFEDB_DB_NAME"),
-        autocommit=autocommit,
+def get_db_connection_kwargs(*, init_db: bool = False) -> dict:
+    """Get `psycopg.connect` arguments for the LifeDB database from the environment.
+
+    With `init_db`, they connect to the LIFEDB_INIT_DB_NAME database instead, to
+    create or drop databases from.
+    """
+    return {
+        "user": _get_db_env_var("LIFEDB_DB_USER"),
+        "password": _get_db_env_var("LIFEDB_DB_PASSWORD"),
+        "host": _get_db_env_var("LIFEDB_DB_HOST"),
+        "port": _get_db_env_var("LIFEDB_DB_PORT"),
+        "dbname": _get_db_env_var(
+            "LIFEDB_INIT_DB_NAME" if init_db else "LIFEDB_DB_NAME"
+        ),
+    }
+
+
+def _get_db_pool_kwargs() -> dict:
+    def get_number_env_var(env_var_name: str, default: float) -> float:
+        env_var = os.getenv(env_var_name)
+
+        try:
+            return default if env_var is None else float(env_var)
+        except ValueError:
+            raise DBError(f"Environment variable {env_var_name} must be a number.")
+
+    return {
+        "min_size": int(get_number_env_var("LIFEDB_DB_POOL_MIN_SIZE", 1)),
+        "max_size": int(get_number_env_var("LIFEDB_DB_POOL_MAX_SIZE", 10)),
+        "max_idle": get_number_env_var("LIFEDB_DB_POOL_MAX_IDLE_SECONDS", 300),
+        "max_lifetime": get_number_env_var("LIFEDB_DB_POOL_MAX_LIFETIME_SECONDS", 3600),
+        "timeout": get_number_env_var("LIFEDB_DB_POOL_TIMEOUT_SECONDS", 30),
+    }
+
+
+def _reset_pooled_connection(con: psycopg.Connection):
+    # Borrowers may switch on autocommit, connections go back to the pool without it.
+    con.autocommit = False
+
+
+async def _reset_async_pooled_connection(con: psycopg.AsyncConnection):
+    await con.set_autocommit(False)
+
+
+_db_pool: Optional[ConnectionPool] = None
+_db_pool_pid: Optional[int] = None
+_db_pool_lock = threading.Lock()
+
+# Async pools run their tasks on the event loop that opened them, so each loop opens
+# its own, see `open_async_db_pool`.
+_async_db_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_db_pool() -> ConnectionPool:
+    """Get the process-wide connection pool for the LifeDB database.
+
+    The pool is opened on first use. Its size and timeouts are read from the
+    `LIFEDB_DB_POOL_*` environment variables, and connections are health checked
+    before being handed out.
+    """
+    global _db_pool, _db_pool_pid
+
+    with _db_pool_lock:
+        # Pool worker threads don't survive a fork, so a forked process (such as a
+        # Dagster multiprocess step) gets its own pool.
+        if _db_pool is None or _db_pool_pid != os.getpid():
+            _db_pool = ConnectionPool(
+                kwargs=get_db_connection_kwargs(),
+                check=ConnectionPool.check_connection,
+                reset=_reset_pooled_connection,
+                name="lifedb",
+                open=True,
+                **_get_db_pool_kwargs(),
+            )
+            _db_pool_pid = os.getpid()
+            atexit.register(_db_pool.close)
+
+        return _db_pool
+
+
+@asynccontextmanager
+async def open_async_db_pool() -> AsyncIterator[AsyncConnectionPool]:
+    """Open a connection pool for the LifeDB database on the running event loop.
+
+    Configured the same way as `get_db_pool`. Async connections are borrowed from it
+    until the block exits and the pool is closed, so open it around everything the
+    loop runs, e.g. in the coroutine passed to `asyncio.run`.
+    """
+    loop = asyncio.get_running_loop()
+
+    if loop in _async_db_pools:
+        raise DBError("An async pool is already open on this event loop.")
+
+    pool = AsyncConnectionPool(
+        kwargs=get_db_connection_kwargs(),
+        check=AsyncConnectionPool.check_connection,
+        reset=_reset_async_pooled_connection,
+        name="lifedb-async",
+        open=False,
+        **_get_db_pool_kwargs(),
     )
+    await pool.open()
+    _async_db_pools[loop] = pool
+
+    try:
+        yield pool
+    finally:
+        del _async_db_pools[loop]
+        await pool.close()
+
+
+def get_async_db_pool() -> AsyncConnectionPool:
+    """Get the connection pool opened on the running event loop."""
+    pool = _async_db_pools.get(asyncio.get_running_loop())
+
+    if pool is None:
+        raise DBError(
+            "No async pool is open on this event loop, see open_async_db_pool."
+        )
+
+    return pool
+
+
+@contextmanager
+def get_db_connection(*, autocommit: bool = False) -> Iterator[psycopg.Connection]:
+    """Borrow a standard connection to the LifeDB database from the pool.
+
+    Like a connection used as a context manager, the transaction is committed when the
+    block exits normally and rolled back on an exception. The connection then goes
+    back to the pool instead of being closed.
+    """
+    with get_db_pool().connection() as con:
+        con.autocommit = autocommit
+        yield con
+
+
+@contextmanager
+def _borrow_db_connection(
+    con: Optional[psycopg.Connection],
+) -> Iterator[psycopg.Connection]:
+    # Writes given a connection run in the caller's transaction, so several of them
+    # can be committed (or rolled back) together.
+    if con is not None:
+        yield con
+    else:
+        with get_db_connection() as con:
+            yield con
+
+
+@asynccontextmanager
+async def get_async_db_connection(
+    *, autocommit: bool = False
+) -> AsyncIterator[psycopg.AsyncConnection]:
+    """Borrow an async connection to the LifeDB database from the running loop's pool.
+
+    Like `get_db_connection`, the transaction is committed when the block exits
+    normally and rolled back on an exception.
+    """
+    async with get_async_db_pool().connection() as con:
+        await con.set_autocommit(autocommit)
+        yield con
 
 
 def get_db_connection_uri() -> str:
@@ -46,19 +217,1253 @@ def get_db_connection_uri() -> str:
     )
 
 
-def try_get_table(
-    table_name: str, *, schema: Optional[str] = None
-) -> Optional[pl.DataFrame]:
-    """Attempt to retrieve the given table, or return None if it does not exist."""
+_POSTGRES_TYPES = {
+    pl.datatypes.Boolean: "boolean",
+    pl.datatypes.Int8: "smallint",
+    pl.datatypes.Int16: "smallint",
+    pl.datatypes.Int32: "integer",
+    pl.datatypes.Int64: "bigint",
+    pl.datatypes.UInt8: "smallint",
+    pl.datatypes.UInt16: "integer",
+    pl.datatypes.UInt32: "bigint",
+    pl.datatypes.UInt64: "numeric(20, 0)",
+    pl.datatypes.Float32: "real",
+    pl.datatypes.Float64: "double precision",
+    pl.datatypes.String: "text",
+    # Postgres stores short strings compactly already, and text takes any new value.
+    pl.datatypes.Categorical: "text",
+    pl.datatypes.Enum: "text",
+    pl.datatypes.Binary: "bytea",
+    pl.datatypes.Date: "date",
+    pl.datatypes.Time: "time",
+    pl.datatypes.Datetime: "timestamp",
+    pl.datatypes.Duration: "interval",
+    # All-null columns (like an empty page) have no better type to go on.
+    pl.datatypes.Null: "text",
+}
+
+
+def _get_postgres_type(data_type: pl.DataType) -> str:
+    if isinstance(data_type, pl.datatypes.Decimal):
+        return f"numeric({data_type.precision}, {data_type.scale})"
+
+    if isinstance(data_type, pl.datatypes.Datetime) and data_type.time_zone is not None:
+        return "timestamptz"
+
+    try:
+        return _POSTGRES_TYPES[data_type.base_type()]
+    except KeyError:
+        raise DBError(f"No Postgres type known for Polars type {data_type}.")
+
+
+def _get_table_identifier(table_name: str, schema: Optional[str]) -> sql.Identifier:
+    if schema is None:
+        return sql.Identifier(table_name)
+
+    return sql.Identifier(schema, table_name)
+
+
+def ensure_table(
+    con: psycopg.Connection,
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    columns: pl.Schema,
+    primary_key: Sequence[str] = (),
+):
+    """Make sure a table exists with columns of the given Polars types.
+
+    The table is created if it doesn't exist. If it does, any of `columns` it is
+    missing are added, and `primary_key` is added if the table has none (as with tables
+    written by `DataFrame.write_database`).
+    """
+    table = _get_table_identifier(table_name, schema)
+
+    column_definitions = [
+        sql.SQL("{} {}").format(
+            sql.Identifier(column_name), sql.SQL(_get_postgres_type(data_type))
+        )
+        for column_name, data_type in columns.items()
+    ]
+    if primary_key:
+        column_definitions.append(
+            sql.SQL("primary key ({})").format(
+                sql.SQL(", ").join(map(sql.Identifier, primary_key))
+            )
+        )
+
+    with con.cursor() as cur:
+        table_oid_row = cur.execute(
+            "select to_regclass(%s)::oid", (table.as_string(con),)
+        ).fetchone()
+        table_oid = None if table_oid_row is None else table_oid_row[0]
+
+        if table_oid is not None:
+            existing_columns = {
+                column_name
+                for column_name, in cur.execute(
+                    "select attname from pg_attribute "
+                    "where attrelid = %s and attnum > 0 and not attisdropped",
+                    (table_oid,),
+                )
+            }
+            has_primary_key = (
+                cur.execute(
+                    "select 1 from pg_index where indrelid = %s and indisprimary",
+                    (table_oid,),
+                ).fetchone()
+                is not None
+            )
+
+            # Checked first so the common case takes no DDL locks, which would block
+            # other writers to the table until this transaction ends.
+            if set(columns.keys()) <= existing_columns and (
+                has_primary_key or not primary_key
+            ):
+                return
+
+        # Concurrent writers could otherwise race to create or alter the same table.
+        cur.execute(
+            "select pg_advisory_xact_lock(hashtext(%s))", (table.as_string(con),)
+        )
+
+        cur.execute(
+            sql.SQL("create table if not exists {} ({})").format(
+                table, sql.SQL(", ").join(column_definitions)
+            )
+        )
+
+        for column_name, data_type in columns.items():
+            cur.execute(
+                sql.SQL("alter table {} add column if not exists {} {}").format(
+                    table,
+                    sql.Identifier(column_name),
+                    sql.SQL(_get_postgres_type(data_type)),
+                )
+            )
+
+        if primary_key:
+            cur.execute(
+                "select 1 from pg_index where indrelid = %s::regclass and indisprimary",
+                (table.as_string(con),),
+            )
+
+            if cur.fetchone() is None:
+                cur.execute(
+                    sql.SQL("alter table {} add primary key ({})").format(
+                        table, sql.SQL(", ").join(map(sql.Identifier, primary_key))
+                    )
+                )
+
+
+# Rows encoded per COPY write; bounds the size of each CSV buffer held in memory.
+_COPY_CHUNK_ROWS = 50_000
+
+
+def _copy_dataframe(cur: psycopg.Cursor, df: pl.DataFrame, table: sql.Identifier):
+    """Stream a dataframe into a table with `COPY ... FROM STDIN`.
+
+    Chunks are encoded to CSV by Polars straight from its Arrow buffers, so no Python
+    objects are created per row. Polars quotes empty strings and leaves nulls
+    unquoted, which is how Postgres tells the two apart in CSV.
+    """
+    copy_sql = sql.SQL("copy {} ({}) from stdin with (format csv)").format(
+        table, sql.SQL(", ").join(map(sql.Identifier, df.columns))
+    )
+
+    with metrics.span("db.copy"), cur.copy(copy_sql) as copy:
+        for chunk in df.iter_slices(n_rows=_COPY_CHUNK_ROWS):
+            data = chunk.write_csv(include_header=False)
+            copy.write(data)
+            metrics.increment("db.copy_bytes", len(data))
+
+
+@dataclass(frozen=True)
+class BulkWriteResult:
+    """Summary of a bulk write."""
+
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput of the write."""
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+def _get_table_dependents(cur: psycopg.Cursor, table: str) -> list[str]:
+    """List the views, and tables with foreign keys, that depend on a table."""
+    return [
+        dependent
+        for dependent, in cur.execute(
+            "select distinct view.oid::regclass::text from pg_depend "
+            "join pg_rewrite on pg_rewrite.oid = pg_depend.objid "
+            "join pg_class view on view.oid = pg_rewrite.ev_class "
+            "where pg_depend.classid = 'pg_rewrite'::regclass "
+            "and pg_depend.refobjid = to_regclass(%s) "
+            "and view.oid <> pg_depend.refobjid "
+            "union "
+            "select conrelid::regclass::text from pg_constraint "
+            "where confrelid = to_regclass(%s) and contype = 'f' "
+            "and conrelid <> confrelid "
+            "order by 1",
+            (table, table),
+        )
+    ]
+
+
+def _get_default_constraint_name(table_name: str, label: str = "pkey") -> str:
+    # Postgres shortens the table name so the whole name fits in 63 bytes.
+    max_table_name_bytes = 63 - len(label) - 1
+    table_name = table_name.encode()[:max_table_name_bytes].decode(errors="ignore")
+
+    return f"{table_name}_{label}"
+
+
+def bulk_write_table(
+    df: pl.DataFrame,
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    mode: Literal["append", "replace", "swap"] = "append",
+    primary_key: Sequence[str] = (),
+) -> BulkWriteResult:
+    """Write a dataframe to a table with `COPY`, in a single transaction.
+
+    Parameters
+    ----------
+    df: pl.DataFrame
+        Rows to write.
+    table_name: str
+        Table to write to, created from the columns of `df` if it doesn't exist.
+    schema: Optional[str]
+        Schema of the table.
+    mode: Literal["append", "replace", "swap"]
+        "append" adds rows to the table. "replace" drops and recreates the table
+        before loading, which blocks readers until the load commits. "swap" loads into
+        a separate table and then renames it over the original, so readers are only
+        blocked for the rename and never see an empty or partial table. Both recreate
+        the table from `df`, so indexes other than the primary key, grants and other
+        settings of the table aren't kept, and both refuse to drop a table that views
+        or foreign keys depend on.
+    primary_key: Sequence[str]
+        Columns to key the table on when it is created.
+    """
+    if mode not in ("append", "replace", "swap"):
+        raise ValueError(f"Unknown write mode {mode}.")
+
+    table = _get_table_identifier(table_name, schema)
+    # Postgres truncates identifiers at 63 bytes, so keep the suffix short.
+    swap_table_name = f"{table_name[:50]}__lfdb_swap"
+    load_table_name = swap_table_name if mode == "swap" else table_name
+    load_table = _get_table_identifier(load_table_name, schema)
+
+    start = time.perf_counter()
+
+    with metrics.span("db.bulk_write"), get_db_connection() as con:
+        with con.cursor() as cur:
+            if mode in ("replace", "swap"):
+                dependents = _get_table_dependents(cur, table.as_string(con))
+                if dependents:
+                    raise DBError(
+                        f"Can't {mode} {table.as_string(con)} while it's used by "
+                        f"{', '.join(dependents)}."
+                    )
+
+                cur.execute(sql.SQL("drop table if exists {}").format(load_table))
+
+            ensure_table(
+                con,
+                load_table_name,
+                schema=schema,
+                columns=df.schema,
+                primary_key=primary_key,
+            )
+
+            _copy_dataframe(cur, df, load_table)
+
+            if mode == "swap":
+                cur.execute(sql.SQL("drop table if exists {}").format(table))
+                cur.execute(
+                    sql.SQL("alter table {} rename to {}").format(
+                        load_table, sql.Identifier(table_name)
+                    )
+                )
+
+                # Keep the default constraint name, otherwise the next swap's table
+                # would collide with the index left over from this one. Postgres
+                # shortens long names, so the name it gave is looked up.
+                primary_key_row = cur.execute(
+                    "select conname from pg_constraint "
+                    "where conrelid = %s::regclass and contype = 'p'",
+                    (table.as_string(con),),
+                ).fetchone()
+                if primary_key_row is not None:
+                    cur.execute(
+                        sql.SQL("alter table {} rename constraint {} to {}").format(
+                            table,
+                            sql.Identifier(primary_key_row[0]),
+                            sql.Identifier(_get_default_constraint_name(table_name)),
+                        )
+                    )
+
+    metrics.increment("db.rows_written", df.height)
+
+    return BulkWriteResult(rows=df.height, seconds=time.perf_counter() - start)
+
+
+def _get_upsert_query(
+    table: sql.Identifier,
+    staging_table: sql.Identifier,
+    column_names: Sequence[str],
+    *,
+    key_columns: Sequence[str],
+    compare_columns: Sequence[str],
+    order_column: Optional[str] = None,
+    loaded_ts_column: Optional[str] = None,
+) -> sql.Composed:
+    columns = sql.SQL(", ").join(map(sql.Identifier, column_names))
+    # The load timestamp is passed as a parameter in place of its staged values.
+    select_columns = sql.SQL(", ").join(
+        sql.Placeholder() if column == loaded_ts_column else sql.Identifier(column)
+        for column in column_names
+    )
+    keys = sql.SQL(", ").join(map(sql.Identifier, key_columns))
+
+    update_columns = [column for column in column_names if column not in key_columns]
+    conflict_action: sql.Composable
+    if update_columns:
+        conflict_action = sql.SQL("do update set {}").format(
+            sql.SQL(", ").join(
+                sql.SQL("{column} = excluded.{column}").format(
+                    column=sql.Identifier(column)
+                )
+                for column in update_columns
+            )
+        )
+    else:
+        conflict_action = sql.SQL("do nothing")
+
+    if update_columns and compare_columns:
+        conflict_action = sql.SQL("{} where ({}) is distinct from ({})").format(
+            conflict_action,
+            sql.SQL(", ").join(
+                sql.SQL("target.{}").format(sql.Identifier(column))
+                for column in compare_columns
+            ),
+            sql.SQL(", ").join(
+                sql.SQL("excluded.{}").format(sql.Identifier(column))
+                for column in compare_columns
+            ),
+        )
+
+    # Staged rows may repeat a key, in which case the last one staged wins.
+    select: sql.Composable
+    if order_column is None:
+        select = sql.SQL("select {} from {}").format(select_columns, staging_table)
+    else:
+        select = sql.SQL(
+            "select distinct on ({keys}) {columns} from {staging} "
+            "order by {keys}, {order} desc"
+        ).format(
+            keys=keys,
+            columns=select_columns,
+            staging=staging_table,
+            order=sql.Identifier(order_column),
+        )
+
+    return sql.SQL(
+        "insert into {table} as target ({columns}) {select} "
+        "on conflict ({keys}) {conflict_action}"
+    ).format(
+        table=table,
+        columns=columns,
+        select=select,
+        keys=keys,
+        conflict_action=conflict_action,
+    )
+
+
+def _create_staging_table(
+    cur: psycopg.Cursor, staging_table: sql.Identifier, table: sql.Identifier
+):
+    cur.execute(
+        sql.SQL(
+            "create temporary table {} (like {} including defaults) on commit drop"
+        ).format(staging_table, table)
+    )
+
+
+def upsert_table(
+    df: pl.DataFrame,
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    key_columns: Sequence[str],
+    compare_columns: Sequence[str] = (),
+    con: Optional[psycopg.Connection] = None,
+) -> int:
+    """Insert rows of `df` into a table, updating rows whose keys already exist.
+
+    Rows are copied into a temporary staging table and merged with
+    `INSERT ... ON CONFLICT DO UPDATE` in one transaction, so only the given rows are
+    written. With `compare_columns`, existing rows are only updated when one of those
+    columns differs, so unchanged rows (and their load timestamps) are left alone.
+    The table is created keyed on `key_columns` if it doesn't exist. If `df` repeats
+    a key, the last row for it wins. Returns the number of rows written.
+
+    Given `con`, rows are written in its transaction, which the caller commits.
+    """
+    if not key_columns:
+        raise ValueError("key_columns must name at least one column.")
+
+    df = df.unique(subset=list(key_columns), keep="last", maintain_order=True)
+
+    table = _get_table_identifier(table_name, schema)
+    staging_table = sql.Identifier(f"_lifedb_staging_{table_name}")
+
+    with metrics.span("db.upsert"), _borrow_db_connection(con) as con:
+        ensure_table(
+            con,
+            table_name,
+            schema=schema,
+            columns=df.schema,
+            primary_key=key_columns,
+        )
+
+        if df.height == 0:
+            return 0
+
+        with con.cursor() as cur:
+            _create_staging_table(cur, staging_table, table)
+            _copy_dataframe(cur, df, staging_table)
+
+            cur.execute(
+                _get_upsert_query(
+                    table,
+                    staging_table,
+                    df.columns,
+                    key_columns=key_columns,
+                    compare_columns=compare_columns,
+                )
+            )
+
+            metrics.increment("db.rows_written", cur.rowcount)
+
+            return cur.rowcount
+
+
+_STAGING_SEQ_COLUMN = "_lifedb_staging_seq"
+
+
+@dataclass(frozen=True)
+class UpsertResult:
+    """Summary of a streamed upsert."""
+
+    rows: int
+    loaded_ts: Optional[datetime] = None
+
+
+def upsert_table_batches(
+    batches: Iterable[pl.DataFrame],
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    key_columns: Sequence[str],
+    compare_columns: Sequence[str] = (),
+    loaded_ts_column: Optional[str] = None,
+) -> UpsertResult:
+    """Upsert a stream of dataframes into a table as one load.
+
+    Like `upsert_table`, but each batch is copied into a staging table as soon as it
+    arrives and can then be freed, so memory holds one batch however many there are.
+    Everything is merged in one transaction once the batches run out. Batches must
+    share their columns, and the first one sets the table's types if it has to be
+    created. If a key repeats, the last row for it wins, across batches too.
+
+    Batches can take long to arrive, e.g. over API requests, so no transaction is kept
+    open meanwhile: the table is created before they arrive and each batch is staged
+    on its own. The staging table lives in the connection's session, so a connection
+    stays borrowed from the pool until the merge.
+
+    A load timestamp taken before the batches would be older than loads committed
+    meanwhile. Instead, `loaded_ts_column` (which batches still need to include, for
+    its type) is set to the database clock when rows are merged, just before the
+    commit. Returns the rows written and that timestamp.
+    """
+    if not key_columns:
+        raise ValueError("key_columns must name at least one column.")
+
+    batches = iter(batches)
+    first_df = next(batches, None)
+
+    if first_df is None:
+        return UpsertResult(rows=0)
+
+    column_names = first_df.columns
+    table = _get_table_identifier(table_name, schema)
+    staging_table = sql.Identifier(f"_lifedb_staging_{table_name}")
+
+    # Committed before batches arrive, so DDL locks on the table aren't held meanwhile.
+    with get_db_connection() as con:
+        ensure_table(
+            con,
+            table_name,
+            schema=schema,
+            columns=first_df.schema,
+            primary_key=key_columns,
+        )
+
+    with get_db_connection(autocommit=True) as con, con.cursor() as cur:
+        cur.execute(
+            sql.SQL(
+                "create temporary table {staging} (like {table} including defaults)"
+            ).format(staging=staging_table, table=table)
+        )
+
+        try:
+            cur.execute(
+                sql.SQL(
+                    "alter table {} add column {} bigint generated always as identity"
+                ).format(staging_table, sql.Identifier(_STAGING_SEQ_COLUMN))
+            )
+
+            for df in itertools.chain([first_df], batches):
+                if df.height:
+                    _copy_dataframe(cur, df.select(column_names), staging_table)
+
+            with con.transaction():
+                loaded_ts = None
+                params: list[Any] = []
+                if loaded_ts_column is not None:
+                    row = cur.execute("select clock_timestamp()").fetchone()
+                    loaded_ts = None if row is None else row[0]
+                    params.append(loaded_ts)
+
+                with metrics.span("db.upsert"):
+                    cur.execute(
+                        _get_upsert_query(
+                            table,
+                            staging_table,
+                            column_names,
+                            key_columns=key_columns,
+                            compare_columns=compare_columns,
+                            order_column=_STAGING_SEQ_COLUMN,
+                            loaded_ts_column=loaded_ts_column,
+                        ),
+                        params,
+                    )
+                written_row_count = cur.rowcount
+        finally:
+            # Pooled connections outlive the load, so its staging table goes with it.
+            cur.execute(sql.SQL("drop table if exists {}").format(staging_table))
+
+    metrics.increment("db.rows_written", written_row_count)
+
+    return UpsertResult(rows=written_row_count, loaded_ts=loaded_ts)
+
+
+def replace_rows(
+    df: pl.DataFrame,
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    key_columns: Sequence[str],
+    keys: Optional[pl.DataFrame] = None,
+    primary_key: Sequence[str] = (),
+    con: Optional[psycopg.Connection] = None,
+) -> int:
+    """Replace the rows of a table matching a set of keys with the rows of `df`.
+
+    Rows whose `key_columns` match `keys` are deleted and `df` is copied in, in one
+    transaction. `keys` defaults to the keys in `df`. Pass it to also clear keys that
+    no longer have any rows, like the tags of a transaction that lost all of them.
+    The table is created keyed on `primary_key` if it doesn't exist. Returns the
+    number of rows written.
+
+    Given `con`, rows are written in its transaction, which the caller commits.
+    """
+    if not key_columns:
+        raise ValueError("key_columns must name at least one column.")
+
+    if keys is None:
+        keys = df.select(key_columns)
+    keys = keys.select(key_columns).unique()
+
+    table = _get_table_identifier(table_name, schema)
+    staging_table = sql.Identifier(f"_lifedb_keys_{table_name}")
+    key_identifiers = [sql.Identifier(column) for column in key_columns]
+
+    with metrics.span("db.replace_rows"), _borrow_db_connection(con) as con:
+        ensure_table(
+            con,
+            table_name,
+            schema=schema,
+            columns=df.schema,
+            primary_key=primary_key,
+        )
+
+        with con.cursor() as cur:
+            if keys.height > 0:
+                cur.execute(
+                    sql.SQL(
+                        "create temporary table {staging} on commit drop as "
+                        "select {keys} from {table} with no data"
+                    ).format(
+                        staging=staging_table,
+                        keys=sql.SQL(", ").join(key_identifiers),
+                        table=table,
+                    )
+                )
+
+                _copy_dataframe(cur, keys, staging_table)
+
+                cur.execute(
+                    sql.SQL("delete from {table} using {staging} where {match}").format(
+                        table=table,
+                        staging=staging_table,
+                        match=sql.SQL(" and ").join(
+                            sql.SQL("{table}.{column} = {staging}.{column}").format(
+                                table=table, staging=staging_table, column=column
+                            )
+                            for column in key_identifiers
+                        ),
+                    )
+                )
+
+            if df.height > 0:
+                _copy_dataframe(cur, df, table)
+
+    metrics.increment("db.rows_written", df.height)
+
+    return df.height
+
+
+def refresh_materialized_view(
+    view_name: str, *, schema: Optional[str] = None, concurrently: bool = True
+):
+    """Recompute the contents of a materialized view.
+
+    Refreshing `concurrently` lets readers keep querying the previous contents until
+    the refresh commits, and requires the view to have a unique index.
+    """
+    query = sql.SQL("refresh materialized view {concurrently}{view}").format(
+        concurrently=sql.SQL("concurrently " if concurrently else ""),
+        view=_get_table_identifier(view_name, schema),
+    )
+
+    with metrics.span("db.refresh"), get_db_connection() as con:
+        con.execute(query)
+
+
+def try_get_column_max(
+    column_name: str, table_name: str, *, schema: Optional[str] = None
+) -> Optional[Any]:
+    """Get the max value of a column, or None if the table is empty or doesn't exist."""
+    query = sql.SQL("select max({}) from {}").format(
+        sql.Identifier(column_name), _get_table_identifier(table_name, schema)
+    )
+
+    with get_db_connection() as con:
+        try:
+            row = con.execute(query).fetchone()
+        except psycopg.errors.UndefinedTable:
+            return None
+
+    return None if row is None else row[0]
+
+
+def table_exists(table_name: str, *, schema: Optional[str] = None) -> bool:
+    """Check whether a table, view or materialized view exists."""
     with get_db_connection() as con:
-        if schema is None:
-            query = f"select * from {table_name}"
+        row = con.execute(
+            "select to_regclass(%s)",
+            (_get_table_identifier(table_name, schema).as_string(con),),
+        ).fetchone()
+
+    return row is not None and row[0] is not None
+
+
+_POLARS_TYPES: dict[str, Any] = {
+    "bool": pl.datatypes.Boolean,
+    "int2": pl.datatypes.Int16,
+    "int4": pl.datatypes.Int32,
+    "int8": pl.datatypes.Int64,
+    "float4": pl.datatypes.Float32,
+    "float8": pl.datatypes.Float64,
+    "text": pl.datatypes.String,
+    "varchar": pl.datatypes.String,
+    "bpchar": pl.datatypes.String,
+    "uuid": pl.datatypes.String,
+    "bytea": pl.datatypes.Binary,
+    "date": pl.datatypes.Date,
+    "time": pl.datatypes.Time,
+    "timestamp": pl.datatypes.Datetime("us"),
+    "timestamptz": pl.datatypes.Datetime("us", "UTC"),
+    "interval": pl.datatypes.Duration("us"),
+}
+
+
+def _get_cursor_schema(cur: psycopg.Cursor) -> dict[str, Optional[pl.DataType]]:
+    """Polars types for the columns of a query result, None where not known."""
+    if cur.description is None:
+        raise DBError("Query did not return any columns.")
+
+    cursor_schema: dict[str, Optional[pl.DataType]] = {}
+
+    for column in cur.description:
+        type_info = cur.adapters.types.get(column.type_code)
+        type_name = "" if type_info is None else type_info.name
+
+        if type_name == "numeric" and column.precision is not None:
+            cursor_schema[column.name] = pl.datatypes.Decimal(
+                column.precision, column.scale or 0
+            )
         else:
-            query = f"select * from {schema}.{table_name}"
+            cursor_schema[column.name] = _POLARS_TYPES.get(type_name)
+
+    return cursor_schema
 
+
+def _get_select_query(
+    table_name: str,
+    *,
+    schema: Optional[str],
+    columns: Optional[Sequence[str]],
+    where: Optional[sql.Composable],
+    limit: Optional[int] = None,
+) -> sql.Composed:
+    query = sql.SQL("select {} from {}").format(
+        (
+            sql.SQL("*")
+            if columns is None
+            else sql.SQL(", ").join(map(sql.Identifier, columns))
+        ),
+        _get_table_identifier(table_name, schema),
+    )
+
+    if where is not None:
+        query += sql.SQL(" where {}").format(where)
+
+    if limit is not None:
+        query += sql.SQL(" limit {}").format(sql.Literal(limit))
+
+    return query
+
+
+def try_get_table(
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    where: Optional[sql.Composable] = None,
+    params: Sequence[Any] = (),
+) -> Optional[pl.DataFrame]:
+    """Attempt to retrieve the given table, or return None if it does not exist.
+
+    Parameters
+    ----------
+    table_name: str
+        Table to read.
+    schema: Optional[str]
+        Schema of the table.
+    columns: Optional[Sequence[str]]
+        Only read these columns, instead of all of them.
+    where: Optional[sql.Composable]
+        Condition rows must meet, evaluated by the database, such as
+        `sql.SQL("date >= %s")`.
+    params: Sequence[Any]
+        Values for placeholders in `where`.
+    """
+    query = _get_select_query(table_name, schema=schema, columns=columns, where=where)
+
+    with metrics.span("db.read"), get_db_connection() as con:
         try:
-            data = pl.read_database(query, connection=con)
+            data = pl.read_database(
+                query.as_string(con),
+                connection=con,
+                execute_options={"params": params} if params else None,
+            )
         except psycopg.errors.UndefinedTable:
-            data = None
+            return None
+
+    metrics.increment("db.rows_read", data.height)
+    metrics.increment("db.bytes_read", data.estimated_size())
 
     return data
+
+
+def _iter_table_frames(
+    table_name: str,
+    *,
+    schema: Optional[str],
+    columns: Optional[Sequence[str]],
+    where: Optional[sql.Composable],
+    params: Sequence[Any],
+    batch_size: int,
+    limit: Optional[int] = None,
+) -> Iterator[pl.DataFrame]:
+    query = _get_select_query(
+        table_name, schema=schema, columns=columns, where=where, limit=limit
+    )
+
+    with get_db_connection() as con:
+        # A named cursor is declared on the server, so rows are only sent as they are
+        # fetched instead of all at once.
+        with con.cursor(name="lifedb_iter_table") as cur:
+            cur.execute(query, params)
+            cursor_schema = _get_cursor_schema(cur)
+
+            while rows := cur.fetchmany(batch_size):
+                # Types come from the query result, so every batch has the same schema
+                # even if a batch happens to be all nulls in some column.
+                yield pl.DataFrame(rows, schema=cursor_schema, orient="row")
+
+
+def iter_table_batches(
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    where: Optional[sql.Composable] = None,
+    params: Sequence[Any] = (),
+    batch_size: int = 50_000,
+) -> Iterator[pa.RecordBatch]:
+    """Read a table as Arrow record batches of at most `batch_size` rows.
+
+    Only one batch is held in memory at a time. Parameters are the same as
+    `try_get_table`, but a missing table raises an error.
+    """
+    for frame in _iter_table_frames(
+        table_name,
+        schema=schema,
+        columns=columns,
+        where=where,
+        params=params,
+        batch_size=batch_size,
+    ):
+        yield from frame.to_arrow().to_batches()
+
+
+def scan_table(
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    where: Optional[sql.Composable] = None,
+    params: Sequence[Any] = (),
+    batch_size: int = 50_000,
+) -> pl.LazyFrame:
+    """Lazily read a table.
+
+    Nothing is read until the frame is collected. Columns selected in the lazy query
+    and row limits (when not filtering) are pushed down into the SQL query, and rows
+    are streamed in batches. Parameters are the same as `iter_table_batches`.
+    """
+    query = _get_select_query(
+        table_name, schema=schema, columns=columns, where=where, limit=0
+    )
+
+    with get_db_connection() as con:
+        with con.cursor() as cur:
+            cur.execute(query, params)
+            cursor_schema = _get_cursor_schema(cur)
+
+    scan_schema = {
+        name: dtype for name, dtype in cursor_schema.items() if dtype is not None
+    }
+    if len(scan_schema) < len(cursor_schema):
+        raise DBError(
+            f"Can't scan columns {sorted(set(cursor_schema) - set(scan_schema))} with "
+            "unsupported Postgres types, exclude them with columns."
+        )
+
+    def source(
+        with_columns: Optional[list[str]],
+        predicate: Optional[pl.Expr],
+        n_rows: Optional[int],
+        batch_size_hint: Optional[int],
+    ) -> Iterator[pl.DataFrame]:
+        frames = _iter_table_frames(
+            table_name,
+            schema=schema,
+            columns=with_columns if with_columns is not None else columns,
+            where=where,
+            params=params,
+            batch_size=batch_size_hint or batch_size,
+            # A limit can't be pushed down past a predicate Polars still has to apply.
+            limit=n_rows if predicate is None else None,
+        )
+
+        for frame in frames:
+            yield frame if predicate is None else frame.filter(predicate)
+
+    return register_io_source(source, schema=scan_schema)
+
+
+SNAPSHOT_MANIFEST_NAME = "_manifest.json"
+
+
+def get_snapshot_dir() -> Optional[Path]:
+    """Directory Parquet snapshots are written to, if LIFEDB_SNAPSHOT_DIR is set."""
+    snapshot_dir = os.getenv("LIFEDB_SNAPSHOT_DIR")
+
+    return None if not snapshot_dir else Path(snapshot_dir).expanduser()
+
+
+def _get_snapshot_table_dir(
+    table_name: str, schema: Optional[str], directory: Optional[Path]
+) -> Path:
+    if directory is None:
+        directory = get_snapshot_dir()
+
+    if directory is None:
+        raise DBError("LIFEDB_SNAPSHOT_DIR is required for snapshots.")
+
+    return directory / (schema or "public") / table_name
+
+
+def _read_snapshot_manifest(table_dir: Path) -> Optional[dict]:
+    try:
+        return json.loads((table_dir / SNAPSHOT_MANIFEST_NAME).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _normalize_time_zones(df: pl.DataFrame) -> pl.DataFrame:
+    # Rows read back from Postgres carry the session's zone name (e.g. Etc/UTC), which
+    # Polars won't concatenate with the same instants in another zone.
+    return df.with_columns(cs.datetime(time_zone="*").dt.convert_time_zone("UTC"))
+
+
+@contextmanager
+def _lock_snapshot(table_dir: Path) -> Iterator[None]:
+    with open(table_dir / ".lock", "w") as lock_file:
+        # fcntl is Unix only. On Windows, the lock file's first byte is locked instead.
+        if sys.platform == "win32":
+            import msvcrt
+
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_snapshot_partition(
+    table_dir: Path, month: str, partition: pl.DataFrame, date_column: str
+) -> dict:
+    # New files get new names, so readers of the old manifest are unaffected until it
+    # is replaced.
+    path = f"month={month}/part-{uuid.uuid4().hex}.parquet"
+    (table_dir / path).parent.mkdir(exist_ok=True)
+    partition.write_parquet(table_dir / path, compression="zstd")
+    metrics.increment("db.snapshot_rows_written", partition.height)
+
+    dates = partition.get_column(date_column).cast(pl.String)
+
+    return {
+        "path": path,
+        "rows": partition.height,
+        "bytes": (table_dir / path).stat().st_size,
+        "min_date": dates.min(),
+        "max_date": dates.max(),
+    }
+
+
+def write_snapshot(
+    df: pl.DataFrame,
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    date_column: str,
+    key_columns: Sequence[str],
+    watermark_column: Optional[str] = None,
+    directory: Optional[Path] = None,
+) -> dict:
+    """Merge rows into a Parquet snapshot of a table, partitioned by month.
+
+    Each month of `date_column` is one Parquet file under
+    `<directory>/<schema>/<table_name>/month=YYYY-MM/`. Only months with rows in `df`
+    are rewritten, merged with the rows already there, where the last row for each key
+    wins. A key whose row moved to another month is dropped from the month it was in,
+    which costs a read of the key columns of every other month. The manifest listing
+    every partition is replaced atomically once the new files are written, so readers
+    always see a complete snapshot. Concurrent writers, in any process, wait for each
+    other.
+
+    Parameters
+    ----------
+    df: pl.DataFrame
+        Rows to add or replace.
+    table_name: str
+        Table the snapshot is of.
+    schema: Optional[str]
+        Schema of the table.
+    date_column: str
+        Date, or ISO date string, column to partition by.
+    key_columns: Sequence[str]
+        Columns identifying a row.
+    watermark_column: Optional[str]
+        Timestamp column, like a load timestamp, whose latest value merged so far is
+        kept in the manifest. See `get_snapshot_watermark`.
+    directory: Optional[Path]
+        Root of all snapshots. Defaults to LIFEDB_SNAPSHOT_DIR.
+
+    Returns the new manifest.
+    """
+    table_dir = _get_snapshot_table_dir(table_name, schema, directory)
+    table_dir.mkdir(parents=True, exist_ok=True)
+
+    # Writers read, merge and replace the manifest, so concurrent writers (such as
+    # backfill runs in separate processes) take turns.
+    with _lock_snapshot(table_dir):
+        manifest = _read_snapshot_manifest(table_dir) or {
+            "table": table_name,
+            "schema": schema,
+            "date_column": date_column,
+            "key_columns": list(key_columns),
+            "partitions": {},
+        }
+
+        months = df.get_column(date_column).cast(pl.String).str.slice(0, 7)
+        replaced_paths = []
+        written_months: set[str] = set()
+
+        with metrics.span("db.write_snapshot"):
+            for (month,), partition in df.with_columns(months.alias("_month")).group_by(
+                "_month", maintain_order=True
+            ):
+                partition = _normalize_time_zones(partition.drop("_month"))
+                month = month or "unknown"
+                previous = manifest["partitions"].get(month)
+
+                if previous is not None:
+                    # Columns whose type changed since the partition was written (say
+                    # a date that used to be a string) take the new type.
+                    previous_partition = _normalize_time_zones(
+                        pl.read_parquet(table_dir / previous["path"])
+                    )
+                    previous_partition = previous_partition.cast(
+                        {
+                            column: data_type
+                            for column, data_type in partition.schema.items()
+                            if column in previous_partition.columns
+                        }
+                    )
+                    partition = pl.concat(
+                        [previous_partition, partition],
+                        how="diagonal_relaxed",
+                    ).unique(subset=list(key_columns), keep="last", maintain_order=True)
+                    replaced_paths.append(table_dir / previous["path"])
+
+                manifest["partitions"][month] = _write_snapshot_partition(
+                    table_dir, month, partition, date_column
+                )
+                written_months.add(month)
+
+            # A row whose date changed moves to another month, so its key is dropped
+            # from every other month. Only the key columns are read to find them.
+            keys = df.select(key_columns).unique()
+
+            for month, previous in list(manifest["partitions"].items()):
+                if month in written_months or not keys.height:
+                    continue
+
+                previous_path = table_dir / previous["path"]
+                has_moved_keys = (
+                    pl.scan_parquet(previous_path)
+                    .select(key_columns)
+                    .cast(keys.schema)
+                    .join(keys.lazy(), on=list(key_columns), how="semi")
+                    .head(1)
+                    .collect()
+                    .height
+                )
+                if not has_moved_keys:
+                    continue
+
+                previous_partition = pl.read_parquet(previous_path)
+                partition = previous_partition.join(
+                    keys.cast(
+                        {
+                            column: previous_partition.schema[column]
+                            for column in key_columns
+                        }
+                    ),
+                    on=list(key_columns),
+                    how="anti",
+                )
+
+                if partition.height:
+                    manifest["partitions"][month] = _write_snapshot_partition(
+                        table_dir, month, partition, date_column
+                    )
+                else:
+                    del manifest["partitions"][month]
+                replaced_paths.append(previous_path)
+
+            if watermark_column is not None and df.height:
+                watermark = df.get_column(watermark_column).max()
+                if not isinstance(watermark, datetime):
+                    raise DBError(f"{watermark_column} must be a non-null timestamp.")
+
+                previous_watermark = manifest.get("watermark")
+                if previous_watermark is not None:
+                    watermark = max(
+                        watermark, datetime.fromisoformat(previous_watermark)
+                    )
+                manifest["watermark"] = watermark.isoformat()
+
+            manifest["updated_ts"] = datetime.now(timezone.utc).isoformat()
+
+            manifest_path = table_dir / SNAPSHOT_MANIFEST_NAME
+            temp_manifest_path = manifest_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            temp_manifest_path.write_text(
+                json.dumps(manifest, indent=2, sort_keys=True)
+            )
+            os.replace(temp_manifest_path, manifest_path)
+
+        for replaced_path in replaced_paths:
+            replaced_path.unlink(missing_ok=True)
+
+    return manifest
+
+
+def get_snapshot_watermark(
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    directory: Optional[Path] = None,
+) -> Optional[datetime]:
+    """Latest `watermark_column` value merged into a snapshot, if any was."""
+    table_dir = _get_snapshot_table_dir(table_name, schema, directory)
+    manifest = _read_snapshot_manifest(table_dir)
+
+    if manifest is None or manifest.get("watermark") is None:
+        return None
+
+    return datetime.fromisoformat(manifest["watermark"])
+
+
+def scan_snapshot(
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    directory: Optional[Path] = None,
+) -> Optional[pl.LazyFrame]:
+    """Lazily read a Parquet snapshot written by `write_snapshot`.
+
+    Only the monthly partitions overlapping `start_date` to `end_date` (both
+    inclusive) are scanned, and rows outside the range are filtered out. Filters and
+    column selections in the lazy query are pushed down into the Parquet scans.
+    Returns None if the table has no snapshot.
+    """
+    table_dir = _get_snapshot_table_dir(table_name, schema, directory)
+    manifest = _read_snapshot_manifest(table_dir)
+
+    if manifest is None or not manifest["partitions"]:
+        return None
+
+    start_month = None if start_date is None else start_date.isoformat()[:7]
+    end_month = None if end_date is None else end_date.isoformat()[:7]
+
+    paths = [
+        table_dir / partition["path"]
+        for month, partition in sorted(manifest["partitions"].items())
+        if (start_month is None or month >= start_month)
+        and (end_month is None or month <= end_month)
+    ]
+
+    if not paths:
+        # Keep the schema so the result can still be used in a query.
+        any_partition = next(iter(manifest["partitions"].values()))
+        return pl.scan_parquet(table_dir / any_partition["path"]).head(0)
+
+    snapshot = pl.concat(
+        [pl.scan_parquet(path) for path in paths], how="diagonal_relaxed"
+    )
+
+    date_column = pl.col(manifest["date_column"])
+    # ISO date strings are compared as strings, so Parquet statistics still apply.
+    is_string = snapshot.collect_schema()[manifest["date_column"]] == pl.String
+
+    if start_date is not None:
+        snapshot = snapshot.filter(
+            date_column >= (start_date.isoformat() if is_string else start_date)
+        )
+    if end_date is not None:
+        snapshot = snapshot.filter(
+            date_column <= (end_date.isoformat() if is_string else end_date)
+        )
+
+    return snapshot
+
+
+def _get_frame_snapshot_path(
+    table_name: str, schema: Optional[str], directory: Optional[Path]
+) -> Path:
+    return _get_snapshot_table_dir(table_name, schema, directory).with_suffix(".arrow")
+
+
+def write_frame_snapshot(
+    df: pl.DataFrame,
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    directory: Optional[Path] = None,
+) -> Path:
+    """Write a whole table as one uncompressed Arrow IPC file, to be memory-mapped.
+
+    The file is `<directory>/<schema>/<table_name>.arrow` and is replaced atomically.
+    Readers that mapped the previous file keep reading it until they reopen the path.
+    Returns the path written.
+    """
+    path = _get_frame_snapshot_path(table_name, schema, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+
+    with metrics.span("db.write_snapshot"):
+        # Only uncompressed files can be memory-mapped. The file holds one record
+        # batch, as readers that rechunk would copy several batches into one. Polars
+        # splits large frames into batches as it writes them, so Arrow writes it.
+        table = df.to_arrow().combine_chunks()
+
+        with pa.ipc.new_file(temp_path, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+
+        os.replace(temp_path, path)
+
+    metrics.increment("db.snapshot_rows_written", df.height)
+
+    return path
+
+
+def read_frame_snapshot(
+    table_name: str,
+    *,
+    schema: Optional[str] = None,
+    directory: Optional[Path] = None,
+) -> Optional[pl.DataFrame]:
+    """Memory-map a snapshot written by `write_frame_snapshot`, or None if missing.
+
+    Columns are read straight from the mapped file rather than copied, so opening it
+    takes about the same time whatever its size, and processes mapping the same file
+    share its pages through the OS page cache.
+    """
+    path = _get_frame_snapshot_path(table_name, schema, directory)
+
+    try:
+        return pl.read_ipc(path, memory_map=True)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,149 @@
+"""Steps landing and loading LifeDB data, shared by Dagster and the benchmarks."""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Sequence
+
+import polars as pl
+from psycopg import sql
+
+from lifedb.core import db, metrics, transform
+
+
+def land_buxfer_api_transactions(transaction_pages: Iterable[pl.DataFrame]) -> int:
+    """Merge pages of Buxfer API transactions into the landing table.
+
+    Pages are written as they arrive, in one load. When LIFEDB_SNAPSHOT_DIR is set,
+    the landing snapshot is then brought up to date. Returns the rows written.
+    """
+    # Replaced by the time rows are merged, see below. It only sets the column's type.
+    provisional_loaded_ts = datetime.now(timezone.utc)
+    fetched_row_counts = []
+
+    def stamp(transactions: pl.DataFrame) -> pl.DataFrame:
+        fetched_row_counts.append(transactions.height)
+
+        return transform.with_row_hash(transactions).with_columns(
+            pl.lit(provisional_loaded_ts).alias("lifedb_loaded_ts")
+        )
+
+    # Only the fetched rows are written, existing transactions with the same id are
+    # updated in place, and only if their content changed. Unchanged rows keep their
+    # lifedb_loaded_ts, so downstream assets don't reprocess them. Written rows are
+    # stamped just before the load commits, not when it started, so a downstream run
+    # that read the landing table while pages were still arriving can't have recorded
+    # a later watermark than these rows.
+    result = db.upsert_table_batches(
+        map(stamp, transaction_pages),
+        "buxfer_api_transactions",
+        schema="landing",
+        key_columns=["id"],
+        compare_columns=[transform.ROW_HASH_COLUMN],
+        loaded_ts_column="lifedb_loaded_ts",
+    )
+    metrics.increment("landing.unchanged_rows", sum(fetched_row_counts) - result.rows)
+
+    # Run even when nothing was written, so rows a failed snapshot missed catch up.
+    if db.get_snapshot_dir() is not None:
+        _write_buxfer_api_transactions_snapshot()
+
+    return result.rows
+
+
+def _write_buxfer_api_transactions_snapshot():
+    # The first snapshot is seeded from the whole landing table, later runs merge in
+    # every row loaded since the snapshot's watermark, including rows an earlier run
+    # wrote but failed to snapshot. Either way rows are read and merged in batches, so
+    # a full resync never has to fit in memory at once.
+    watermark = db.get_snapshot_watermark("buxfer_api_transactions", schema="landing")
+
+    if watermark is None:
+        batches = db.iter_table_batches("buxfer_api_transactions", schema="landing")
+    else:
+        batches = db.iter_table_batches(
+            "buxfer_api_transactions",
+            schema="landing",
+            where=sql.SQL("lifedb_loaded_ts > %s"),
+            params=[watermark],
+        )
+
+    for batch in batches:
+        db.write_snapshot(
+            pl.DataFrame(batch),
+            "buxfer_api_transactions",
+            schema="landing",
+            date_column="date",
+            key_columns=["id"],
+            watermark_column="lifedb_loaded_ts",
+        )
+
+
+def load_financial_transactions(
+    get_where: Callable[[transform.FinancialTransactionsSource], sql.Composable],
+    params: Sequence[Any],
+) -> int:
+    """Conform landing rows of every source into analytics, with their tags.
+
+    `get_where` gives the filter, with `params`, of the rows read from each source.
+    Returns the transactions written.
+    """
+    # Every source is scanned lazily and conformed in one union plan, so rows are
+    # streamed from each landing table straight into the conformed result.
+    sources = {
+        name: db.scan_table(
+            source.table_name,
+            schema=source.schema,
+            where=get_where(source),
+            params=params,
+        )
+        for name, source in transform.FINANCIAL_TRANSACTIONS_SOURCES.items()
+        if db.table_exists(source.table_name, schema=source.schema)
+    }
+    if not sources:
+        return 0
+
+    with metrics.span("transform.conform"):
+        financial_transactions = (
+            transform.with_row_hash(
+                transform.conform_financial_transactions(sources),
+                exclude=["landing_loaded_ts"],
+            )
+            .with_columns(pl.lit(datetime.now(timezone.utc)).alias("lifedb_loaded_ts"))
+            .collect()
+        )
+
+    metrics.increment("transform.rows", financial_transactions.height)
+
+    # Transactions and their tags are committed together, so a failed tag write rolls
+    # the transactions back too and the next run writes both again.
+    with db.get_db_connection() as con:
+        # Rows are rewritten when their conformed content or their landing row
+        # changed, so a full refresh over unchanged landing data writes nothing.
+        written_row_count = db.upsert_table(
+            financial_transactions,
+            "financial_transactions",
+            schema="analytics",
+            key_columns=["financial_txn_uuid"],
+            compare_columns=[transform.ROW_HASH_COLUMN, "landing_loaded_ts"],
+            con=con,
+        )
+        if not written_row_count:
+            return 0
+
+        # Every loaded transaction's tags are replaced, so tags removed at the source
+        # are removed here too.
+        with metrics.span("transform.explode_tags"):
+            financial_transaction_tags = transform.explode_financial_transaction_tags(
+                financial_transactions
+            )
+
+        db.replace_rows(
+            financial_transaction_tags,
+            "financial_transaction_tags",
+            schema="analytics",
+            key_columns=["financial_txn_uuid"],
+            keys=financial_transactions.select("financial_txn_uuid"),
+            primary_key=["financial_txn_uuid", "financial_txn_tag"],
+            con=con,
+        )
+
+    return written_row_count
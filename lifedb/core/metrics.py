@@ -0,0 +1,219 @@
+"""Lightweight span timings and counters for pipeline stages.
+
+Instrumented code calls `span` and `increment` unconditionally. They only record
+while a `collect_metrics` block is active in the current context, and are close to
+free otherwise. The collector is held in a context variable, so async tasks share it
+with the code that started them. Threads need the context passed along, e.g. with
+`contextvars.copy_context().run`.
+"""
+
+import contextvars
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Metrics:
+    """Span timings and counters recorded during one `collect_metrics` block.
+
+    Span seconds are summed over every call, so spans that run concurrently can add up
+    to more than the wall time of the block.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.span_seconds: dict[str, float] = {}
+        self.span_calls: dict[str, int] = {}
+        self.counters: dict[str, float] = {}
+
+    def add_span(self, name: str, seconds: float):
+        """Record one call of a span."""
+        with self._lock:
+            self.span_seconds[name] = self.span_seconds.get(name, 0.0) + seconds
+            self.span_calls[name] = self.span_calls.get(name, 0) + 1
+
+    def increment(self, name: str, value: float = 1):
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_metadata(self) -> dict[str, float]:
+        """Flatten into `<span>_seconds` and counter values, e.g. for Dagster."""
+        with self._lock:
+            metadata: dict[str, float] = {
+                f"{name}_seconds": seconds
+                for name, seconds in sorted(self.span_seconds.items())
+            }
+            metadata.update(sorted(self.counters.items()))
+
+        return metadata
+
+
+_current_metrics: contextvars.ContextVar[Optional[Metrics]] = contextvars.ContextVar(
+    "lifedb_metrics", default=None
+)
+
+
+@contextmanager
+def collect_metrics() -> Iterator[Metrics]:
+    """Record spans and counters from the enclosed code into a new `Metrics`."""
+    metrics = Metrics()
+    token = _current_metrics.set(metrics)
+
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed code as a call of span `name`."""
+    metrics = _current_metrics.get()
+
+    if metrics is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_span(name, time.perf_counter() - start)
+
+
+def increment(name: str, value: float = 1):
+    """Add `value` to counter `name`."""
+    metrics = _current_metrics.get()
+
+    if metrics is not None:
+        metrics.increment(name, value)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_prometheus_text(metrics: Metrics, *, job: str) -> str:
+    """Format metrics from the last run of `job` in the Prometheus text format."""
+    job_label = f'job="{_escape_label_value(job)}"'
+
+    lines = [
+        "# HELP lifedb_span_seconds Seconds spent in each span during the last run.",
+        "# TYPE lifedb_span_seconds gauge",
+        *(
+            f'lifedb_span_seconds{{{job_label},span="{_escape_label_value(name)}"}} '
+            f"{seconds}"
+            for name, seconds in sorted(metrics.span_seconds.items())
+        ),
+        "# HELP lifedb_span_calls Calls of each span during the last run.",
+        "# TYPE lifedb_span_calls gauge",
+        *(
+            f'lifedb_span_calls{{{job_label},span="{_escape_label_value(name)}"}} '
+            f"{calls}"
+            for name, calls in sorted(metrics.span_calls.items())
+        ),
+        "# HELP lifedb_counter Rows, bytes and requests counted during the last run.",
+        "# TYPE lifedb_counter gauge",
+        *(
+            f'lifedb_counter{{{job_label},name="{_escape_label_value(name)}"}} '
+            f"{value}"
+            for name, value in sorted(metrics.counters.items())
+        ),
+        "# HELP lifedb_last_run_timestamp_seconds When the last run finished.",
+        "# TYPE lifedb_last_run_timestamp_seconds gauge",
+        f"lifedb_last_run_timestamp_seconds{{{job_label}}} {time.time()}",
+    ]
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(metrics: Metrics, directory: str, *, job: str):
+    """Write metrics to `<directory>/lifedb_<job>.prom` for a textfile collector.
+
+    The file is replaced atomically, so the collector never reads a partial file. It's
+    readable by everyone, as collectors often run as another user.
+    """
+    text = format_prometheus_text(metrics, job=job)
+
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, prefix=f".lifedb_{job}.", suffix=".tmp", delete=False
+    ) as file:
+        file.write(text)
+
+    # Temporary files are only readable by their owner.
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, os.path.join(directory, f"lifedb_{job}.prom"))
+
+
+def export_otlp(metrics: Metrics, endpoint: str, *, job: str):
+    """Push metrics to an OpenTelemetry collector over OTLP/HTTP.
+
+    Requires the `otel` extra.
+    """
+    try:
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import (  # type: ignore[import-not-found] # noqa: E501
+            OTLPMetricExporter,
+        )
+        from opentelemetry.sdk.metrics import (  # type: ignore[import-not-found]
+            MeterProvider,
+        )
+        from opentelemetry.sdk.metrics.export import (  # type: ignore[import-not-found] # noqa: E501
+            PeriodicExportingMetricReader,
+        )
+        from opentelemetry.sdk.resources import (  # type: ignore[import-not-found]
+            Resource,
+        )
+    except ImportError as err:
+        raise ImportError(
+            "Exporting metrics over OTLP requires the lifedb[otel] extra."
+        ) from err
+
+    # Metrics are only exported once when the provider shuts down, not periodically.
+    reader = PeriodicExportingMetricReader(
+        OTLPMetricExporter(endpoint=endpoint), export_interval_millis=2**31 - 1
+    )
+    provider = MeterProvider(
+        metric_readers=[reader],
+        resource=Resource.create({"service.name": "lifedb"}),
+    )
+    meter = provider.get_meter(__name__)
+
+    span_seconds = meter.create_counter("lifedb.span.duration", unit="s")
+    span_calls = meter.create_counter("lifedb.span.calls")
+    counters = meter.create_counter("lifedb.counter")
+
+    for name, seconds in metrics.span_seconds.items():
+        span_seconds.add(seconds, {"job": job, "span": name})
+        span_calls.add(metrics.span_calls[name], {"job": job, "span": name})
+
+    for name, value in metrics.counters.items():
+        counters.add(value, {"job": job, "name": name})
+
+    provider.shutdown()
+
+
+def export_metrics(metrics: Metrics, *, job: str):
+    """Export metrics to wherever the environment configures.
+
+    LIFEDB_METRICS_PROMETHEUS_DIR writes a Prometheus textfile into that directory and
+    LIFEDB_METRICS_OTLP_ENDPOINT pushes to an OpenTelemetry collector. Failures are
+    logged rather than raised, so metrics never fail the run they describe.
+    """
+    prometheus_dir = os.getenv("LIFEDB_METRICS_PROMETHEUS_DIR")
+    otlp_endpoint = os.getenv("LIFEDB_METRICS_OTLP_ENDPOINT")
+
+    try:
+        if prometheus_dir:
+            write_prometheus_textfile(metrics, prometheus_dir, job=job)
+
+        if otlp_endpoint:
+            export_otlp(metrics, otlp_endpoint, job=job)
+    except Exception:
+        logger.exception(f"Exporting metrics for {job} failed.")
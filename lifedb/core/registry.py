@@ -0,0 +1,92 @@
+"""Employee registry shown by the sample app, and its precomputed snapshot.
+
+Kept in core, as both the app and the Dagster asset writing the snapshot use it.
+"""
+
+from typing import Optional
+
+import polars as pl
+from psycopg import sql
+
+from lifedb.core import db
+
+DATA_SQL = """
+select
+    emps.employee_id,
+    emps.first_name as employee_first_name,
+    emps.last_name as employee_last_name,
+    emps.email as employee_email,
+    emps.phone_number as employee_phone_number,
+    emps.hire_date as employee_hire_date,
+    jobs.job_title,
+    depts.department_name as department,
+    locs.street_address as office_address,
+    locs.postal_code as office_postal_code,
+    locs.city as office_city,
+    locs.state_province as office_state_province,
+    locs.country_id as office_country_code,
+    emps.manager_id,
+    mans.first_name as manager_first_name,
+    mans.last_name as manager_last_name,
+    emps.salary as mo_salary,
+    -- Picking a random date in 2005 for interesting tenure.
+    date '2005-03-08' as data_as_of_date
+from sample.employees as emps
+left join sample.jobs
+    on emps.job_id = jobs.job_id
+left join sample.departments as depts
+    on emps.department_id = depts.department_id
+left join sample.locations as locs
+    on depts.location_id = locs.location_id
+left join sample.employees as mans
+    on emps.manager_id = mans.employee_id
+"""
+
+
+# One row per employee as shown in the registry table, built on DATA_SQL. The app
+# pages, sorts and filters it in the database, or in memory from its snapshot.
+REGISTRY_SQL = sql.SQL(
+    """
+select
+    employee_id,
+    employee_first_name || ' ' || employee_last_name as employee_name,
+    employee_email,
+    department,
+    job_title,
+    employee_hire_date,
+    ((data_as_of_date - employee_hire_date) / 365.0)::float8 as tenure,
+    mo_salary::float8 as mo_salary
+from ({data_sql}) as data
+"""
+).format(data_sql=sql.SQL(DATA_SQL))
+
+# Where the snapshot of REGISTRY_SQL is kept under LIFEDB_SNAPSHOT_DIR.
+REGISTRY_SNAPSHOT_SCHEMA = "app"
+REGISTRY_SNAPSHOT_TABLE_NAME = "employee_registry"
+
+
+def load_registry() -> pl.DataFrame:
+    """Query every row of the registry table from the database."""
+    with db.get_db_connection() as con:
+        return pl.read_database(REGISTRY_SQL.as_string(con), connection=con)
+
+
+def write_registry_snapshot() -> int:
+    """Snapshot the registry table for the app to memory-map, returning its rows."""
+    registry = load_registry()
+
+    db.write_frame_snapshot(
+        registry, REGISTRY_SNAPSHOT_TABLE_NAME, schema=REGISTRY_SNAPSHOT_SCHEMA
+    )
+
+    return registry.height
+
+
+def read_registry_snapshot() -> Optional[pl.DataFrame]:
+    """Memory-map the registry snapshot, or None if snapshots are off or not written."""
+    if db.get_snapshot_dir() is None:
+        return None
+
+    return db.read_frame_snapshot(
+        REGISTRY_SNAPSHOT_TABLE_NAME, schema=REGISTRY_SNAPSHOT_SCHEMA
+    )
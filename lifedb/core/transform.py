@@ -1,35 +1,350 @@
 """Transformation logic for dataframes."""
 
+import inspect
 import uuid
+from dataclasses import dataclass
+from typing import Callable, Mapping, Sequence, TypeVar
 
+import numpy as np
 import polars as pl
+import pyarrow as pa
+
+from lifedb.core import metrics
 
 BUXFER_API_TRANSACTION_UUID_NAMESPACE = uuid.UUID(
     "b62cbe9b-b190-49a2-83d1-59ff13025f68"
 )
 
+_SHA1_INITIAL_STATE = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+_SHA1_BLOCK_BYTES = 64
+# SHA-1 padding needs one 0x80 byte and an 8 byte length after the message.
+_SHA1_MAX_SINGLE_BLOCK_MESSAGE_BYTES = _SHA1_BLOCK_BYTES - 9
+# Rows hashed per numpy pass; small enough for each round's arrays to stay in cache.
+_SHA1_BATCH_ROWS = 16_384
+# Both hex digits of every byte value, laid out so a uint16 lookup writes them in order.
+_HEX_DIGIT_PAIRS = np.frombuffer(
+    "".join(f"{byte:02x}" for byte in range(256)).encode(), dtype=np.uint16
+)
+# (start, end) of each hex group in the 32 digit UUID, dashes go between them.
+_UUID_HEX_GROUPS = ((0, 8), (8, 12), (12, 16), (16, 20), (20, 32))
 
-def conform_buxfer_api_transactions(
-    buxfer_api_transactions: pl.DataFrame,
-) -> pl.DataFrame:
-    """Manipulate Buxfer API transaction data into general financial transactions."""
+FrameT = TypeVar("FrameT", pl.DataFrame, pl.LazyFrame)
+
+# Polars 1.36 made how explode treats empty and null lists configurable, and warns
+# when it's left to the default, which changes in 2.0. Earlier releases don't take it.
+_EXPLODE_DROPPING_EMPTY_KWARGS = (
+    {"empty_as_null": False, "keep_nulls": False}
+    if "empty_as_null" in inspect.signature(pl.DataFrame.explode).parameters
+    else {}
+)
+
+ROW_HASH_COLUMN = "lifedb_row_hash"
+
+
+def _rotate_left(words: np.ndarray, bits: int) -> np.ndarray:
+    return (words << np.uint32(bits)) | (words >> np.uint32(32 - bits))
+
+
+def _sha1_single_blocks(blocks: np.ndarray) -> np.ndarray:
+    """SHA-1 over many pre-padded 64 byte messages at once, one per row.
+
+    Each round runs as a numpy operation over every row, so the cost of the Python
+    loop is paid per round rather than per message.
+    """
+    row_count = blocks.shape[0]
+
+    schedule = np.empty((80, row_count), dtype=np.uint32)
+    schedule[:16] = blocks.view(">u4").T
+    for t in range(16, 80):
+        schedule[t] = _rotate_left(
+            schedule[t - 3] ^ schedule[t - 8] ^ schedule[t - 14] ^ schedule[t - 16], 1
+        )
+
+    state = [np.full(row_count, word, dtype=np.uint32) for word in _SHA1_INITIAL_STATE]
+    a, b, c, d, e = (word.copy() for word in state)
+
+    for t in range(80):
+        if t < 20:
+            f = (b & c) | (~b & d)
+            k = np.uint32(0x5A827999)
+        elif t < 40:
+            f = b ^ c ^ d
+            k = np.uint32(0x6ED9EBA1)
+        elif t < 60:
+            f = (b & c) | (b & d) | (c & d)
+            k = np.uint32(0x8F1BBCDC)
+        else:
+            f = b ^ c ^ d
+            k = np.uint32(0xCA62C1D6)
+
+        temp = _rotate_left(a, 5) + f + e + k + schedule[t]
+        e, d, c, b, a = d, c, _rotate_left(b, 30), a, temp
+
+    digest_words = np.stack(
+        [word + final for word, final in zip(state, (a, b, c, d, e))], axis=1
+    )
+
+    return digest_words.astype(">u4").view(np.uint8)
+
+
+def _format_uuids(uuid_bytes: np.ndarray) -> pl.Series:
+    row_count = uuid_bytes.shape[0]
+
+    hex_digits = _HEX_DIGIT_PAIRS[uuid_bytes].view(np.uint8)
+
+    characters = np.full((row_count, 36), ord("-"), dtype=np.uint8)
+    for group_index, (start, end) in enumerate(_UUID_HEX_GROUPS):
+        characters[:, start + group_index : end + group_index] = hex_digits[
+            :, start:end
+        ]
+
+    # Every UUID string is 36 bytes, so the Arrow string array can be built directly
+    # over the character buffer.
+    offsets = np.arange(0, 36 * (row_count + 1), 36, dtype=np.int64)
+    uuid_strings = pa.LargeStringArray.from_buffers(
+        row_count, pa.py_buffer(offsets), pa.py_buffer(characters)
+    )
+
+    return pl.Series(uuid_strings)
+
+
+def uuid5_batch(names: pl.Series, namespace: uuid.UUID) -> pl.Series:
+    """Generate UUIDv5 strings for a whole column of names at once.
+
+    Output matches `str(uuid.uuid5(namespace, name))` for every row, with nulls kept
+    as nulls. Names short enough to fit one SHA-1 block (39 bytes, which covers every
+    stringified integer id) are hashed vectorized; longer names fall back to `uuid`.
+    """
+    names = names.cast(pl.datatypes.String)
+    row_count = names.len()
+
+    arrow_names = names.rechunk().to_arrow().cast(pa.large_string())
+    _, offsets_buffer, data_buffer = arrow_names.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int64)[
+        arrow_names.offset : arrow_names.offset + row_count + 1
+    ]
+    data = (
+        np.frombuffer(data_buffer, dtype=np.uint8)
+        if data_buffer is not None
+        else np.empty(0, dtype=np.uint8)
+    )
+
+    namespace_bytes = np.frombuffer(namespace.bytes, dtype=np.uint8)
+    name_lengths = np.diff(offsets)
+    message_lengths = name_lengths + len(namespace_bytes)
+    is_single_block = message_lengths <= _SHA1_MAX_SINGLE_BLOCK_MESSAGE_BYTES
+
+    single_block_rows = np.flatnonzero(is_single_block)
+    single_block_lengths = name_lengths[single_block_rows]
+
+    blocks = np.zeros((len(single_block_rows), _SHA1_BLOCK_BYTES), dtype=np.uint8)
+    blocks[:, : len(namespace_bytes)] = namespace_bytes
+
+    # Copy every name's bytes into its row of the block matrix in one flat assignment,
+    # offsetting each name's bytes from its place in the data buffer to its block.
+    name_starts = np.cumsum(single_block_lengths) - single_block_lengths
+    byte_index = np.arange(single_block_lengths.sum())
+    source_index = byte_index + np.repeat(
+        offsets[single_block_rows] - name_starts, single_block_lengths
+    )
+    target_index = byte_index + np.repeat(
+        np.arange(len(single_block_rows)) * _SHA1_BLOCK_BYTES
+        + len(namespace_bytes)
+        - name_starts,
+        single_block_lengths,
+    )
+    blocks.reshape(-1)[target_index] = data[source_index]
+
+    block_rows = np.arange(len(single_block_rows))
+    message_bits = message_lengths[single_block_rows] * 8
+    blocks[block_rows, message_lengths[single_block_rows]] = 0x80
+    blocks[:, -2] = message_bits >> 8
+    blocks[:, -1] = message_bits & 0xFF
+
+    single_block_uuid_bytes = np.empty((len(single_block_rows), 16), dtype=np.uint8)
+    for start in range(0, len(single_block_rows), _SHA1_BATCH_ROWS):
+        end = start + _SHA1_BATCH_ROWS
+        single_block_uuid_bytes[start:end] = _sha1_single_blocks(blocks[start:end])[
+            :, :16
+        ]
+
+    uuid_bytes = np.empty((row_count, 16), dtype=np.uint8)
+    uuid_bytes[single_block_rows] = single_block_uuid_bytes
+
+    for row in np.flatnonzero(~is_single_block):
+        name = bytes(data[offsets[row] : offsets[row + 1]]).decode()
+        uuid_bytes[row] = np.frombuffer(uuid.uuid5(namespace, name).bytes, np.uint8)
 
-    def generate_uuid(id: int) -> str:
-        return str(uuid.uuid5(BUXFER_API_TRANSACTION_UUID_NAMESPACE, str(id)))
+    # Version 5 and RFC 4122 variant bits, as set by uuid.uuid5.
+    uuid_bytes[:, 6] = (uuid_bytes[:, 6] & 0x0F) | 0x50
+    uuid_bytes[:, 8] = (uuid_bytes[:, 8] & 0x3F) | 0x80
 
-    financial_transactions = buxfer_api_transactions.select(
+    uuid_strings = _format_uuids(uuid_bytes)
+
+    return (
+        pl.select(pl.when(names.is_not_null()).then(uuid_strings))
+        .to_series()
+        .alias(names.name)
+    )
+
+
+def _get_buxfer_api_financial_transaction_columns() -> list[pl.Expr]:
+    return [
         (
             pl.col("id")
-            .map_elements(generate_uuid, return_dtype=pl.datatypes.String)
+            .map_batches(
+                lambda ids: uuid5_batch(ids, BUXFER_API_TRANSACTION_UUID_NAMESPACE),
+                return_dtype=pl.datatypes.String,
+            )
             .alias("financial_txn_uuid")
         ),
-        (pl.col("date").str.strptime(pl.datatypes.Date, "%Y-%m-%d").alias("txn_dt")),
-        pl.col("transaction_type").alias("financial_txn_type"),
-        (pl.col("expense_amount") * -1).alias("income_amt"),
-        pl.col("expense_amount").alias("expense_amt"),
+        pl.col("date").alias("txn_dt"),
+        pl.col("transaction_type")
+        .cast(pl.datatypes.String)
+        .alias("financial_txn_type"),
+        (pl.col("expense_amount").cast(pl.datatypes.Float64) * -1).alias("income_amt"),
+        pl.col("expense_amount").cast(pl.datatypes.Float64).alias("expense_amt"),
         pl.col("description").alias("financial_txn_desc"),
-        pl.col("account_name").alias("financial_account"),
+        pl.col("account_name").cast(pl.datatypes.String).alias("financial_account"),
         pl.col("tags").alias("buxfer__financial_txn_tags"),
-    )
+    ]
+
+
+def conform_buxfer_api_transactions(
+    buxfer_api_transactions: pl.DataFrame,
+) -> pl.DataFrame:
+    """Manipulate Buxfer API transaction data into general financial transactions."""
+    with metrics.span("transform.conform"):
+        financial_transactions = buxfer_api_transactions.select(
+            _get_buxfer_api_financial_transaction_columns()
+        )
+
+    metrics.increment("transform.rows", financial_transactions.height)
 
     return financial_transactions
+
+
+@dataclass(frozen=True)
+class FinancialTransactionsSource:
+    """A landing table that feeds analytics.financial_transactions."""
+
+    name: str
+    schema: str
+    table_name: str
+    date_column: str
+    conform: Callable[[pl.LazyFrame], pl.LazyFrame]
+
+
+# Every source of financial transactions, by name. Add one with
+# `register_financial_transactions_source`.
+FINANCIAL_TRANSACTIONS_SOURCES: dict[str, FinancialTransactionsSource] = {}
+
+
+def register_financial_transactions_source(
+    name: str, *, table_name: str, date_column: str, schema: str = "landing"
+) -> Callable[
+    [Callable[[pl.LazyFrame], pl.LazyFrame]], Callable[[pl.LazyFrame], pl.LazyFrame]
+]:
+    """Register a function conforming a landing table into financial transactions.
+
+    The decorated function takes the landing table as a `pl.LazyFrame` and returns a
+    `pl.LazyFrame` of financial transactions, with `landing_loaded_ts` carrying the
+    table's `lifedb_loaded_ts`. Columns a source doesn't have are left null.
+
+    `date_column` must be a SQL `date` or `timestamp` column, as windows of the table
+    are selected by comparing it with dates. A text column of ISO dates fails with
+    `operator does not exist: text >= date`.
+    """
+
+    def decorator(
+        conform: Callable[[pl.LazyFrame], pl.LazyFrame]
+    ) -> Callable[[pl.LazyFrame], pl.LazyFrame]:
+        FINANCIAL_TRANSACTIONS_SOURCES[name] = FinancialTransactionsSource(
+            name=name,
+            schema=schema,
+            table_name=table_name,
+            date_column=date_column,
+            conform=conform,
+        )
+
+        return conform
+
+    return decorator
+
+
+@register_financial_transactions_source(
+    "buxfer_api", table_name="buxfer_api_transactions", date_column="date"
+)
+def conform_buxfer_api_transactions_lazy(
+    buxfer_api_transactions: pl.LazyFrame,
+) -> pl.LazyFrame:
+    """Lazily conform the Buxfer API landing table into financial transactions."""
+    return buxfer_api_transactions.select(
+        *_get_buxfer_api_financial_transaction_columns(),
+        pl.col("lifedb_loaded_ts").alias("landing_loaded_ts"),
+    )
+
+
+def conform_financial_transactions(sources: Mapping[str, pl.LazyFrame]) -> pl.LazyFrame:
+    """Union registered sources into one lazy plan of financial transactions.
+
+    `sources` maps registered source names to their landing tables. Each is conformed
+    by its registered function and tagged with `financial_txn_source`. Nothing is
+    read until the plan is collected, so Polars can push projections and filters on
+    the union down into every source.
+    """
+    return pl.concat(
+        [
+            FINANCIAL_TRANSACTIONS_SOURCES[name]
+            .conform(source_transactions)
+            .with_columns(pl.lit(name).alias("financial_txn_source"))
+            for name, source_transactions in sources.items()
+        ],
+        how="diagonal_relaxed",
+    )
+
+
+def explode_financial_transaction_tags(financial_transactions: FrameT) -> FrameT:
+    """One row per tag of each financial transaction, for the tags bridge table.
+
+    Comma-joined tags are split and exploded in one vectorized pass. Blank tags and
+    repeats of a tag on the same transaction are dropped.
+    """
+    return (
+        financial_transactions.select(
+            "financial_txn_uuid",
+            pl.col("buxfer__financial_txn_tags")
+            .str.split(",")
+            .alias("financial_txn_tag"),
+        )
+        # Transactions without tags get no rows, rather than a null tag, where Polars
+        # lets explode say so. Null tags are filtered out below either way.
+        .explode("financial_txn_tag", **_EXPLODE_DROPPING_EMPTY_KWARGS)
+        .with_columns(pl.col("financial_txn_tag").str.strip_chars())
+        .filter(pl.col("financial_txn_tag") != "")
+        .unique(maintain_order=True)
+    )
+
+
+def with_row_hash(df: FrameT, *, exclude: Sequence[str] = ()) -> FrameT:
+    """Add `lifedb_row_hash`, a hash of each row's values, to detect changed rows.
+
+    Every column except `exclude` and LifeDB's own `lifedb_` columns is hashed in one
+    vectorized pass. Hashes only stay the same within a Polars version, so upgrading
+    it makes every row look changed once. Categorical columns are hashed by value, not
+    by their codes, which depend on what else the process has seen.
+    """
+    schema = df.collect_schema()
+    columns = [
+        (
+            pl.col(column).cast(pl.datatypes.String)
+            if isinstance(data_type, (pl.datatypes.Categorical, pl.datatypes.Enum))
+            else pl.col(column)
+        )
+        for column, data_type in schema.items()
+        if column not in exclude and not column.startswith("lifedb_")
+    ]
+
+    return df.with_columns(
+        pl.struct(columns).hash(seed=0).reinterpret(signed=True).alias(ROW_HASH_COLUMN)
+    )
@@ -1,10 +1,14 @@
 """Dagster assets."""
 
+import contextvars
 import os
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Iterator, Optional
 
 import polars as pl
-from dagster import Config, asset
+from dagster import AssetExecutionContext, Config, DataVersion, MaterializeResult, asset
+from psycopg import sql
 from pydantic import Field
 
 from lifedb import core
@@ -16,67 +20,294 @@ class BuxferAPITransactionsConfig(Config):
     page_limit: int = Field(
         default=5, description="Limits the number of pages to search in API."
     )
+    max_concurrency: int = Field(
+        default=4, description="Maximum number of API pages requested at once."
+    )
+    requests_per_second: Optional[float] = Field(
+        default=None, description="Optional cap on the rate of API requests."
+    )
+    split_by_account: bool = Field(
+        default=False,
+        description=(
+            "Fetch each account concurrently, with page_limit applying to each account."
+        ),
+    )
+    full_resync: bool = Field(
+        default=False,
+        description=(
+            "Stream every page of the full history into landing, ignoring page_limit."
+        ),
+    )
 
 
-@asset
-def buxfer_api_transactions(config: BuxferAPITransactionsConfig):
-    """Get financial transaction data from Buxfer API."""
-    current_transactions = core.db.try_get_table(
-        "buxfer_api_transactions", schema="landing"
+def _get_buxfer_api_transactions(
+    config: BuxferAPITransactionsConfig,
+    *,
+    start_date: Optional[date] = None,
+    allow_partial_data: bool = False,
+) -> pl.DataFrame:
+    if config.split_by_account:
+        return core.api.get_buxfer_transactions_split(
+            start_date=start_date,
+            page_limit=config.page_limit,
+            allow_partial_data=allow_partial_data,
+            max_concurrency=config.max_concurrency,
+            requests_per_second=config.requests_per_second,
+        )
+
+    return core.api.get_buxfer_transactions(
+        start_date=start_date,
+        page_limit=config.page_limit,
+        allow_partial_data=allow_partial_data,
+        max_concurrency=config.max_concurrency,
+        requests_per_second=config.requests_per_second,
     )
 
-    if current_transactions is None or current_transactions.height == 0:
-        transactions = core.api.get_buxfer_transactions(
-            page_limit=config.page_limit, allow_partial_data=True
+
+def _update_buxfer_api_transactions(config: BuxferAPITransactionsConfig):
+    if config.full_resync:
+        # Pages are landed as they arrive, so memory stays at a few pages however long
+        # the history is.
+        core.load.land_buxfer_api_transactions(
+            core.api.iter_buxfer_transactions(
+                max_concurrency=config.max_concurrency,
+                requests_per_second=config.requests_per_second,
+            )
         )
+        return
+
+    latest_transaction_date = core.db.try_get_column_max(
+        "date", "buxfer_api_transactions", schema="landing"
+    )
+
+    if latest_transaction_date is None:
+        transactions = _get_buxfer_api_transactions(config, allow_partial_data=True)
     else:
         lookback_days_optional = os.getenv("LIFEDB_DAGSTER_LOOKBACK_DAYS")
         lookback_days = (
             0 if lookback_days_optional is None else int(lookback_days_optional)
         )
 
-        latest_transaction_date_str = current_transactions.select(
-            pl.col("date").max()
-        ).item()
-        latest_transaction_date = datetime.strptime(
-            latest_transaction_date_str, "%Y-%m-%d"
-        ).date()
-
-        new_transactions = core.api.get_buxfer_transactions(
-            start_date=latest_transaction_date - timedelta(days=lookback_days),
-            page_limit=config.page_limit,
+        transactions = _get_buxfer_api_transactions(
+            config, start_date=latest_transaction_date - timedelta(days=lookback_days)
         )
 
-        transactions = pl.concat(
-            [
-                current_transactions.filter(
-                    pl.col("id").is_in(new_transactions["id"]).not_()
-                ),
-                new_transactions,
-            ]
-        )
+    core.load.land_buxfer_api_transactions([transactions])
+
+
+# Tag Dagster stores an asset materialization's data version under.
+_DATA_VERSION_TAG = "dagster/data_version"
 
-    transactions.write_database(
-        "landing.buxfer_api_transactions",
-        connection=core.db.get_db_connection_uri(),
-        if_table_exists="replace",
+
+def _get_data_version(table_name: str, *, schema: str) -> DataVersion:
+    # Rows are only rewritten when their content changes, and every write stamps
+    # lifedb_loaded_ts, so its max changes exactly when the table's content does.
+    latest_loaded_ts = core.db.try_get_column_max(
+        "lifedb_loaded_ts", table_name, schema=schema
     )
 
+    return DataVersion("empty" if latest_loaded_ts is None else str(latest_loaded_ts))
 
-@asset(deps=[buxfer_api_transactions])
-def financial_transactions():
-    """Consolidated transactions affecting personal finance."""
-    with core.db.get_db_connection() as con:
-        buxfer_api_transactions = pl.read_database(
-            "select * from landing.buxfer_api_transactions", connection=con
-        )
 
-    financial_transactions = core.transform.conform_buxfer_api_transactions(
-        buxfer_api_transactions
+def _is_upstream_unchanged(context: AssetExecutionContext) -> bool:
+    """Whether every upstream data version matches the last materialization's inputs."""
+    provenance = context.get_asset_provenance(context.asset_key)
+
+    if provenance is None or not provenance.input_data_versions:
+        return False
+
+    for asset_key, input_data_version in provenance.input_data_versions.items():
+        event = context.instance.get_latest_materialization_event(asset_key)
+        materialization = None if event is None else event.asset_materialization
+
+        # Materializations without a data version (e.g. from backfill jobs) can't be
+        # compared, so they always count as changed.
+        if (
+            materialization is None
+            or materialization.tags is None
+            or materialization.tags.get(_DATA_VERSION_TAG) != input_data_version.value
+        ):
+            return False
+
+    return True
+
+
+@asset
+def buxfer_api_transactions(config: BuxferAPITransactionsConfig) -> MaterializeResult:
+    """Get financial transaction data from Buxfer API."""
+    with core.metrics.collect_metrics() as metrics:
+        _update_buxfer_api_transactions(config)
+
+    core.metrics.export_metrics(metrics, job="buxfer_api_transactions")
+
+    return MaterializeResult(
+        metadata=metrics.to_metadata(),
+        data_version=_get_data_version("buxfer_api_transactions", schema="landing"),
+    )
+
+
+def _get_financial_transactions_date_range() -> Optional[tuple[date, date]]:
+    date_ranges = []
+
+    for source in core.transform.FINANCIAL_TRANSACTIONS_SOURCES.values():
+        if not core.db.table_exists(source.table_name, schema=source.schema):
+            continue
+
+        with core.db.get_db_connection() as con:
+            date_range = con.execute(
+                sql.SQL(
+                    "select min({date})::date, max({date})::date from {table}"
+                ).format(
+                    date=sql.Identifier(source.date_column),
+                    table=sql.Identifier(source.schema, source.table_name),
+                )
+            ).fetchone()
+
+        if date_range is not None and date_range[0] is not None:
+            date_ranges.append(date_range)
+
+    if not date_ranges:
+        return None
+
+    return (
+        min(first_date for first_date, _ in date_ranges),
+        max(last_date for _, last_date in date_ranges),
     )
 
-    financial_transactions.write_database(
-        "analytics.financial_transactions",
-        connection=core.db.get_db_connection_uri(),
-        if_table_exists="replace",
+
+def _get_month_starts(first_date: date, last_date: date) -> list[date]:
+    month_starts = []
+    month_start = first_date.replace(day=1)
+
+    while month_start <= last_date:
+        month_starts.append(month_start)
+        month_start = (month_start + timedelta(days=32)).replace(day=1)
+
+    return month_starts
+
+
+class FinancialTransactionsConfig(Config):
+    """Config for financial_transactions asset."""
+
+    full_refresh: bool = Field(
+        default=False,
+        description=(
+            "Reprocess every landing transaction instead of only the ones loaded "
+            "since the last materialization."
+        ),
     )
+    backfill_max_workers: int = Field(
+        default=4,
+        description="Number of monthly windows processed at once during a backfill.",
+    )
+
+
+def _update_financial_transactions(config: FinancialTransactionsConfig) -> int:
+    # landing_loaded_ts carries the landing load time of each conformed row, so its max
+    # is how far landing has been processed.
+    watermark = core.db.try_get_column_max(
+        "landing_loaded_ts", "financial_transactions", schema="analytics"
+    )
+
+    if watermark is not None and not config.full_refresh:
+        return core.load.load_financial_transactions(
+            lambda source: sql.SQL("lifedb_loaded_ts > %s"), params=[watermark]
+        )
+
+    date_range = _get_financial_transactions_date_range()
+
+    if date_range is None:
+        return 0
+
+    month_starts = _get_month_starts(*date_range)
+
+    # Each month is read, conformed and upserted independently, so a full backfill
+    # fans out across windows instead of holding all of history at once. Bounds are
+    # passed as dates, so each source's date column has to be a date or timestamp.
+    with ThreadPoolExecutor(max_workers=config.backfill_max_workers) as executor:
+        # Each window runs in a copy of this context, so its metrics are collected
+        # with the rest of the run.
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run,
+                core.load.load_financial_transactions,
+                lambda source: sql.SQL("{date} >= %s and {date} < %s").format(
+                    date=sql.Identifier(source.date_column)
+                ),
+                params=[
+                    month_start,
+                    (month_start + timedelta(days=32)).replace(day=1),
+                ],
+            )
+            for month_start in month_starts
+        ]
+
+        return sum(future.result() for future in as_completed(futures))
+
+
+# Rollups of financial_transactions from the migrations, in the order they're
+# refreshed, as each is aggregated from the one before.
+FINANCIAL_TRANSACTIONS_ROLLUPS = (
+    "financial_transactions_daily",
+    "financial_transactions_monthly",
+)
+
+
+@asset(deps=[buxfer_api_transactions], output_required=False)
+def financial_transactions(
+    context: AssetExecutionContext, config: FinancialTransactionsConfig
+) -> Iterator[MaterializeResult]:
+    """Consolidated transactions affecting personal finance.
+
+    Skipped, without materializing, when no upstream data version changed since the
+    last materialization.
+    """
+    if not config.full_refresh and _is_upstream_unchanged(context):
+        context.log.info("Upstream data is unchanged, skipping.")
+        return
+
+    with core.metrics.collect_metrics() as metrics:
+        _update_financial_transactions(config)
+
+        # Refreshed concurrently, so dashboards keep reading the previous aggregates
+        # until each refresh commits. Refreshed even when no rows were loaded, as a
+        # run that failed to refresh after loading records no materialization, so the
+        # retry isn't skipped but finds nothing left to load.
+        for view_name in FINANCIAL_TRANSACTIONS_ROLLUPS:
+            # The rollups are created by migrations, which may not have run yet.
+            if not core.db.table_exists(view_name, schema="analytics"):
+                context.log.info(
+                    f"analytics.{view_name} doesn't exist, skipping its refresh. "
+                    "Run `lifedb db init` to create it."
+                )
+                continue
+
+            core.db.refresh_materialized_view(view_name, schema="analytics")
+
+    core.metrics.export_metrics(metrics, job="financial_transactions")
+
+    yield MaterializeResult(
+        metadata=metrics.to_metadata(),
+        data_version=_get_data_version("financial_transactions", schema="analytics"),
+    )
+
+
+@asset(output_required=False)
+def sample_app_registry_snapshot(
+    context: AssetExecutionContext,
+) -> Iterator[MaterializeResult]:
+    """Memory-mappable snapshot of the sample app's registry table.
+
+    Lets app workers start and serve without querying the database. Skipped when
+    LIFEDB_SNAPSHOT_DIR isn't set, as the app then queries the database itself.
+    """
+    if core.db.get_snapshot_dir() is None:
+        context.log.info("LIFEDB_SNAPSHOT_DIR isn't set, skipping.")
+        return
+
+    with core.metrics.collect_metrics() as metrics:
+        core.registry.write_registry_snapshot()
+
+    core.metrics.export_metrics(metrics, job="sample_app_registry_snapshot")
+
+    yield MaterializeResult(metadata=metrics.to_metadata())
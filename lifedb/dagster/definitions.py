@@ -8,18 +8,22 @@ from dagster import (
     load_assets_from_modules,
 )
 
-from . import assets  # noqa: TID252
+from . import assets, jobs, sensors  # noqa: TID252
 
 all_assets = load_assets_from_modules([assets])
 
+# Superseded by buxfer_api_activity_sensor, which only syncs when the API has changes.
+# Kept stopped for deployments that prefer a fixed schedule.
 batch_update_schedule = ScheduleDefinition(
     name="batch_update_schedule",
     target=AssetSelection.all(),
     cron_schedule="0 * * * *",  # every hour
-    default_status=DefaultScheduleStatus.RUNNING,
+    default_status=DefaultScheduleStatus.STOPPED,
 )
 
 defs = Definitions(
     assets=all_assets,
+    jobs=[jobs.buxfer_api_backfill, sensors.batch_update_job],
     schedules=[batch_update_schedule],
+    sensors=[sensors.buxfer_api_activity_sensor],
 )
@@ -0,0 +1,114 @@
+"""Dagster jobs."""
+
+import os
+from datetime import timedelta
+from typing import Iterator, Optional
+
+import polars as pl
+from dagster import (
+    AssetMaterialization,
+    Config,
+    DynamicOut,
+    DynamicOutput,
+    MonthlyPartitionsDefinition,
+    OpExecutionContext,
+    job,
+    multiprocess_executor,
+    op,
+)
+from pydantic import Field
+
+from lifedb import core
+
+# The current month is included, so a backfill can run right up to today.
+buxfer_api_backfill_partitions = MonthlyPartitionsDefinition(
+    start_date=os.getenv("LIFEDB_BUXFER_API_BACKFILL_START_DATE", "2015-01-01"),
+    end_offset=1,
+)
+
+
+class BuxferAPIBackfillConfig(Config):
+    """Config for fetching one account's month of Buxfer API transactions."""
+
+    page_limit: int = Field(
+        default=50,
+        description="Limits the number of pages to search in API for each account.",
+    )
+    max_concurrency: int = Field(
+        default=4,
+        description="Maximum number of API pages requested at once by each account.",
+    )
+    requests_per_second: Optional[float] = Field(
+        default=None,
+        description="Optional cap on the rate of API requests by each account.",
+    )
+
+
+@op(out=DynamicOut(int))
+def buxfer_api_accounts() -> Iterator[DynamicOutput[int]]:
+    """List Buxfer API accounts, to fetch each in its own step."""
+    for account_id in core.api.get_buxfer_accounts().get_column("id"):
+        yield DynamicOutput(account_id, mapping_key=f"account_{account_id}")
+
+
+@op(tags={"lifedb/api": "buxfer"})
+def buxfer_api_account_transactions(
+    context: OpExecutionContext, config: BuxferAPIBackfillConfig, account_id: int
+) -> pl.DataFrame:
+    """Get one account's transactions for the month of the partition."""
+    window = context.partition_time_window
+
+    with core.metrics.collect_metrics() as metrics:
+        transactions = core.api.get_buxfer_transactions(
+            start_date=window.start.date(),
+            end_date=(window.end - timedelta(days=1)).date(),
+            account_id=account_id,
+            page_limit=config.page_limit,
+            max_concurrency=config.max_concurrency,
+            requests_per_second=config.requests_per_second,
+        )
+
+    context.add_output_metadata(metrics.to_metadata())
+
+    return transactions
+
+
+@op
+def land_buxfer_api_transactions(
+    context: OpExecutionContext, account_transactions: list[pl.DataFrame]
+):
+    """Merge the month's transactions of every account into the landing table."""
+    if not account_transactions:
+        return
+
+    with core.metrics.collect_metrics() as metrics:
+        # A transfer between two accounts is listed under both.
+        transactions = pl.concat(account_transactions).unique(
+            subset="id", keep="first", maintain_order=True
+        )
+        core.load.land_buxfer_api_transactions([transactions])
+
+    core.metrics.export_metrics(metrics, job="buxfer_api_backfill")
+
+    context.log_event(
+        AssetMaterialization(
+            asset_key="buxfer_api_transactions",
+            description=f"Backfilled {context.partition_key}.",
+            metadata=metrics.to_metadata(),
+        )
+    )
+
+
+@job(partitions_def=buxfer_api_backfill_partitions, executor_def=multiprocess_executor)
+def buxfer_api_backfill():
+    """Backfill landing Buxfer API transactions one month per partition.
+
+    Every account is fetched in its own process, and a backfill over many partitions
+    runs them as separate runs, so a large initial load scales with the cores the run
+    coordinator and executor allow. Processes fetching from the API are tagged
+    `lifedb/api: buxfer`, to cap them with the executor's `tag_concurrency_limits`
+    when API concurrency is tighter than the cores available.
+    """
+    land_buxfer_api_transactions(
+        buxfer_api_accounts().map(buxfer_api_account_transactions).collect()
+    )
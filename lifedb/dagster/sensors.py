@@ -0,0 +1,150 @@
+"""Dagster sensors."""
+
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Union
+
+from dagster import (
+    AssetSelection,
+    DagsterRunStatus,
+    DefaultSensorStatus,
+    RunRequest,
+    RunsFilter,
+    SensorEvaluationContext,
+    SkipReason,
+    define_asset_job,
+    sensor,
+)
+
+from lifedb import core
+
+batch_update_job = define_asset_job("batch_update_job", selection=AssetSelection.all())
+
+# How often the sensor checks for changes while they keep coming, and how far apart
+# checks are allowed to drift while nothing changes.
+SYNC_MIN_INTERVAL_SECONDS = int(
+    os.getenv("LIFEDB_DAGSTER_SYNC_MIN_INTERVAL_SECONDS", 300)
+)
+SYNC_MAX_INTERVAL_SECONDS = int(
+    os.getenv("LIFEDB_DAGSTER_SYNC_MAX_INTERVAL_SECONDS", 6 * 60 * 60)
+)
+
+
+@dataclass(frozen=True)
+class SyncState:
+    """What the sync sensor remembers between evaluations, kept as its cursor."""
+
+    fingerprint: Optional[str] = None
+    interval_seconds: float = 0.0
+    next_check_ts: float = 0.0
+    # Run key of the last sync, until that run succeeds.
+    run_key: Optional[str] = None
+
+
+def get_next_sync_state(
+    state: SyncState,
+    fingerprint: str,
+    *,
+    now: float,
+    min_interval_seconds: float,
+    max_interval_seconds: float,
+    retry: bool = False,
+) -> tuple[bool, SyncState]:
+    """Decide whether to sync after a check, and when to check next.
+
+    A changed fingerprint, or `retry` after the last sync failed, syncs and resets
+    checks to every `min_interval_seconds`. Each check that finds nothing new doubles
+    the interval, up to `max_interval_seconds`.
+    """
+    changed = retry or fingerprint != state.fingerprint
+
+    if changed:
+        interval_seconds = min_interval_seconds
+    else:
+        interval_seconds = min(
+            max(state.interval_seconds, min_interval_seconds) * 2, max_interval_seconds
+        )
+
+    return changed, SyncState(
+        fingerprint=fingerprint,
+        interval_seconds=interval_seconds,
+        next_check_ts=now + interval_seconds,
+        run_key=state.run_key,
+    )
+
+
+def _get_sync_run_status(
+    context: SensorEvaluationContext, run_key: str
+) -> Optional[DagsterRunStatus]:
+    runs = context.instance.get_runs(
+        filters=RunsFilter(tags={"dagster/run_key": run_key}), limit=1
+    )
+
+    return runs[0].status if runs else None
+
+
+@sensor(
+    job=batch_update_job,
+    minimum_interval_seconds=SYNC_MIN_INTERVAL_SECONDS,
+    default_status=DefaultSensorStatus.RUNNING,
+)
+def buxfer_api_activity_sensor(
+    context: SensorEvaluationContext,
+) -> Union[RunRequest, SkipReason]:
+    """Materialize every asset when recent Buxfer API transactions change.
+
+    Each check requests a single page of the last LIFEDB_DAGSTER_SYNC_WINDOW_DAYS days
+    of transactions (30 by default), see `get_buxfer_transactions_fingerprint`.
+    Checks back off while nothing changes, so API and database load follow real
+    activity. A sync whose run failed or was canceled is requested again on the next
+    check, even if transactions haven't changed since.
+    """
+    state = SyncState(**json.loads(context.cursor)) if context.cursor else SyncState()
+    now = time.time()
+
+    if now < state.next_check_ts:
+        next_check = datetime.fromtimestamp(state.next_check_ts, timezone.utc)
+        return SkipReason(f"Backing off until {next_check.isoformat()}.")
+
+    # The fingerprint moves on as soon as a sync is requested, so a failed sync is
+    # only retried because its run is checked here.
+    retry = False
+    if state.run_key is not None:
+        run_status = _get_sync_run_status(context, state.run_key)
+
+        if run_status == DagsterRunStatus.SUCCESS:
+            state = replace(state, run_key=None)
+        elif run_status in (DagsterRunStatus.FAILURE, DagsterRunStatus.CANCELED):
+            retry = True
+
+    window_days = int(os.getenv("LIFEDB_DAGSTER_SYNC_WINDOW_DAYS", 30))
+    fingerprint = core.api.get_buxfer_transactions_fingerprint(
+        start_date=date.today() - timedelta(days=window_days)
+    )
+
+    should_sync, next_state = get_next_sync_state(
+        state,
+        fingerprint,
+        now=now,
+        min_interval_seconds=SYNC_MIN_INTERVAL_SECONDS,
+        max_interval_seconds=SYNC_MAX_INTERVAL_SECONDS,
+        retry=retry,
+    )
+
+    if should_sync:
+        # Unique per attempt, as Dagster never launches a run key twice.
+        next_state = replace(next_state, run_key=f"{fingerprint}@{uuid.uuid4().hex}")
+
+    context.update_cursor(json.dumps(asdict(next_state)))
+
+    if not should_sync:
+        return SkipReason(
+            "Recent transactions are unchanged, checking again in "
+            f"{next_state.interval_seconds:.0f} seconds."
+        )
+
+    return RunRequest(run_key=next_state.run_key)
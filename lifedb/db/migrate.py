@@ -0,0 +1,257 @@
+"""Versioned migrations for the LifeDB database."""
+
+import hashlib
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+import psycopg
+import yaml
+from importlib_resources import files
+from psycopg import sql
+
+from lifedb.core.db import get_db_connection, get_db_connection_kwargs
+from lifedb.core.exceptions import DBError
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = sql.Identifier("public", "lifedb_migrations")
+
+# Key of the advisory lock serializing concurrent runs against the same database.
+_MIGRATIONS_LOCK_NAME = "lifedb_migrations"
+
+
+def _read_seed(table_name: str) -> bytes:
+    return (
+        files("lifedb.db.seeds")
+        .joinpath(f"{table_name.replace('.', '_')}.csv")
+        .read_bytes()
+    )
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One versioned change to the database, with the seed tables it loads."""
+
+    version: int
+    name: str
+    sql: str
+    seeds: tuple[str, ...] = ()
+    depends_on: tuple[int, ...] = ()
+
+    @property
+    def checksum(self) -> str:
+        """Hash of the SQL and seed data, to detect edits after it was applied."""
+        digest = hashlib.sha256(self.sql.encode())
+
+        for table_name in self.seeds:
+            digest.update(_read_seed(table_name))
+
+        return digest.hexdigest()
+
+
+def load_migrations() -> list[Migration]:
+    """Load the migrations listed in migrations.yml, ordered by version."""
+    manifest = yaml.safe_load(files("lifedb.db").joinpath("migrations.yml").read_text())
+    migrations: list[Migration] = []
+
+    for entry in manifest["migrations"]:
+        migration = Migration(
+            version=entry["version"],
+            name=entry["name"],
+            sql=(
+                files("lifedb.db.sql").joinpath(entry["sql"]).read_text()
+                if "sql" in entry
+                else ""
+            ),
+            seeds=tuple(entry.get("seeds", ())),
+            depends_on=tuple(entry.get("depends_on", ())),
+        )
+
+        earlier_versions = {earlier.version for earlier in migrations}
+
+        if migrations and migration.version <= migrations[-1].version:
+            raise DBError(f"Migration {migration.version} is out of order.")
+
+        if not earlier_versions.issuperset(migration.depends_on):
+            raise DBError(
+                f"Migration {migration.version} can only depend on earlier migrations."
+            )
+
+        migrations.append(migration)
+
+    return migrations
+
+
+def ensure_database():
+    """Create the LifeDB database if it doesn't exist yet."""
+    db_name = get_db_connection_kwargs()["dbname"]
+
+    with psycopg.connect(
+        **get_db_connection_kwargs(init_db=True), autocommit=True
+    ) as con:
+        exists = con.execute(
+            "select 1 from pg_database where datname = %s", (db_name,)
+        ).fetchone()
+
+        if exists is None:
+            try:
+                con.execute(
+                    sql.SQL("create database {}").format(sql.Identifier(db_name))
+                )
+            except (psycopg.errors.DuplicateDatabase, psycopg.errors.UniqueViolation):
+                # Created by a concurrent run between the check and now.
+                pass
+
+
+def _ensure_schemas(con: psycopg.Connection):
+    # Schemas are listed separately from migrations, so adding one to schemas.yml
+    # creates it on the next run.
+    schema_yaml = yaml.safe_load(files("lifedb.db").joinpath("schemas.yml").read_text())
+
+    for schema in schema_yaml["schemas"]:
+        con.execute(
+            sql.SQL("create schema if not exists {}").format(sql.Identifier(schema))
+        )
+
+    con.execute(
+        sql.SQL(
+            """
+            create table if not exists {} (
+                version integer primary key,
+                name text not null,
+                checksum text not null,
+                applied_ts timestamptz not null default now()
+            )
+            """
+        ).format(MIGRATIONS_TABLE)
+    )
+
+
+def _record_migration(con: psycopg.Connection, migration: Migration):
+    con.execute(
+        sql.SQL("insert into {} (version, name, checksum) values (%s, %s, %s)").format(
+            MIGRATIONS_TABLE
+        ),
+        (migration.version, migration.name, migration.checksum),
+    )
+
+
+def _copy_seed(cur: psycopg.Cursor, table_name: str):
+    data = _read_seed(table_name)
+    columns = data.split(b"\n", 1)[0].decode().strip().split(",")
+
+    copy_query = sql.SQL("copy {} ({}) from stdin with (format csv, header true)")
+
+    with cur.copy(
+        copy_query.format(
+            sql.Identifier(*table_name.split(".")),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+        )
+    ) as copy:
+        copy.write(data)
+
+
+def _apply_migration(migration: Migration):
+    with get_db_connection() as con:
+        with con.transaction():
+            if migration.sql:
+                con.execute(sql.SQL(migration.sql))  # type: ignore[arg-type]
+
+            with con.cursor() as cur:
+                for table_name in migration.seeds:
+                    _copy_seed(cur, table_name)
+
+            _record_migration(con, migration)
+
+    logger.info(f"Applied migration {migration.version} ({migration.name}).")
+
+
+def _apply_migrations(
+    migrations: list[Migration], applied_versions: set[int], *, max_workers: int
+):
+    remaining = list(migrations)
+    applied_versions = set(applied_versions)
+    running: dict[Future, Migration] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while remaining or running:
+            ready = [
+                migration
+                for migration in remaining
+                if applied_versions.issuperset(migration.depends_on)
+            ]
+
+            for migration in ready:
+                remaining.remove(migration)
+                running[executor.submit(_apply_migration, migration)] = migration
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                # Raises the first failure. Migrations already running still finish,
+                # each in its own transaction, and are applied again on the next run
+                # only if they failed too.
+                future.result()
+                applied_versions.add(running.pop(future).version)
+
+
+def migrate(*, max_workers: int = 4, baseline: bool = False) -> list[Migration]:
+    """Apply every pending migration to the LifeDB database.
+
+    Each migration runs in its own transaction, so a failure never leaves one half
+    applied and running again picks up where the last run stopped. Migrations whose
+    dependencies are applied run concurrently on up to `max_workers` connections.
+    Concurrent runs wait for each other.
+
+    With `baseline`, pending migrations are only recorded as applied, for databases
+    created before migrations were tracked.
+
+    Returns the migrations that were pending.
+    """
+    migrations = load_migrations()
+
+    with get_db_connection(autocommit=True) as lock_con:
+        lock_con.execute(
+            "select pg_advisory_lock(hashtext(%s))", (_MIGRATIONS_LOCK_NAME,)
+        )
+
+        try:
+            with lock_con.transaction():
+                _ensure_schemas(lock_con)
+
+            applied_checksums = dict(
+                lock_con.execute(
+                    sql.SQL("select version, checksum from {}").format(MIGRATIONS_TABLE)
+                ).fetchall()
+            )
+
+            for migration in migrations:
+                applied_checksum = applied_checksums.get(migration.version)
+
+                if applied_checksum not in (None, migration.checksum):
+                    raise DBError(
+                        f"Migration {migration.version} ({migration.name}) changed "
+                        "after it was applied."
+                    )
+
+            pending = [
+                migration
+                for migration in migrations
+                if migration.version not in applied_checksums
+            ]
+
+            if baseline:
+                with lock_con.transaction():
+                    for migration in pending:
+                        _record_migration(lock_con, migration)
+            else:
+                _apply_migrations(
+                    pending, set(applied_checksums), max_workers=max_workers
+                )
+        finally:
+            lock_con.execute(
+                "select pg_advisory_unlock(hashtext(%s))", (_MIGRATIONS_LOCK_NAME,)
+            )
+
+    return pending
@@ -0,0 +1 @@
+"""Seed data loaded into the database by migrations."""
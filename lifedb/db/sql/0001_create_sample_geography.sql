@@ -0,0 +1,28 @@
+CREATE TABLE sample.regions (
+	region_id INTEGER PRIMARY KEY,
+	region_name CHARACTER VARYING (25)
+);
+
+CREATE TABLE sample.countries (
+	country_id CHARACTER (2) PRIMARY KEY,
+	country_name CHARACTER VARYING (40),
+	region_id INTEGER NOT NULL,
+	FOREIGN KEY (region_id) REFERENCES sample.regions (region_id)
+);
+
+CREATE TABLE sample.locations (
+	location_id INTEGER PRIMARY KEY,
+	street_address CHARACTER VARYING (40),
+	postal_code CHARACTER VARYING (12),
+	city CHARACTER VARYING (30) NOT NULL,
+	state_province CHARACTER VARYING (25),
+	country_id CHARACTER (2) NOT NULL,
+	FOREIGN KEY (country_id) REFERENCES sample.countries (country_id)
+);
+
+CREATE TABLE sample.departments (
+	department_id INTEGER PRIMARY KEY,
+	department_name CHARACTER VARYING (30) NOT NULL,
+	location_id INTEGER,
+	FOREIGN KEY (location_id) REFERENCES sample.locations (location_id)
+);
@@ -0,0 +1,6 @@
+CREATE TABLE sample.jobs (
+	job_id INTEGER PRIMARY KEY,
+	job_title CHARACTER VARYING (35) NOT NULL,
+	min_salary NUMERIC (8, 2),
+	max_salary NUMERIC (8, 2)
+);
@@ -0,0 +1,29 @@
+CREATE TABLE sample.employees (
+	employee_id INTEGER PRIMARY KEY,
+	first_name CHARACTER VARYING (20),
+	last_name CHARACTER VARYING (25) NOT NULL,
+	email CHARACTER VARYING (100) NOT NULL,
+	phone_number CHARACTER VARYING (20),
+	hire_date DATE NOT NULL,
+	job_id INTEGER NOT NULL,
+	salary NUMERIC (8, 2) NOT NULL,
+	manager_id INTEGER,
+	department_id INTEGER,
+	FOREIGN KEY (job_id) REFERENCES sample.jobs (job_id),
+	FOREIGN KEY (department_id) REFERENCES sample.departments (department_id),
+	FOREIGN KEY (manager_id) REFERENCES sample.employees (employee_id)
+);
+
+CREATE TABLE sample.dependents (
+	dependent_id INTEGER PRIMARY KEY,
+	first_name CHARACTER VARYING (50) NOT NULL,
+	last_name CHARACTER VARYING (50) NOT NULL,
+	relationship CHARACTER VARYING (25) NOT NULL,
+	employee_id INTEGER NOT NULL,
+	FOREIGN KEY (employee_id) REFERENCES sample.employees (employee_id)
+);
+
+CREATE INDEX employees_department_id_idx ON sample.employees (department_id);
+CREATE INDEX employees_job_id_idx ON sample.employees (job_id);
+CREATE INDEX employees_manager_id_idx ON sample.employees (manager_id);
+CREATE INDEX dependents_employee_id_idx ON sample.dependents (employee_id);
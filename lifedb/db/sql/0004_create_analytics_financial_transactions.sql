@@ -0,0 +1,64 @@
+-- Columns match what the financial_transactions asset writes. Tables written before
+-- this migration (by the asset itself) are kept and only gain what they're missing.
+CREATE TABLE IF NOT EXISTS analytics.financial_transactions (
+	financial_txn_uuid TEXT PRIMARY KEY
+);
+
+ALTER TABLE analytics.financial_transactions
+	ADD COLUMN IF NOT EXISTS txn_dt DATE,
+	ADD COLUMN IF NOT EXISTS financial_txn_type TEXT,
+	ADD COLUMN IF NOT EXISTS income_amt DOUBLE PRECISION,
+	ADD COLUMN IF NOT EXISTS expense_amt DOUBLE PRECISION,
+	ADD COLUMN IF NOT EXISTS financial_txn_desc TEXT,
+	ADD COLUMN IF NOT EXISTS financial_account TEXT,
+	ADD COLUMN IF NOT EXISTS buxfer__financial_txn_tags TEXT,
+	ADD COLUMN IF NOT EXISTS landing_loaded_ts TIMESTAMPTZ,
+	ADD COLUMN IF NOT EXISTS financial_txn_source TEXT;
+
+CREATE INDEX IF NOT EXISTS financial_transactions_txn_dt_idx
+	ON analytics.financial_transactions (txn_dt);
+CREATE INDEX IF NOT EXISTS financial_transactions_financial_account_idx
+	ON analytics.financial_transactions (financial_account, txn_dt);
+-- Incremental loads start from the max of this column.
+CREATE INDEX IF NOT EXISTS financial_transactions_landing_loaded_ts_idx
+	ON analytics.financial_transactions (landing_loaded_ts);
+
+-- A transaction counts toward each of its tags. Keys are never null, as refreshing
+-- concurrently matches rows on the unique index.
+CREATE MATERIALIZED VIEW analytics.financial_transactions_daily AS
+SELECT
+	txn.txn_dt,
+	COALESCE(txn.financial_account, '(none)') AS financial_account,
+	tag.financial_txn_tag,
+	COUNT(*) AS txn_count,
+	COALESCE(SUM(txn.income_amt) FILTER (WHERE txn.income_amt > 0), 0) AS income_amt,
+	COALESCE(SUM(txn.expense_amt) FILTER (WHERE txn.expense_amt > 0), 0) AS expense_amt
+FROM analytics.financial_transactions AS txn
+CROSS JOIN LATERAL (
+	SELECT DISTINCT TRIM(tag_name) AS financial_txn_tag
+	FROM UNNEST(
+		COALESCE(
+			NULLIF(STRING_TO_ARRAY(txn.buxfer__financial_txn_tags, ','), '{}'),
+			ARRAY['(untagged)']
+		)
+	) AS tag_name
+) AS tag
+WHERE txn.txn_dt IS NOT NULL
+GROUP BY 1, 2, 3;
+
+CREATE UNIQUE INDEX financial_transactions_daily_key_idx
+	ON analytics.financial_transactions_daily (txn_dt, financial_account, financial_txn_tag);
+
+CREATE MATERIALIZED VIEW analytics.financial_transactions_monthly AS
+SELECT
+	DATE_TRUNC('month', txn_dt)::DATE AS txn_month,
+	financial_account,
+	financial_txn_tag,
+	SUM(txn_count) AS txn_count,
+	SUM(income_amt) AS income_amt,
+	SUM(expense_amt) AS expense_amt
+FROM analytics.financial_transactions_daily
+GROUP BY 1, 2, 3;
+
+CREATE UNIQUE INDEX financial_transactions_monthly_key_idx
+	ON analytics.financial_transactions_monthly (txn_month, financial_account, financial_txn_tag);
@@ -0,0 +1,19 @@
+-- One row per tag of each financial transaction, written by the financial_transactions
+-- asset alongside the transactions.
+CREATE TABLE IF NOT EXISTS analytics.financial_transaction_tags (
+	financial_txn_uuid TEXT NOT NULL,
+	financial_txn_tag TEXT NOT NULL,
+	PRIMARY KEY (financial_txn_uuid, financial_txn_tag)
+);
+
+CREATE INDEX IF NOT EXISTS financial_transaction_tags_financial_txn_tag_idx
+	ON analytics.financial_transaction_tags (financial_txn_tag, financial_txn_uuid);
+
+-- Later loads only write the tags of the transactions they touch, so tags of
+-- transactions loaded before this migration are split here once.
+INSERT INTO analytics.financial_transaction_tags (financial_txn_uuid, financial_txn_tag)
+SELECT DISTINCT txn.financial_txn_uuid, TRIM(tag_name)
+FROM analytics.financial_transactions AS txn
+CROSS JOIN LATERAL UNNEST(STRING_TO_ARRAY(txn.buxfer__financial_txn_tags, ',')) AS tag_name
+WHERE TRIM(tag_name) <> ''
+ON CONFLICT DO NOTHING;
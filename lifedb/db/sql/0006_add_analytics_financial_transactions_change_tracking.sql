@@ -0,0 +1,5 @@
+-- Written with each row by the financial_transactions asset, which only rewrites rows
+-- whose lifedb_row_hash (or landing row) changed.
+ALTER TABLE analytics.financial_transactions
+	ADD COLUMN IF NOT EXISTS lifedb_row_hash BIGINT,
+	ADD COLUMN IF NOT EXISTS lifedb_loaded_ts TIMESTAMPTZ;
@@ -0,0 +1,7 @@
+-- The landing table is created by the buxfer_api_transactions asset. Tables created
+-- before it parsed dates and exact amounts are converted in place, new ones already
+-- have these types.
+ALTER TABLE IF EXISTS landing.buxfer_api_transactions
+	ALTER COLUMN date TYPE DATE USING date::DATE,
+	ALTER COLUMN amount TYPE NUMERIC(18, 2) USING ROUND(amount::NUMERIC, 2),
+	ALTER COLUMN expense_amount TYPE NUMERIC(18, 2) USING ROUND(expense_amount::NUMERIC, 2);
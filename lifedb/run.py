@@ -4,11 +4,13 @@ import typer
 from dotenv import find_dotenv, load_dotenv
 
 from lifedb.app.run import webapp_typer_app
+from lifedb.bench.run import bench_typer_app
 from lifedb.db.run import db_typer_app
 
 main_typer_app = typer.Typer()
 main_typer_app.add_typer(webapp_typer_app, name="app")
 main_typer_app.add_typer(db_typer_app, name="db")
+main_typer_app.add_typer(bench_typer_app, name="bench")
 
 
 def run():
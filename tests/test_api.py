@@ -0,0 +1,416 @@
+"""Tests for `lifedb.core.api`."""
+
+import asyncio
+import json
+import os
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import httpx
+import polars as pl
+import pytest
+
+from lifedb.core import api
+from lifedb.core.api_cache import ResponseCache
+
+
+def _make_transaction(transaction_id):
+    return {
+        "id": transaction_id,
+        "description": f"Transaction {transaction_id}",
+        "date": "2024-10-01",
+        "type": "expense",
+        "transactionType": "expense",
+        "amount": 1.5,
+        "expenseAmount": 1.5,
+        "accountId": 1,
+        "accountName": "Checking",
+        "tags": "food,coffee",
+        "tagNames": ["food", "coffee"],
+        "status": "cleared",
+        "isFutureDated": False,
+        "isPending": False,
+        "fromAccount": {"id": 1, "name": "Checking"},
+        "toAccount": None,
+    }
+
+
+def _make_page_handler(transaction_count, *, fail_first=None):
+    state = {"in_flight": 0, "max_in_flight": 0, "requests": 0, "failed": set()}
+
+    async def handler(request):
+        state["requests"] += 1
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+
+        page = int(request.url.params.get("page", 1))
+
+        # Later pages finish first, so ordering has to come from the client.
+        await asyncio.sleep(0.01 / page)
+        state["in_flight"] -= 1
+
+        if fail_first is not None and page not in state["failed"]:
+            state["failed"].add(page)
+            return httpx.Response(fail_first, headers={"Retry-After": "0"})
+
+        first_id = (page - 1) * api.BUXFER_API_PAGE_SIZE
+        last_id = min(first_id + api.BUXFER_API_PAGE_SIZE, transaction_count)
+
+        return httpx.Response(
+            200,
+            json={
+                "response": {
+                    "numTransactions": str(transaction_count),
+                    "transactions": [
+                        _make_transaction(transaction_id)
+                        for transaction_id in range(first_id, last_id)
+                    ],
+                }
+            },
+        )
+
+    return handler, state
+
+
+def _get_transactions(handler, **kwargs):
+    async def get_transactions():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await api.get_buxfer_transactions_async(client=client, **kwargs)
+
+    return asyncio.run(get_transactions())
+
+
+@pytest.fixture(autouse=True)
+def buxfer_api_token(monkeypatch):
+    monkeypatch.setenv("LIFEDB_BUXFER_API_TOKEN", "test-token")
+
+
+def test_get_buxfer_transactions_keeps_page_order_under_concurrency_cap():
+    handler, state = _make_page_handler(750)
+
+    transactions = _get_transactions(handler, page_limit=10, max_concurrency=3)
+
+    assert transactions["id"].to_list() == list(range(750))
+    assert transactions["tag_names"][0] == "food,coffee"
+    assert transactions["from_account_name"][0] == "Checking"
+    assert state["requests"] == 8
+    assert state["max_in_flight"] <= 3
+
+
+def _iter_pages(handler, *, stop_after=None, **kwargs):
+    async def iter_pages():
+        pages = []
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            async for page in api.iter_buxfer_transactions_async(
+                client=client, **kwargs
+            ):
+                pages.append(page)
+
+                if len(pages) == stop_after:
+                    break
+
+        return pages
+
+    return asyncio.run(iter_pages())
+
+
+def test_iter_buxfer_transactions_yields_every_page_in_order():
+    handler, state = _make_page_handler(1250)
+
+    pages = _iter_pages(handler, max_concurrency=3)
+
+    assert [page.height for page in pages] == [100] * 12 + [50]
+    assert pl.concat(pages)["id"].to_list() == list(range(1250))
+    assert state["requests"] == 13
+    assert state["max_in_flight"] <= 3
+
+
+def test_iter_buxfer_transactions_only_reads_ahead_of_the_consumer():
+    handler, state = _make_page_handler(1250)
+
+    pages = _iter_pages(handler, stop_after=2, max_concurrency=3)
+
+    assert len(pages) == 2
+    assert state["requests"] <= 2 + 3
+
+
+@pytest.mark.parametrize("status_code", [429, 503])
+def test_get_buxfer_transactions_retries_transient_errors(status_code):
+    handler, state = _make_page_handler(250, fail_first=status_code)
+
+    transactions = _get_transactions(
+        handler, page_limit=3, max_retries=1, backoff_seconds=0
+    )
+
+    assert transactions.height == 250
+    assert state["requests"] == 6
+
+
+def test_get_buxfer_transactions_raises_after_retries_exhausted():
+    async def handler(request):
+        return httpx.Response(500)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _get_transactions(handler, max_retries=2, backoff_seconds=0)
+
+
+def test_get_buxfer_transactions_rejects_too_many_pages():
+    handler, _ = _make_page_handler(250)
+
+    with pytest.raises(api.APIError):
+        _get_transactions(handler, page_limit=2)
+
+
+def _make_accounts_handler(transaction_count, *, account_count=3):
+    """Serve /accounts and /transactions filtered by account and date.
+
+    Transaction `i` belongs to account `i % account_count + 1` and is dated ten to a
+    day from 2024-10-01. Every 50th transaction is a transfer, listed under the next
+    account too.
+    """
+    state = {"in_flight": 0, "max_in_flight": 0, "requests": 0}
+
+    def get_account_ids(transaction_id):
+        account_id = transaction_id % account_count + 1
+        if transaction_id % 50 == 0:
+            return {account_id, account_id % account_count + 1}
+        return {account_id}
+
+    def get_date(transaction_id):
+        return date(2024, 10, 1) + timedelta(days=transaction_id // 10)
+
+    async def handler(request):
+        state["requests"] += 1
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.001)
+        state["in_flight"] -= 1
+
+        if request.url.path.endswith("/accounts"):
+            accounts = [
+                {"id": account_id, "name": f"Account {account_id}"}
+                for account_id in range(1, account_count + 1)
+            ]
+            return httpx.Response(200, json={"response": {"accounts": accounts}})
+
+        params = request.url.params
+        transaction_ids = [
+            transaction_id
+            for transaction_id in range(transaction_count)
+            if (
+                "accountId" not in params
+                or int(params["accountId"]) in get_account_ids(transaction_id)
+            )
+            and str(get_date(transaction_id)) >= params.get("startDate", "")
+            and str(get_date(transaction_id)) <= params.get("endDate", "9999")
+        ]
+
+        page = int(params.get("page", 1))
+        page_ids = transaction_ids[
+            (page - 1) * api.BUXFER_API_PAGE_SIZE : page * api.BUXFER_API_PAGE_SIZE
+        ]
+
+        transactions = []
+        for transaction_id in page_ids:
+            transaction = _make_transaction(transaction_id)
+            transaction["date"] = str(get_date(transaction_id))
+            transactions.append(transaction)
+
+        return httpx.Response(
+            200,
+            json={
+                "response": {
+                    "numTransactions": str(len(transaction_ids)),
+                    "transactions": transactions,
+                }
+            },
+        )
+
+    return handler, state
+
+
+def _get_transactions_split(handler, **kwargs):
+    async def get_transactions():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await api.get_buxfer_transactions_split_async(
+                client=client, **kwargs
+            )
+
+    return asyncio.run(get_transactions())
+
+
+def test_get_buxfer_transactions_split_by_account_deduplicates_transfers():
+    handler, state = _make_accounts_handler(600)
+
+    transactions = _get_transactions_split(handler, page_limit=3, max_concurrency=2)
+
+    assert transactions.height == 600
+    assert sorted(transactions["id"].to_list()) == list(range(600))
+    # One request for accounts, then three pages for each account.
+    assert state["requests"] == 10
+    assert state["max_in_flight"] <= 2
+
+
+def test_get_buxfer_transactions_split_by_date_window_keeps_order():
+    handler, state = _make_accounts_handler(300)
+
+    transactions = _get_transactions_split(
+        handler,
+        start_date=date(2024, 10, 1),
+        end_date=date(2024, 10, 30),
+        split_by_account=False,
+        window_days=7,
+    )
+
+    assert transactions["id"].to_list() == list(range(300))
+    assert transactions["date"].max() == date(2024, 10, 30)
+    assert state["requests"] == 5
+
+
+def test_get_buxfer_transactions_split_rejects_window_without_start_date():
+    handler, _ = _make_accounts_handler(10)
+
+    with pytest.raises(ValueError):
+        _get_transactions_split(handler, window_days=7)
+
+
+def test_parse_buxfer_api_data_handles_empty_page():
+    metadata, transactions = api._parse_buxfer_api_data(
+        b'{"response": {"numTransactions": 0, "transactions": []}}',
+        records_field="transactions",
+        camelcase_renames=api.BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES,
+        schema=api.BUXFER_API_TRANSACTIONS_SCHEMA,
+        metadata_fields=["numTransactions"],
+    )
+
+    assert metadata == {"numTransactions": "0"}
+    assert transactions.height == 0
+    assert "to_account_name" in transactions.columns
+    assert transactions.schema["tag_names"] == pl.String
+
+
+def _parse_transactions(transactions):
+    return api._parse_buxfer_api_data(
+        json.dumps({"response": {"transactions": transactions}}).encode(),
+        records_field="transactions",
+        camelcase_renames=api.BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES,
+        schema=api.BUXFER_API_TRANSACTIONS_SCHEMA,
+    )[1]
+
+
+def test_parse_buxfer_api_data_types_transactions():
+    transaction = _make_transaction(1)
+    transaction["amount"] = 0.1 + 0.2
+
+    transactions = _parse_transactions([transaction])
+
+    assert transactions["date"].to_list() == [date(2024, 10, 1)]
+    assert transactions["amount"].to_list() == [Decimal("0.30")]
+    assert transactions.schema["expense_amount"] == api.BUXFER_API_AMOUNT_TYPE
+    assert transactions.schema["transaction_type"] == pl.Categorical
+    assert transactions.schema["account_name"] == pl.Categorical
+
+
+def test_parse_buxfer_api_data_rejects_malformed_dates():
+    transaction = _make_transaction(1)
+    transaction["date"] = "10/01/2024"
+
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        _parse_transactions([transaction])
+
+
+def test_get_buxfer_transactions_replays_cached_pages(tmp_path):
+    handler, state = _make_page_handler(250)
+    cache = ResponseCache(tmp_path)
+
+    first = _get_transactions(handler, page_limit=3, cache=cache)
+    second = _get_transactions(handler, page_limit=3, cache=cache)
+    offline = _get_transactions(
+        handler, page_limit=3, cache=ResponseCache(tmp_path, offline=True)
+    )
+
+    assert state["requests"] == 3
+    assert first.equals(second)
+    assert first.equals(offline)
+    assert not any("test-token" in path.read_text() for path in tmp_path.glob("*.json"))
+
+
+def test_offline_cache_raises_on_miss(tmp_path):
+    handler, state = _make_page_handler(250)
+
+    with pytest.raises(api.APIError):
+        _get_transactions(
+            handler, page_limit=3, cache=ResponseCache(tmp_path, offline=True)
+        )
+
+    assert state["requests"] == 0
+
+
+def test_expired_cached_pages_are_revalidated(tmp_path):
+    page_handler, _ = _make_page_handler(50)
+    conditional_requests = []
+
+    async def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            conditional_requests.append(request)
+            return httpx.Response(304)
+
+        response = await page_handler(request)
+        response.headers["ETag"] = '"v1"'
+
+        return response
+
+    first = _get_transactions(handler, cache=ResponseCache(tmp_path, ttl_seconds=0))
+    second = _get_transactions(handler, cache=ResponseCache(tmp_path, ttl_seconds=0))
+
+    assert len(conditional_requests) == 1
+    assert first.equals(second)
+
+
+def test_response_cache_evicts_expired_then_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, ttl_seconds=60, max_bytes=2_500)
+
+    # (page, ETag, seconds since stored, seconds since last used)
+    for page, etag, stored_age, used_age in [
+        (1, None, 120, 0),
+        (2, '"v1"', 120, 10),
+        (3, None, 0, 30),
+        (4, None, 0, 20),
+    ]:
+        cache.put("url", {"page": page}, b"x" * 1_000, etag=etag)
+
+        _, meta_path = cache._get_paths("url", {"page": page})
+        meta = json.loads(meta_path.read_text())
+        meta["stored_ts"] -= stored_age
+        meta_path.write_text(json.dumps(meta))
+        os.utime(meta_path, (time.time() - used_age,) * 2)
+
+    cache.evict()
+
+    # Page 1 expired and can't be revalidated, page 3 was the least recently used.
+    assert [
+        page for page in range(1, 5) if cache.get("url", {"page": page}) is not None
+    ] == [2, 4]
+
+
+def test_get_buxfer_transactions_fingerprint_changes_with_recent_transactions():
+    async def get_fingerprint(transaction_count):
+        handler, state = _make_page_handler(transaction_count)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            fingerprint = await api.get_buxfer_transactions_fingerprint_async(
+                client=client
+            )
+
+        return fingerprint, state["requests"]
+
+    first, requests = asyncio.run(get_fingerprint(250))
+    same, _ = asyncio.run(get_fingerprint(250))
+    more, _ = asyncio.run(get_fingerprint(251))
+
+    assert requests == 1
+    assert first.startswith("250:")
+    assert first == same
+    assert first != more
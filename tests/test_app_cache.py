@@ -0,0 +1,57 @@
+"""Tests for `lifedb.app.cache`."""
+
+from lifedb.app.cache import BackgroundRefreshedValue, ttl_lru_cache
+
+
+def test_ttl_lru_cache_expires_and_evicts():
+    calls = []
+    now = [0.0]
+
+    @ttl_lru_cache(maxsize=2, ttl_seconds=10, clock=lambda: now[0])
+    def load(key):
+        calls.append(key)
+        return key.upper()
+
+    assert [load("a"), load("a"), load("b")] == ["A", "A", "B"]
+    assert calls == ["a", "b"]
+
+    # "a" was used least recently, so it is evicted to make room for "c".
+    load("c")
+    load("a")
+    assert calls == ["a", "b", "c", "a"]
+
+    now[0] = 9.9
+    load("a")
+    assert calls == ["a", "b", "c", "a"]
+
+    now[0] = 10.0
+    load("a")
+    assert calls == ["a", "b", "c", "a", "a"]
+
+
+def test_background_refreshed_value_keeps_last_value_on_failure(caplog):
+    loads = []
+
+    def load():
+        loads.append(None)
+
+        if len(loads) == 2:
+            raise RuntimeError("Database unavailable.")
+
+        return len(loads)
+
+    refreshed = []
+    # Refreshed by hand, the background thread doesn't wake up during the test.
+    value = BackgroundRefreshedValue(
+        load, interval_seconds=3600, on_refresh=refreshed.append
+    )
+
+    assert value.get() == 1
+
+    value.refresh()
+    assert value.get() == 1
+    assert "Background refresh failed" in caplog.text
+
+    value.refresh()
+    assert value.get() == 3
+    assert refreshed == [1, 3]
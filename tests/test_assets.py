@@ -0,0 +1,202 @@
+"""Tests for `lifedb.dagster.assets`."""
+
+import types
+from datetime import date, datetime, timezone
+
+import pytest
+from dagster import AssetKey, DataVersion, build_asset_context
+
+from lifedb.core import transform
+from lifedb.dagster import assets
+
+_SOURCE = transform.FinancialTransactionsSource(
+    name="bank",
+    schema="landing",
+    table_name="bank_transactions",
+    date_column="posted_on",
+    conform=lambda transactions: transactions,
+)
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    loads = []
+
+    def load_financial_transactions(get_where, params):
+        loads.append((get_where(_SOURCE).as_string(None), list(params)))
+        return 2
+
+    monkeypatch.setattr(
+        assets.core.load, "load_financial_transactions", load_financial_transactions
+    )
+
+    return loads
+
+
+def test_month_starts_cross_year_boundary():
+    assert assets._get_month_starts(date(2023, 11, 15), date(2024, 2, 1)) == [
+        date(2023, 11, 1),
+        date(2023, 12, 1),
+        date(2024, 1, 1),
+        date(2024, 2, 1),
+    ]
+
+
+def test_update_loads_rows_landed_after_watermark(monkeypatch, loads):
+    watermark = datetime(2024, 10, 1, tzinfo=timezone.utc)
+    monkeypatch.setattr(
+        assets.core.db, "try_get_column_max", lambda *args, **kwargs: watermark
+    )
+
+    loaded_row_count = assets._update_financial_transactions(
+        assets.FinancialTransactionsConfig()
+    )
+
+    assert loaded_row_count == 2
+    assert loads == [("lifedb_loaded_ts > %s", [watermark])]
+
+
+@pytest.mark.parametrize(
+    "watermark, config",
+    [
+        (None, assets.FinancialTransactionsConfig()),
+        (
+            datetime(2024, 10, 1, tzinfo=timezone.utc),
+            assets.FinancialTransactionsConfig(full_refresh=True),
+        ),
+    ],
+)
+def test_update_backfills_every_month_of_landing_data(
+    monkeypatch, loads, watermark, config
+):
+    monkeypatch.setattr(
+        assets.core.db, "try_get_column_max", lambda *args, **kwargs: watermark
+    )
+    monkeypatch.setattr(
+        assets,
+        "_get_financial_transactions_date_range",
+        lambda: (date(2023, 12, 20), date(2024, 1, 5)),
+    )
+
+    loaded_row_count = assets._update_financial_transactions(config)
+
+    assert loaded_row_count == 4
+    assert sorted(loads, key=lambda load: load[1]) == [
+        (
+            '"posted_on" >= %s and "posted_on" < %s',
+            [date(2023, 12, 1), date(2024, 1, 1)],
+        ),
+        (
+            '"posted_on" >= %s and "posted_on" < %s',
+            [date(2024, 1, 1), date(2024, 2, 1)],
+        ),
+    ]
+
+
+def test_update_without_landing_data_loads_nothing(monkeypatch, loads):
+    monkeypatch.setattr(
+        assets.core.db, "try_get_column_max", lambda *args, **kwargs: None
+    )
+    monkeypatch.setattr(assets, "_get_financial_transactions_date_range", lambda: None)
+
+    assert (
+        assets._update_financial_transactions(assets.FinancialTransactionsConfig()) == 0
+    )
+    assert loads == []
+
+
+def test_rollups_are_refreshed_when_nothing_was_loaded(monkeypatch):
+    refreshed = []
+    monkeypatch.setattr(assets, "_update_financial_transactions", lambda config: 0)
+    monkeypatch.setattr(
+        assets.core.db,
+        "table_exists",
+        lambda table_name, **kwargs: table_name != "financial_transactions_monthly",
+    )
+    monkeypatch.setattr(
+        assets.core.db,
+        "refresh_materialized_view",
+        lambda view_name, **kwargs: refreshed.append(view_name),
+    )
+    monkeypatch.setattr(
+        assets, "_get_data_version", lambda *args, **kwargs: DataVersion("empty")
+    )
+
+    results = list(
+        assets.financial_transactions(
+            build_asset_context(),
+            assets.FinancialTransactionsConfig(full_refresh=True),
+        )
+    )
+
+    assert len(results) == 1
+    assert refreshed == ["financial_transactions_daily"]
+
+
+@pytest.mark.parametrize(
+    "latest_loaded_ts, expected",
+    [
+        (None, "empty"),
+        (
+            datetime(2024, 10, 1, tzinfo=timezone.utc),
+            "2024-10-01 00:00:00+00:00",
+        ),
+    ],
+)
+def test_data_version_is_latest_load_timestamp(monkeypatch, latest_loaded_ts, expected):
+    monkeypatch.setattr(
+        assets.core.db, "try_get_column_max", lambda *args, **kwargs: latest_loaded_ts
+    )
+
+    assert assets._get_data_version(
+        "financial_transactions", schema="analytics"
+    ) == DataVersion(expected)
+
+
+_UPSTREAM_KEY = AssetKey("buxfer_api_transactions")
+
+
+def _make_context(input_data_versions, upstream_tags):
+    """Build a stand-in context, with tags of the last upstream materialization."""
+    provenance = (
+        None
+        if input_data_versions is None
+        else types.SimpleNamespace(input_data_versions=input_data_versions)
+    )
+    event = (
+        None
+        if upstream_tags is None
+        else types.SimpleNamespace(
+            asset_materialization=types.SimpleNamespace(tags=upstream_tags)
+        )
+    )
+
+    return types.SimpleNamespace(
+        asset_key=AssetKey("financial_transactions"),
+        get_asset_provenance=lambda asset_key: provenance,
+        instance=types.SimpleNamespace(
+            get_latest_materialization_event=lambda asset_key: event
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "input_data_versions, upstream_tags, expected",
+    [
+        # Never materialized, or without recorded inputs.
+        (None, {assets._DATA_VERSION_TAG: "a"}, False),
+        ({}, {assets._DATA_VERSION_TAG: "a"}, False),
+        # Upstream never materialized, or materialized without a data version.
+        ({_UPSTREAM_KEY: DataVersion("a")}, None, False),
+        ({_UPSTREAM_KEY: DataVersion("a")}, {}, False),
+        # Upstream materialized since.
+        ({_UPSTREAM_KEY: DataVersion("a")}, {assets._DATA_VERSION_TAG: "b"}, False),
+        ({_UPSTREAM_KEY: DataVersion("a")}, {assets._DATA_VERSION_TAG: "a"}, True),
+    ],
+)
+def test_upstream_is_unchanged_only_when_every_data_version_matches(
+    input_data_versions, upstream_tags, expected
+):
+    context = _make_context(input_data_versions, upstream_tags)
+
+    assert assets._is_upstream_unchanged(context) is expected
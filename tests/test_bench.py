@@ -0,0 +1,57 @@
+"""Tests for `lifedb.bench`."""
+
+import polars as pl
+
+from lifedb.bench import data, pipeline, server
+from lifedb.core import api
+
+
+def test_stand_in_api_serves_synthetic_transactions():
+    with server.serve_buxfer_api(250):
+        transactions = api.get_buxfer_transactions(page_limit=3, max_concurrency=2)
+
+    assert transactions["id"].to_list() == list(range(250))
+    assert transactions.schema == data.make_buxfer_transactions_frame(1).schema
+
+
+def test_response_from_frame_parses_back_to_frame():
+    transactions = data.make_buxfer_transactions_frame(500, seed=1, first_id=100)
+
+    metadata, parsed_transactions = api._parse_buxfer_api_data(
+        data.make_buxfer_transactions_response_from_frame(
+            transactions, transaction_count=500
+        ),
+        records_field="transactions",
+        camelcase_renames=api.BUXFER_API_TRANSACTIONS_CAMELCASE_RENAMES,
+        schema=api.BUXFER_API_TRANSACTIONS_SCHEMA,
+        metadata_fields=["numTransactions"],
+    )
+
+    assert metadata == {"numTransactions": "500"}
+    assert parsed_transactions.equals(transactions)
+
+
+def test_compare_reports_matches_scales():
+    def make_result(rows, seconds):
+        return {
+            "rows": rows,
+            "total_seconds": seconds * len(pipeline.PIPELINE_STAGES),
+            "stages": {
+                stage: {"seconds": seconds} for stage in pipeline.PIPELINE_STAGES
+            },
+        }
+
+    comparisons = pipeline.compare_reports(
+        {"results": [make_result(1_000, 2.0), make_result(10_000, 4.0)]},
+        {"results": [make_result(1_000, 1.0)]},
+    )
+
+    assert {comparison["rows"] for comparison in comparisons} == {1_000}
+    assert [comparison["stage"] for comparison in comparisons][-1] == "total"
+    assert all(comparison["speedup"] == 2.0 for comparison in comparisons)
+
+
+def test_make_buxfer_transactions_frame_ids_start_at_first_id():
+    assert data.make_buxfer_transactions_frame(3, first_id=7)["id"].equals(
+        pl.Series("id", [7, 8, 9])
+    )
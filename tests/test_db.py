@@ -0,0 +1,810 @@
+"""Tests for `lifedb.core.db`."""
+
+import asyncio
+import re
+import types
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+
+import polars as pl
+import pyarrow as pa
+import pytest
+from psycopg import sql
+
+from lifedb.core import db
+
+
+def _make_transactions(ids, dates, description="first"):
+    return pl.DataFrame(
+        {
+            "id": ids,
+            "date": dates,
+            "description": [description] * len(ids),
+        }
+    )
+
+
+class _FakeConnection:
+    """Records the queries run on it, answering each with the next of `results`."""
+
+    # Lets queries be rendered against it as if it were a real connection.
+    connection = None
+    rowcount = 0
+
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.rows = []
+        self.queries = []
+        self.params = []
+        self.borrows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=()):
+        self.queries.append(query if isinstance(query, str) else query.as_string(None))
+        self.params.append(list(params))
+        self.rows = self.results.pop(0) if self.results else []
+        return self
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    @contextmanager
+    def transaction(self):
+        self.queries.append("begin")
+        yield
+        self.queries.append("commit")
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    connection = _FakeConnection()
+
+    @contextmanager
+    def get_db_connection(*, autocommit=False):
+        connection.borrows.append("autocommit" if autocommit else "transaction")
+        yield connection
+
+    monkeypatch.setattr(db, "get_db_connection", get_db_connection)
+
+    return connection
+
+
+class _FakePool:
+    """Records how it was configured, opened and closed."""
+
+    check_connection = object()
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.opened = kwargs["open"]
+        self.closed = False
+
+    async def open(self):
+        self.opened = True
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    for env_var in ("USER", "PASSWORD", "HOST", "PORT", "NAME"):
+        monkeypatch.setenv(f"LIFEDB_DB_{env_var}", env_var.lower())
+
+    monkeypatch.setattr(db, "ConnectionPool", _FakePool)
+    monkeypatch.setattr(db, "AsyncConnectionPool", _FakePool)
+    monkeypatch.setattr(db, "_db_pool", None)
+    monkeypatch.setattr(db.atexit, "register", lambda function: None)
+
+
+def test_db_connection_kwargs_of_init_database(monkeypatch, pools):
+    monkeypatch.setenv("LIFEDB_INIT_DB_NAME", "postgres")
+
+    assert db.get_db_connection_kwargs()["dbname"] == "name"
+    assert db.get_db_connection_kwargs(init_db=True) == {
+        "user": "user",
+        "password": "password",
+        "host": "host",
+        "port": "port",
+        "dbname": "postgres",
+    }
+
+
+def test_db_pool_is_configured_from_environment(monkeypatch, pools):
+    monkeypatch.setenv("LIFEDB_DB_POOL_MIN_SIZE", "2")
+    monkeypatch.setenv("LIFEDB_DB_POOL_MAX_SIZE", "5")
+    monkeypatch.setenv("LIFEDB_DB_POOL_MAX_IDLE_SECONDS", "60")
+
+    pool = db.get_db_pool()
+
+    assert pool.opened
+    assert pool.kwargs["kwargs"]["dbname"] == "name"
+    assert pool.kwargs["min_size"] == 2
+    assert pool.kwargs["max_size"] == 5
+    assert pool.kwargs["max_idle"] == 60
+    assert pool.kwargs["max_lifetime"] == 3600
+    assert pool.kwargs["check"] is _FakePool.check_connection
+    assert pool.kwargs["reset"] is db._reset_pooled_connection
+
+
+def test_db_pool_size_must_be_a_number(monkeypatch, pools):
+    monkeypatch.setenv("LIFEDB_DB_POOL_MAX_SIZE", "many")
+
+    with pytest.raises(db.DBError, match="LIFEDB_DB_POOL_MAX_SIZE"):
+        db.get_db_pool()
+
+
+def test_db_pool_is_reopened_after_fork(monkeypatch, pools):
+    monkeypatch.setattr(db.os, "getpid", lambda: 1)
+    pool = db.get_db_pool()
+
+    assert db.get_db_pool() is pool
+
+    monkeypatch.setattr(db.os, "getpid", lambda: 2)
+
+    assert db.get_db_pool() is not pool
+
+
+def test_async_db_pool_is_opened_and_closed_with_each_loop(pools):
+    async def use_pool():
+        async with db.open_async_db_pool() as pool:
+            assert pool.opened and db.get_async_db_pool() is pool
+
+            with pytest.raises(db.DBError, match="already open"):
+                async with db.open_async_db_pool():
+                    pass
+
+        with pytest.raises(db.DBError, match="No async pool"):
+            db.get_async_db_pool()
+
+        return pool
+
+    first_pool = asyncio.run(use_pool())
+    second_pool = asyncio.run(use_pool())
+
+    assert first_pool is not second_pool
+    assert first_pool.closed and second_pool.closed
+    assert first_pool.kwargs["reset"] is db._reset_async_pooled_connection
+
+
+def _render(query):
+    return query.as_string(None)
+
+
+def _write_snapshot(df, tmp_path):
+    return db.write_snapshot(
+        df,
+        "buxfer_api_transactions",
+        schema="landing",
+        date_column="date",
+        key_columns=["id"],
+        directory=tmp_path,
+    )
+
+
+def test_write_snapshot_merges_only_touched_months(tmp_path):
+    _write_snapshot(
+        _make_transactions([1, 2, 3], ["2024-09-30", "2024-10-01", "2024-10-15"]),
+        tmp_path,
+    )
+    first_paths = {path.relative_to(tmp_path) for path in tmp_path.rglob("*.parquet")}
+
+    manifest = _write_snapshot(
+        _make_transactions([3, 4], ["2024-10-15", "2024-10-20"], "second"),
+        tmp_path,
+    )
+    second_paths = {path.relative_to(tmp_path) for path in tmp_path.rglob("*.parquet")}
+
+    assert manifest["partitions"]["2024-10"]["rows"] == 3
+    assert manifest["partitions"]["2024-10"]["max_date"] == "2024-10-20"
+    # September is untouched and October's previous file is removed.
+    assert len(first_paths & second_paths) == 1
+    assert len(second_paths) == 2
+
+    snapshot = db.scan_snapshot(
+        "buxfer_api_transactions", schema="landing", directory=tmp_path
+    )
+    assert snapshot.sort("id").collect().to_dict(as_series=False) == {
+        "id": [1, 2, 3, 4],
+        "date": ["2024-09-30", "2024-10-01", "2024-10-15", "2024-10-20"],
+        "description": ["first", "first", "second", "second"],
+    }
+
+
+def test_write_snapshot_drops_keys_moved_to_another_month(tmp_path):
+    _write_snapshot(
+        _make_transactions([1, 2, 3], ["2024-08-31", "2024-09-01", "2024-09-30"]),
+        tmp_path,
+    )
+
+    manifest = _write_snapshot(
+        _make_transactions([1, 3], ["2024-10-01", "2024-10-02"], "second"),
+        tmp_path,
+    )
+
+    # August only held the moved row, so it's gone.
+    assert sorted(manifest["partitions"]) == ["2024-09", "2024-10"]
+    assert manifest["partitions"]["2024-09"]["rows"] == 1
+    assert len(list(tmp_path.rglob("*.parquet"))) == 2
+
+    snapshot = db.scan_snapshot(
+        "buxfer_api_transactions", schema="landing", directory=tmp_path
+    )
+    assert snapshot.sort("id").collect().to_dict(as_series=False) == {
+        "id": [1, 2, 3],
+        "date": ["2024-10-01", "2024-09-01", "2024-10-02"],
+        "description": ["second", "first", "second"],
+    }
+
+
+def test_scan_snapshot_prunes_months_and_filters_dates(tmp_path):
+    _write_snapshot(
+        _make_transactions(
+            [1, 2, 3, 4], ["2024-08-31", "2024-09-01", "2024-09-30", "2024-10-01"]
+        ),
+        tmp_path,
+    )
+
+    snapshot = db.scan_snapshot(
+        "buxfer_api_transactions",
+        schema="landing",
+        start_date=date(2024, 9, 1),
+        end_date=date(2024, 9, 30),
+        directory=tmp_path,
+    )
+    empty_snapshot = db.scan_snapshot(
+        "buxfer_api_transactions",
+        schema="landing",
+        start_date=date(2025, 1, 1),
+        directory=tmp_path,
+    )
+
+    assert "2024-08" not in snapshot.explain() and "2024-10" not in snapshot.explain()
+    assert snapshot.collect()["id"].to_list() == [2, 3]
+    assert empty_snapshot.collect().columns == ["id", "date", "description"]
+    assert db.scan_snapshot("missing", directory=tmp_path) is None
+
+
+def test_snapshot_months_written_with_different_zone_names_scan_together(tmp_path):
+    loaded_ts = datetime(2024, 10, 1, tzinfo=timezone.utc)
+
+    for ids, dates, time_zone in [
+        ([1], ["2024-09-30"], "Etc/UTC"),
+        ([2], ["2024-10-01"], "UTC"),
+        ([3], ["2024-10-02"], "Etc/UTC"),
+    ]:
+        _write_snapshot(
+            _make_transactions(ids, dates).with_columns(
+                pl.lit(loaded_ts).dt.convert_time_zone(time_zone).alias("loaded_ts")
+            ),
+            tmp_path,
+        )
+
+    snapshot = db.scan_snapshot(
+        "buxfer_api_transactions", schema="landing", directory=tmp_path
+    ).collect()
+
+    assert snapshot.height == 3
+    assert snapshot.schema["loaded_ts"] == pl.Datetime("us", "UTC")
+
+
+def test_snapshot_keeps_latest_watermark_merged(tmp_path):
+    def write(ids, loaded_ts):
+        db.write_snapshot(
+            _make_transactions(ids, ["2024-10-01"] * len(ids)).with_columns(
+                loaded_ts=pl.lit(loaded_ts)
+            ),
+            "buxfer_api_transactions",
+            schema="landing",
+            date_column="date",
+            key_columns=["id"],
+            watermark_column="loaded_ts",
+            directory=tmp_path,
+        )
+
+        return db.get_snapshot_watermark(
+            "buxfer_api_transactions", schema="landing", directory=tmp_path
+        )
+
+    assert db.get_snapshot_watermark("missing", directory=tmp_path) is None
+    assert write([1, 2], datetime(2024, 10, 2, tzinfo=timezone.utc)) == datetime(
+        2024, 10, 2, tzinfo=timezone.utc
+    )
+    # Rows merged late, with an older load timestamp, don't move the watermark back.
+    assert write([3], datetime(2024, 10, 1, tzinfo=timezone.utc)) == datetime(
+        2024, 10, 2, tzinfo=timezone.utc
+    )
+    assert write([], datetime(2024, 10, 3, tzinfo=timezone.utc)) == datetime(
+        2024, 10, 2, tzinfo=timezone.utc
+    )
+
+
+def test_frame_snapshot_is_replaced_under_open_readers(tmp_path):
+    assert db.read_frame_snapshot("registry", schema="app", directory=tmp_path) is None
+
+    first = pl.DataFrame({"id": [1, 2], "name": ["a", "b"]})
+    db.write_frame_snapshot(first, "registry", schema="app", directory=tmp_path)
+    mapped = db.read_frame_snapshot("registry", schema="app", directory=tmp_path)
+
+    db.write_frame_snapshot(first.head(1), "registry", schema="app", directory=tmp_path)
+
+    assert mapped is not None and mapped.equals(first)
+    assert db.read_frame_snapshot("registry", schema="app", directory=tmp_path).equals(
+        first.head(1)
+    )
+    assert [path.name for path in (tmp_path / "app").iterdir()] == ["registry.arrow"]
+
+
+def test_frame_snapshot_of_concatenated_frames_is_one_chunk(tmp_path):
+    # Chunks large enough that writing the file doesn't merge them.
+    registry = pl.concat(
+        [pl.DataFrame({"id": range(start, start + 100_000)}) for start in (0, 1, 2)],
+        rechunk=False,
+    )
+    assert registry.n_chunks() == 3
+
+    path = db.write_frame_snapshot(
+        registry, "registry", schema="app", directory=tmp_path
+    )
+    mapped = db.read_frame_snapshot("registry", schema="app", directory=tmp_path)
+
+    # One record batch is mapped as is, more would be copied into one chunk.
+    with pa.ipc.open_file(path) as reader:
+        assert reader.num_record_batches == 1
+    assert mapped is not None and mapped.equals(registry)
+    assert mapped.n_chunks() == 1
+
+
+@pytest.mark.parametrize(
+    "data_type, postgres_type",
+    [
+        (pl.Date(), "date"),
+        (pl.Categorical(), "text"),
+        (pl.Decimal(18, 2), "numeric(18, 2)"),
+        (pl.Datetime("us"), "timestamp"),
+        (pl.Datetime("us", "UTC"), "timestamptz"),
+        (pl.UInt64(), "numeric(20, 0)"),
+    ],
+)
+def test_postgres_types(data_type, postgres_type):
+    assert db._get_postgres_type(data_type) == postgres_type
+
+
+def test_postgres_type_of_unknown_polars_type_raises():
+    with pytest.raises(db.DBError):
+        db._get_postgres_type(pl.List(pl.Int64()))
+
+
+def test_upsert_query_updates_changed_rows_with_last_staged_row():
+    query = db._get_upsert_query(
+        sql.Identifier("landing", "transactions"),
+        sql.Identifier("_lifedb_staging_transactions"),
+        ["id", "amount", "loaded_ts", "_seq"],
+        key_columns=["id"],
+        compare_columns=["amount"],
+        order_column="_seq",
+        loaded_ts_column="loaded_ts",
+    )
+
+    assert _render(query) == (
+        'insert into "landing"."transactions" as target '
+        '("id", "amount", "loaded_ts", "_seq") '
+        'select distinct on ("id") "id", "amount", %s, "_seq" '
+        'from "_lifedb_staging_transactions" order by "id", "_seq" desc '
+        'on conflict ("id") do update set "amount" = excluded."amount", '
+        '"loaded_ts" = excluded."loaded_ts", "_seq" = excluded."_seq" '
+        'where (target."amount") is distinct from (excluded."amount")'
+    )
+
+
+def test_upsert_query_of_only_key_columns_skips_existing_rows():
+    query = db._get_upsert_query(
+        sql.Identifier("tags"),
+        sql.Identifier("_lifedb_staging_tags"),
+        ["id", "tag"],
+        key_columns=["id", "tag"],
+        compare_columns=(),
+    )
+
+    assert _render(query) == (
+        'insert into "tags" as target ("id", "tag") '
+        'select "id", "tag" from "_lifedb_staging_tags" '
+        'on conflict ("id", "tag") do nothing'
+    )
+
+
+def test_ensure_table_creates_missing_table_with_primary_key():
+    con = _FakeConnection(results=[[(None,)]])
+
+    db.ensure_table(
+        con,  # type: ignore[arg-type]
+        "tags",
+        schema="landing",
+        columns=pl.Schema({"id": pl.Int64(), "amount": pl.Decimal(18, 2)}),
+        primary_key=["id"],
+    )
+
+    assert con.queries[1:] == [
+        "select pg_advisory_xact_lock(hashtext(%s))",
+        'create table if not exists "landing"."tags" '
+        '("id" bigint, "amount" numeric(18, 2), primary key ("id"))',
+        'alter table "landing"."tags" add column if not exists "id" bigint',
+        'alter table "landing"."tags" add column if not exists "amount" '
+        "numeric(18, 2)",
+        "select 1 from pg_index where indrelid = %s::regclass and indisprimary",
+        'alter table "landing"."tags" add primary key ("id")',
+    ]
+
+
+def test_ensure_table_leaves_complete_table_alone():
+    con = _FakeConnection(results=[[(1234,)], [("id",), ("amount",)], [(1,)]])
+
+    db.ensure_table(
+        con,  # type: ignore[arg-type]
+        "tags",
+        columns=pl.Schema({"id": pl.Int64()}),
+        primary_key=["id"],
+    )
+
+    assert len(con.queries) == 3
+    assert not any("create" in query or "alter" in query for query in con.queries)
+
+
+def test_replace_rows_deletes_matching_keys_then_copies(monkeypatch, connection):
+    copied = []
+    monkeypatch.setattr(db, "ensure_table", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        db,
+        "_copy_dataframe",
+        lambda cur, df, table: copied.append((_render(table), df.columns)),
+    )
+
+    rows = db.replace_rows(
+        pl.DataFrame({"id": [1, 1, 2], "tag": ["a", "b", "a"]}),
+        "tags",
+        schema="landing",
+        key_columns=["id"],
+    )
+
+    assert rows == 3
+    assert connection.queries == [
+        'create temporary table "_lifedb_keys_tags" on commit drop as '
+        'select "id" from "landing"."tags" with no data',
+        'delete from "landing"."tags" using "_lifedb_keys_tags" '
+        'where "landing"."tags"."id" = "_lifedb_keys_tags"."id"',
+    ]
+    assert copied == [
+        ('"_lifedb_keys_tags"', ["id"]),
+        ('"landing"."tags"', ["id", "tag"]),
+    ]
+
+
+@pytest.fixture
+def staged(monkeypatch, connection):
+    staged = []
+    monkeypatch.setattr(
+        db,
+        "ensure_table",
+        lambda con, table_name, **kwargs: staged.append(
+            ("ensure_table", table_name, list(kwargs["columns"]))
+        ),
+    )
+    monkeypatch.setattr(
+        db,
+        "_copy_dataframe",
+        lambda cur, df, table: staged.append(
+            ("copy", _render(table), df["id"].to_list())
+        ),
+    )
+
+    return staged
+
+
+def test_upsert_table_batches_stages_in_order_then_merges_stamped(connection, staged):
+    loaded_ts = datetime(2024, 10, 1, tzinfo=timezone.utc)
+    connection.results = [[], [], [(loaded_ts,)]]
+    batches = [
+        pl.DataFrame({"id": [1, 2], "loaded_ts": [None, None]}),
+        pl.DataFrame({"id": [], "loaded_ts": []}),
+        pl.DataFrame({"loaded_ts": [None], "id": [1]}),
+    ]
+
+    result = db.upsert_table_batches(
+        iter(batches),
+        "transactions",
+        schema="landing",
+        key_columns=["id"],
+        loaded_ts_column="loaded_ts",
+    )
+
+    assert result == db.UpsertResult(rows=0, loaded_ts=loaded_ts)
+    # The table is created in a transaction of its own, before batches are staged.
+    assert connection.borrows == ["transaction", "autocommit"]
+    assert staged == [
+        ("ensure_table", "transactions", ["id", "loaded_ts"]),
+        ("copy", '"_lifedb_staging_transactions"', [1, 2]),
+        ("copy", '"_lifedb_staging_transactions"', [1]),
+    ]
+    assert connection.queries == [
+        'create temporary table "_lifedb_staging_transactions" '
+        '(like "landing"."transactions" including defaults)',
+        'alter table "_lifedb_staging_transactions" add column "_lifedb_staging_seq" '
+        "bigint generated always as identity",
+        "begin",
+        "select clock_timestamp()",
+        'insert into "landing"."transactions" as target ("id", "loaded_ts") '
+        'select distinct on ("id") "id", %s from "_lifedb_staging_transactions" '
+        'order by "id", "_lifedb_staging_seq" desc '
+        'on conflict ("id") do update set "loaded_ts" = excluded."loaded_ts"',
+        "commit",
+        'drop table if exists "_lifedb_staging_transactions"',
+    ]
+    # Rows are stamped with the database clock read just before the merge.
+    assert connection.params[-2] == [loaded_ts]
+
+
+def test_upsert_table_batches_of_empty_stream_writes_nothing(connection, staged):
+    result = db.upsert_table_batches(
+        iter([]), "transactions", schema="landing", key_columns=["id"]
+    )
+
+    assert result == db.UpsertResult(rows=0)
+    assert connection.borrows == [] and connection.queries == [] and staged == []
+
+
+def test_try_get_table_selects_columns_where_params(monkeypatch, connection):
+    reads = []
+
+    def read_database(query, *, connection, execute_options):
+        reads.append((query, execute_options))
+        return pl.DataFrame({"id": [1]})
+
+    monkeypatch.setattr(db.pl, "read_database", read_database)
+
+    data = db.try_get_table(
+        "transactions",
+        schema="landing",
+        columns=["id", "amount"],
+        where=sql.SQL("date >= %s"),
+        params=[date(2024, 1, 1)],
+    )
+
+    assert data is not None and data.height == 1
+    assert reads == [
+        (
+            'select "id", "amount" from "landing"."transactions" where date >= %s',
+            {"params": [date(2024, 1, 1)]},
+        )
+    ]
+
+
+class _FakeTableConnection:
+    """Serves the columns a query selects from a table of canned rows.
+
+    Queries aren't run, only their selected columns are picked out of the rows, so
+    tests can check the SQL that was sent and what came back in which batches.
+    """
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.adapters = types.SimpleNamespace(
+            types={name: types.SimpleNamespace(name=name) for name in columns.values()}
+        )
+        self.queries = []
+        self.fetch_sizes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def cursor(self, name=None):
+        return self
+
+    def execute(self, query, params=()):
+        query = query.as_string(None)
+        self.queries.append((query, list(params)))
+
+        selected = re.match(r"select (.*?) from ", query).group(1)
+        names = (
+            list(self.columns)
+            if selected == "*"
+            else [name.strip('"') for name in selected.split(", ")]
+        )
+        self.description = [
+            types.SimpleNamespace(
+                name=name, type_code=self.columns[name], precision=None, scale=None
+            )
+            for name in names
+        ]
+
+        limit = re.search(r" limit (\d+)$", query)
+        rows = self.rows if limit is None else self.rows[: int(limit.group(1))]
+        self.pending = [tuple(row[name] for name in names) for row in rows]
+
+        return self
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.pending = self.pending[:size], self.pending[size:]
+
+        return batch
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = _FakeTableConnection(
+        {"id": "int8", "amount": "float8", "description": "text"},
+        [
+            {"id": id, "amount": id * 1.5, "description": f"transaction {id}"}
+            for id in range(5)
+        ],
+    )
+
+    @contextmanager
+    def get_db_connection():
+        yield table
+
+    monkeypatch.setattr(db, "get_db_connection", get_db_connection)
+
+    return table
+
+
+def test_iter_table_batches_streams_batches_of_projected_columns(table):
+    batches = list(
+        db.iter_table_batches(
+            "transactions",
+            schema="landing",
+            columns=["id", "amount"],
+            where=sql.SQL("amount > %s"),
+            params=[0],
+            batch_size=2,
+        )
+    )
+
+    assert [batch.num_rows for batch in batches] == [2, 2, 1]
+    assert all(batch.schema.names == ["id", "amount"] for batch in batches)
+    assert table.queries == [
+        ('select "id", "amount" from "landing"."transactions" where amount > %s', [0])
+    ]
+
+
+def test_scan_table_pushes_projection_down_and_filters_in_batches(table):
+    transactions = db.scan_table(
+        "transactions", where=sql.SQL("id < %s"), params=[10], batch_size=2
+    )
+
+    assert transactions.collect_schema() == pl.Schema(
+        {"id": pl.Int64(), "amount": pl.Float64(), "description": pl.String()}
+    )
+    assert table.queries == [
+        ('select * from "transactions" where id < %s limit 0', [10])
+    ]
+
+    ids = transactions.filter(pl.col("amount") > 2).select("id").collect()
+
+    assert ids["id"].to_list() == [2, 3, 4]
+    assert table.queries[1:] == [
+        ('select "id", "amount" from "transactions" where id < %s', [10])
+    ]
+
+
+def test_scan_table_reads_in_batches(table):
+    assert db.scan_table("transactions", batch_size=2).collect().height == 5
+    # Three batches of rows, and the empty fetch that ends the read.
+    assert table.fetch_sizes == [2, 2, 2, 2]
+
+
+def test_scan_table_pushes_row_limit_down(table):
+    head = db.scan_table("transactions", columns=["id"]).head(3).collect()
+
+    assert head["id"].to_list() == [0, 1, 2]
+    assert table.queries[-1] == ('select "id" from "transactions" limit 3', [])
+
+
+@pytest.mark.parametrize(
+    "concurrently, expected",
+    [
+        (True, 'refresh materialized view concurrently "reporting"."rollup"'),
+        (False, 'refresh materialized view "reporting"."rollup"'),
+    ],
+)
+def test_refresh_materialized_view(connection, concurrently, expected):
+    db.refresh_materialized_view(
+        "rollup", schema="reporting", concurrently=concurrently
+    )
+
+    assert connection.queries == [expected]
+
+
+@pytest.fixture
+def copies(monkeypatch):
+    copies = []
+    monkeypatch.setattr(db, "ensure_table", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        db,
+        "_copy_dataframe",
+        lambda cur, df, table: copies.append((_render(table), df.height)),
+    )
+
+    return copies
+
+
+def test_bulk_write_table_appends_with_copy(connection, copies):
+    result = db.bulk_write_table(pl.DataFrame({"id": [1, 2]}), "transactions")
+
+    assert result.rows == 2
+    assert connection.queries == []
+    assert copies == [('"transactions"', 2)]
+
+
+def test_bulk_write_table_swaps_in_loaded_table(connection, copies):
+    connection.results = [[], [], [], [], [("transactions__lfdb_swap_pkey",)], []]
+
+    db.bulk_write_table(
+        pl.DataFrame({"id": [1, 2]}),
+        "transactions",
+        schema="landing",
+        mode="swap",
+        primary_key=["id"],
+    )
+
+    assert copies == [('"landing"."transactions__lfdb_swap"', 2)]
+    assert [
+        query for query in connection.queries if query.startswith(("drop", "alter"))
+    ] == [
+        'drop table if exists "landing"."transactions__lfdb_swap"',
+        'drop table if exists "landing"."transactions"',
+        'alter table "landing"."transactions__lfdb_swap" rename to "transactions"',
+        'alter table "landing"."transactions" rename constraint '
+        '"transactions__lfdb_swap_pkey" to "transactions_pkey"',
+    ]
+
+
+def test_bulk_write_table_swap_renames_shortened_primary_key(connection, copies):
+    table_name = "t" * 60
+    connection.results = [[], [], [], [], [(f"{'t' * 50}__lfdb_swap_pkey",)], []]
+
+    db.bulk_write_table(
+        pl.DataFrame({"id": [1]}), table_name, mode="swap", primary_key=["id"]
+    )
+
+    assert connection.queries[-1] == (
+        f'alter table "{table_name}" rename constraint '
+        f'"{"t" * 50}__lfdb_swap_pkey" to "{"t" * 58}_pkey"'
+    )
+
+
+@pytest.mark.parametrize("mode", ["replace", "swap"])
+def test_bulk_write_table_refuses_to_drop_table_in_use(connection, copies, mode):
+    connection.results = [[("analytics.financial_transactions_daily",)]]
+
+    with pytest.raises(db.DBError, match="financial_transactions_daily"):
+        db.bulk_write_table(
+            pl.DataFrame({"id": [1]}),
+            "financial_transactions",
+            schema="analytics",
+            mode=mode,
+        )
+
+    assert len(connection.queries) == 1
+    assert copies == []
+
+
+def test_default_constraint_name_fits_postgres_identifiers():
+    assert db._get_default_constraint_name("transactions") == "transactions_pkey"
+    # Multibyte characters aren't split when shortening.
+    assert db._get_default_constraint_name("é" * 40) == f"{'é' * 29}_pkey"
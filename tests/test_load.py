@@ -0,0 +1,60 @@
+"""Tests for `lifedb.core.load`."""
+
+from contextlib import contextmanager
+
+import polars as pl
+import pytest
+from psycopg import sql
+
+from lifedb.core import load
+
+
+@pytest.mark.parametrize("written_row_count, tag_writes", [(1, 1), (0, 0)])
+def test_load_writes_transactions_and_tags_in_one_transaction(
+    monkeypatch, written_row_count, tag_writes
+):
+    connection = object()
+    writes = []
+
+    @contextmanager
+    def get_db_connection():
+        yield connection
+
+    monkeypatch.setattr(load.db, "get_db_connection", get_db_connection)
+    monkeypatch.setattr(load.db, "table_exists", lambda *args, **kwargs: True)
+    monkeypatch.setattr(load.db, "scan_table", lambda *args, **kwargs: pl.LazyFrame())
+    monkeypatch.setattr(
+        load.transform,
+        "conform_financial_transactions",
+        lambda sources: pl.LazyFrame(
+            {"financial_txn_uuid": ["a"], "landing_loaded_ts": [None]}
+        ),
+    )
+    monkeypatch.setattr(
+        load.transform,
+        "explode_financial_transaction_tags",
+        lambda financial_transactions: financial_transactions.select(
+            "financial_txn_uuid"
+        ),
+    )
+
+    def upsert_table(df, table_name, **kwargs):
+        writes.append((table_name, kwargs["con"]))
+        return written_row_count
+
+    def replace_rows(df, table_name, **kwargs):
+        writes.append((table_name, kwargs["con"]))
+        return df.height
+
+    monkeypatch.setattr(load.db, "upsert_table", upsert_table)
+    monkeypatch.setattr(load.db, "replace_rows", replace_rows)
+
+    loaded_row_count = load.load_financial_transactions(
+        lambda source: sql.SQL("true"), params=[]
+    )
+
+    assert loaded_row_count == written_row_count
+    assert writes == [
+        ("financial_transactions", connection),
+        *[("financial_transaction_tags", connection)] * tag_writes,
+    ]
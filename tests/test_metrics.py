@@ -0,0 +1,63 @@
+"""Tests for `lifedb.core.metrics`."""
+
+import asyncio
+import contextvars
+import stat
+import threading
+
+from lifedb.core import metrics
+
+
+def test_records_only_while_collecting():
+    metrics.increment("outside")
+
+    with metrics.collect_metrics() as collected:
+        with metrics.span("stage"):
+            metrics.increment("rows", 3)
+        with metrics.span("stage"):
+            metrics.increment("rows", 2)
+
+    metrics.increment("rows")
+
+    assert collected.counters == {"rows": 5}
+    assert collected.span_calls == {"stage": 2}
+    assert set(collected.to_metadata()) == {"stage_seconds", "rows"}
+
+
+def test_collects_from_async_tasks_and_copied_thread_contexts():
+    async def fetch_page():
+        metrics.increment("pages")
+
+    async def fetch_pages():
+        await asyncio.gather(*[fetch_page() for _ in range(3)])
+
+    with metrics.collect_metrics() as collected:
+        asyncio.run(fetch_pages())
+
+        thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(metrics.increment, "pages"),
+        )
+        thread.start()
+        thread.join()
+
+    assert collected.counters == {"pages": 4}
+
+
+def test_export_metrics_writes_prometheus_textfile(tmp_path, monkeypatch):
+    monkeypatch.setenv("LIFEDB_METRICS_PROMETHEUS_DIR", str(tmp_path))
+
+    with metrics.collect_metrics() as collected:
+        with metrics.span("api.request"):
+            metrics.increment("api.pages")
+
+    metrics.export_metrics(collected, job="buxfer_api_transactions")
+
+    path = tmp_path / "lifedb_buxfer_api_transactions.prom"
+    text = path.read_text()
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+    assert 'lifedb_counter{job="buxfer_api_transactions",name="api.pages"} 1' in text
+    assert 'span="api.request"' in text
+    assert [path.name for path in tmp_path.iterdir()] == [
+        "lifedb_buxfer_api_transactions.prom"
+    ]
@@ -0,0 +1,74 @@
+"""Tests for `lifedb.db.migrate`."""
+
+import threading
+import time
+
+import pytest
+
+from lifedb.db import migrate
+
+
+def test_load_migrations_reads_sql_and_seeds():
+    migrations = migrate.load_migrations()
+
+    assert [migration.version for migration in migrations] == sorted(
+        migration.version for migration in migrations
+    )
+    for migration in migrations:
+        assert migration.sql
+        assert len(migration.checksum) == 64
+
+
+def test_apply_migrations_runs_independent_migrations_concurrently(monkeypatch):
+    events = []
+    lock = threading.Lock()
+
+    def apply_migration(migration):
+        with lock:
+            events.append(("start", migration.version))
+        time.sleep(0.05)
+        with lock:
+            events.append(("end", migration.version))
+
+    monkeypatch.setattr(migrate, "_apply_migration", apply_migration)
+
+    migrate._apply_migrations(
+        [
+            migrate.Migration(1, "one", ""),
+            migrate.Migration(2, "two", ""),
+            migrate.Migration(3, "three", "", depends_on=(1, 2)),
+            migrate.Migration(4, "four", "", depends_on=(0,)),
+        ],
+        {0},
+        max_workers=4,
+    )
+
+    # Everything without pending dependencies starts before anything finishes.
+    assert {version for _, version in events[:3]} == {1, 2, 4}
+    assert all(event == "start" for event, _ in events[:3])
+    assert events.index(("start", 3)) > max(
+        events.index(("end", 1)), events.index(("end", 2))
+    )
+
+
+def test_apply_migrations_stops_after_failure(monkeypatch):
+    applied = []
+
+    def apply_migration(migration):
+        if migration.version == 1:
+            raise RuntimeError("boom")
+        applied.append(migration.version)
+
+    monkeypatch.setattr(migrate, "_apply_migration", apply_migration)
+
+    with pytest.raises(RuntimeError):
+        migrate._apply_migrations(
+            [
+                migrate.Migration(1, "one", ""),
+                migrate.Migration(2, "two", "", depends_on=(1,)),
+            ],
+            set(),
+            max_workers=2,
+        )
+
+    assert applied == []
@@ -0,0 +1,209 @@
+"""Tests for `lifedb.app.sample_app`."""
+
+from contextlib import contextmanager
+from datetime import date
+
+import polars as pl
+import psycopg
+import pytest
+from dash.exceptions import PreventUpdate
+
+from lifedb.app import sample_app
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = pl.DataFrame(
+        {
+            "employee_id": [1, 2, 3, 4],
+            "employee_name": ["Ann Lee", "Bo Park", "Cy Diaz", "Di Moss"],
+            "employee_email": ["ALEE", "BPARK", "CDIAZ", "DMOSS"],
+            "department": ["Sales", "IT", "Sales", None],
+            "job_title": ["Rep", "Programmer", "Manager", "Rep"],
+            "employee_hire_date": [
+                date(1999, 1, 5),
+                date(2001, 6, 1),
+                date(1999, 11, 20),
+                date(2003, 2, 1),
+            ],
+            "tenure": [6.2, 3.8, 5.3, 2.1],
+            "mo_salary": [5000.0, 9000.0, None, 4000.0],
+        }
+    )
+    monkeypatch.setattr(sample_app.registry_snapshot, "get", lambda: registry)
+    sample_app.load_registry_page.cache_clear()  # type: ignore[attr-defined]
+    sample_app.count_registry_rows.cache_clear()  # type: ignore[attr-defined]
+
+    yield registry
+
+    sample_app.load_registry_page.cache_clear()  # type: ignore[attr-defined]
+    sample_app.count_registry_rows.cache_clear()  # type: ignore[attr-defined]
+
+
+class _FakeConnection:
+    """Records the queries it's given and returns canned rows."""
+
+    def __init__(self, columns, rows):
+        self.description = [(column,) for column in columns]
+        self.rows = rows
+        self.queries = []
+
+    def execute(self, query, params=()):
+        self.queries.append((query.as_string(None), tuple(params)))
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0]
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    connection = _FakeConnection(["employee_id", "mo_salary"], [(7, 5000.0)])
+
+    @contextmanager
+    def get_db_connection():
+        yield connection
+
+    monkeypatch.setattr(sample_app, "get_db_connection", get_db_connection)
+    monkeypatch.setattr(sample_app.registry_snapshot, "get", lambda: None)
+    sample_app.load_registry_page.cache_clear()  # type: ignore[attr-defined]
+    sample_app.count_registry_rows.cache_clear()  # type: ignore[attr-defined]
+
+    yield connection
+
+    sample_app.load_registry_page.cache_clear()  # type: ignore[attr-defined]
+    sample_app.count_registry_rows.cache_clear()  # type: ignore[attr-defined]
+
+
+def test_parse_filter_parts_unquotes_and_converts_values():
+    assert sample_app._parse_filter_parts(
+        '{employee_name} contains "O\\"Hara" && {mo_salary} ge 5000 && '
+        "{employee_id} = '7'"
+    ) == [
+        ("employee_name", "contains", 'O"Hara'),
+        ("mo_salary", "ge", 5000.0),
+        ("employee_id", "=", "7"),
+    ]
+    assert sample_app._parse_filter_parts("") == []
+
+    for filter_query in ("{password} = x", "{mo_salary} ~ 5", "{mo_salary} > lots"):
+        with pytest.raises(ValueError):
+            sample_app._parse_filter_parts(filter_query)
+
+
+def test_parse_filter_query_matches_contains_literally():
+    condition, params = sample_app.parse_filter_query(
+        "{job_title} contains 50%_ && {employee_hire_date} datestartswith 1999"
+    )
+
+    assert condition.as_string(None) == (
+        'strpos(lower("job_title"::text), lower(%s)) > 0 and '
+        'starts_with("employee_hire_date"::text, %s)'
+    )
+    assert params == ("50%_", "1999")
+    assert sample_app.parse_filter_query("")[0].as_string(None) == "true"
+
+
+def test_keyset_condition_continues_after_last_row():
+    def render(*args):
+        condition, params = sample_app._get_keyset_condition(*args)
+        return condition.as_string(None), params
+
+    assert render("mo_salary", False, None) == ("true", ())
+    assert render(None, False, (7,)) == ('"employee_id" > %s', (7,))
+    assert render("mo_salary", True, (5000.0, 7)) == (
+        '("mo_salary" < %s or ("mo_salary" = %s and "employee_id" > %s) '
+        'or "mo_salary" is null)',
+        (5000.0, 5000.0, 7),
+    )
+    # Nulls sort last in either direction, so only nulls with greater keys remain.
+    assert render("mo_salary", True, (None, 7)) == (
+        '"mo_salary" is null and "employee_id" > %s',
+        (7,),
+    )
+
+
+def test_load_registry_page_seeks_past_after_key(connection):
+    rows = sample_app.load_registry_page(
+        filter_query="{department} contains sal",
+        sort_column="mo_salary",
+        descending=True,
+        after_key=(5000.0, 7),
+        offset=10,
+        page_size=5,
+    )
+
+    query, params = connection.queries[-1]
+
+    assert rows == [{"employee_id": 7, "mo_salary": 5000.0}]
+    assert query.endswith(
+        'where strpos(lower("department"::text), lower(%s)) > 0 and '
+        '("mo_salary" < %s or ("mo_salary" = %s and "employee_id" > %s) '
+        'or "mo_salary" is null) '
+        'order by "mo_salary" desc nulls last, "employee_id" asc limit %s offset %s'
+    )
+    # The offset is only used when there's no key to seek past.
+    assert params == ("sal", 5000.0, 5000.0, 7, 5, 0)
+
+
+def test_count_registry_rows_counts_in_sql(connection):
+    connection.rows = [(3,)]
+
+    assert sample_app.count_registry_rows("{mo_salary} > 100") == 3
+
+    query, params = connection.queries[-1]
+    assert query.startswith("select count(*) from (")
+    assert query.endswith('as registry where "mo_salary" > %s')
+    assert params == (100.0,)
+
+
+def _get_page_ids(**kwargs):
+    return [
+        row["employee_id"]
+        for row in sample_app.load_registry_page(after_key=None, page_size=2, **kwargs)
+    ]
+
+
+@pytest.mark.usefixtures("registry")
+def test_registry_snapshot_pages_sort_nulls_last():
+    assert _get_page_ids(
+        filter_query="", sort_column="mo_salary", descending=True, offset=0
+    ) == [2, 1]
+    assert _get_page_ids(
+        filter_query="", sort_column="mo_salary", descending=True, offset=2
+    ) == [4, 3]
+
+
+@pytest.mark.usefixtures("registry")
+def test_registry_snapshot_filters_like_sql():
+    filter_query = (
+        "{department} contains sal && {employee_hire_date} datestartswith 1999"
+    )
+
+    assert sample_app.count_registry_rows(filter_query) == 2
+    assert sample_app.count_registry_rows("{employee_hire_date} > 2000-12-31") == 2
+    assert sample_app.count_registry_rows('{employee_name} = "Bo Park"') == 1
+    assert sample_app.count_registry_rows("{mo_salary} >= 5000") == 2
+
+    assert sample_app.count_registry_rows("{mo_salary} < '6000'") == 2
+
+    for filter_query in (
+        "{employee_hire_date} > soon",
+        "{employee_hire_date} = '1999'",
+        "{mo_salary} > 'lots'",
+    ):
+        with pytest.raises(ValueError):
+            sample_app.count_registry_rows(filter_query)
+
+
+def test_update_table_ignores_values_postgres_rejects(connection, monkeypatch):
+    def execute(query, params=()):
+        raise psycopg.errors.InvalidDatetimeFormat("invalid input syntax for date")
+
+    monkeypatch.setattr(connection, "execute", execute)
+
+    with pytest.raises(PreventUpdate):
+        sample_app.update_table(0, 5, [], "{employee_hire_date} > '20x5'", {})
@@ -0,0 +1,101 @@
+"""Tests for `lifedb.dagster.sensors`."""
+
+import dataclasses
+import json
+
+import pytest
+from dagster import (
+    DagsterInstance,
+    DagsterRun,
+    DagsterRunStatus,
+    RunRequest,
+    build_sensor_context,
+)
+
+from lifedb.dagster import sensors
+
+
+def _check(state, fingerprint, now):
+    return sensors.get_next_sync_state(
+        state,
+        fingerprint,
+        now=now,
+        min_interval_seconds=60,
+        max_interval_seconds=300,
+    )
+
+
+def test_sync_state_backs_off_while_quiet_and_resets_on_change():
+    should_sync, state = _check(sensors.SyncState(), "10:a", now=0)
+    assert should_sync
+    assert (state.interval_seconds, state.next_check_ts) == (60, 60)
+
+    intervals = []
+    for now in range(1, 5):
+        should_sync, state = _check(state, "10:a", now=now)
+        assert not should_sync
+        intervals.append(state.interval_seconds)
+
+    assert intervals == [120, 240, 300, 300]
+
+    should_sync, state = _check(state, "11:b", now=10)
+    assert should_sync
+    assert (state.interval_seconds, state.next_check_ts) == (60, 70)
+
+
+def test_sync_state_retries_unchanged_fingerprint():
+    _, state = _check(sensors.SyncState(), "10:a", now=0)
+
+    should_sync, state = sensors.get_next_sync_state(
+        state,
+        "10:a",
+        now=100,
+        min_interval_seconds=60,
+        max_interval_seconds=300,
+        retry=True,
+    )
+
+    assert should_sync
+    assert (state.interval_seconds, state.next_check_ts) == (60, 160)
+
+
+def _evaluate_sensor(instance, state):
+    context = build_sensor_context(
+        instance=instance, cursor=json.dumps(dataclasses.asdict(state))
+    )
+    result = sensors.buxfer_api_activity_sensor(context)
+
+    return result, sensors.SyncState(**json.loads(context.cursor))
+
+
+@pytest.mark.parametrize(
+    "run_status, should_sync",
+    [(DagsterRunStatus.FAILURE, True), (DagsterRunStatus.SUCCESS, False)],
+)
+def test_sensor_resyncs_after_failed_run(monkeypatch, run_status, should_sync):
+    monkeypatch.setattr(
+        sensors.core.api, "get_buxfer_transactions_fingerprint", lambda **_: "10:a"
+    )
+
+    with DagsterInstance.ephemeral() as instance:
+        result, state = _evaluate_sensor(instance, sensors.SyncState())
+        assert isinstance(result, RunRequest)
+        assert state.run_key is not None and result.run_key == state.run_key
+
+        instance.add_run(
+            DagsterRun(
+                job_name=sensors.batch_update_job.name,
+                tags={"dagster/run_key": state.run_key},
+                status=run_status,
+            )
+        )
+
+        result, next_state = _evaluate_sensor(
+            instance, dataclasses.replace(state, next_check_ts=0)
+        )
+
+    assert isinstance(result, RunRequest) is should_sync
+    if should_sync:
+        assert next_state.run_key not in (None, state.run_key)
+    else:
+        assert next_state.run_key is None
@@ -0,0 +1,38 @@
+"""Tests for CLI startup time."""
+
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+from lifedb.bench import startup
+
+
+@pytest.mark.parametrize("module", ["lifedb.run", "lifedb.core"])
+def test_import_skips_data_stack(module):
+    result = startup.measure_import_time(module, repeat=1)
+
+    assert result["heavy_modules"] == []
+
+
+def test_cli_import_leaves_subcommand_dependencies_unloaded():
+    completed = subprocess.run(
+        [sys.executable, "-c", "import sys, lifedb.run; print(' '.join(sys.modules))"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    imported_modules = set(completed.stdout.split())
+
+    assert imported_modules.isdisjoint({"dagster", "dash", "httpx", "psycopg"})
+
+
+def test_core_submodules_import_on_access():
+    core = importlib.import_module("lifedb.core")
+
+    assert core.transform is importlib.import_module("lifedb.core.transform")
+    assert "db" in dir(core)
+    with pytest.raises(AttributeError):
+        core.missing
@@ -0,0 +1,197 @@
+"""Tests for `lifedb.core.transform`."""
+
+import uuid
+from datetime import date, datetime, timezone
+
+import numpy as np
+import polars as pl
+import pytest
+
+from lifedb.core import transform
+
+
+def _reference_uuid5(names, namespace):
+    return [
+        None if name is None else str(uuid.uuid5(namespace, name)) for name in names
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_uuid5_batch_matches_uuid5_for_random_ids(seed):
+    rng = np.random.default_rng(seed)
+    ids = pl.Series(
+        "id",
+        np.concatenate(
+            [
+                rng.integers(np.iinfo(np.int64).min, np.iinfo(np.int64).max, 5_000),
+                rng.integers(-1_000, 1_000, 5_000),
+                [0, -1, np.iinfo(np.int64).min, np.iinfo(np.int64).max],
+            ]
+        ),
+    )
+    namespace = uuid.UUID(bytes=rng.bytes(16))
+
+    generated = transform.uuid5_batch(ids, namespace)
+
+    assert generated.to_list() == _reference_uuid5(
+        ids.cast(pl.String).to_list(), namespace
+    )
+
+
+def test_uuid5_batch_handles_nulls_slices_and_long_names():
+    names = pl.Series(
+        "name", ["", None, "héllo", "x" * 39, "x" * 40, "y" * 200, "1", None]
+    ).slice(1, 6)
+    namespace = transform.BUXFER_API_TRANSACTION_UUID_NAMESPACE
+
+    generated = transform.uuid5_batch(names, namespace)
+
+    assert generated.name == "name"
+    assert generated.to_list() == _reference_uuid5(names.to_list(), namespace)
+
+
+def test_conform_buxfer_api_transactions_uuids():
+    buxfer_api_transactions = pl.DataFrame(
+        {
+            "id": [1, 2, None],
+            "date": [date(2024, 10, 1), date(2024, 10, 2), date(2024, 10, 3)],
+            "transaction_type": ["expense", "income", "expense"],
+            "expense_amount": [1.0, -2.0, 3.0],
+            "description": ["a", "b", "c"],
+            "account_name": ["Checking", "Checking", "Savings"],
+            "tags": ["food", "", "rent"],
+        },
+        schema_overrides={"id": pl.Int64},
+    )
+
+    financial_transactions = transform.conform_buxfer_api_transactions(
+        buxfer_api_transactions
+    )
+
+    assert financial_transactions["financial_txn_uuid"].to_list() == (
+        _reference_uuid5(
+            ["1", "2", None], transform.BUXFER_API_TRANSACTION_UUID_NAMESPACE
+        )
+    )
+
+
+def test_conform_financial_transactions_unions_registered_sources(monkeypatch):
+    monkeypatch.setattr(transform, "FINANCIAL_TRANSACTIONS_SOURCES", {})
+
+    buxfer_conform = transform.register_financial_transactions_source(
+        "buxfer_api", table_name="buxfer_api_transactions", date_column="date"
+    )(transform.conform_buxfer_api_transactions_lazy)
+
+    @transform.register_financial_transactions_source(
+        "bank_csv", table_name="bank_csv_transactions", date_column="posted_dt"
+    )
+    def conform_bank_csv(bank_csv_transactions):
+        return bank_csv_transactions.select(
+            pl.col("uuid").alias("financial_txn_uuid"),
+            pl.col("posted_dt").alias("txn_dt"),
+            pl.col("amount").alias("expense_amt"),
+            pl.col("lifedb_loaded_ts").alias("landing_loaded_ts"),
+        )
+
+    loaded_ts = datetime(2024, 10, 1, tzinfo=timezone.utc)
+    buxfer_transactions = pl.DataFrame(
+        {
+            "id": [1, 2],
+            "date": [date(2024, 9, 30), date(2024, 10, 1)],
+            "transaction_type": ["expense", "income"],
+            "expense_amount": [1.5, -2.0],
+            "description": ["a", "b"],
+            "account_name": ["Checking", "Savings"],
+            "tags": ["food", ""],
+            "lifedb_loaded_ts": [loaded_ts, loaded_ts],
+        }
+    )
+    bank_csv_transactions = pl.LazyFrame(
+        {
+            "uuid": ["c"],
+            "posted_dt": [date(2024, 10, 2)],
+            "amount": [3.0],
+            "lifedb_loaded_ts": [loaded_ts],
+        }
+    )
+
+    financial_transactions = transform.conform_financial_transactions(
+        {
+            "buxfer_api": buxfer_transactions.lazy(),
+            "bank_csv": bank_csv_transactions,
+        }
+    ).collect()
+
+    assert buxfer_conform is transform.conform_buxfer_api_transactions_lazy
+    assert financial_transactions["financial_txn_source"].to_list() == [
+        "buxfer_api",
+        "buxfer_api",
+        "bank_csv",
+    ]
+    assert (
+        financial_transactions.head(2)
+        .drop("financial_txn_source", "landing_loaded_ts")
+        .equals(transform.conform_buxfer_api_transactions(buxfer_transactions))
+    )
+    assert financial_transactions["financial_account"].to_list()[2] is None
+    assert financial_transactions["txn_dt"].to_list() == [
+        date(2024, 9, 30),
+        date(2024, 10, 1),
+        date(2024, 10, 2),
+    ]
+
+
+@pytest.mark.filterwarnings("error::DeprecationWarning")
+def test_explode_financial_transaction_tags_drops_blank_and_repeated_tags():
+    financial_transactions = pl.DataFrame(
+        {
+            "financial_txn_uuid": ["a", "b", "c", "d"],
+            "buxfer__financial_txn_tags": ["food, coffee,food", "", None, "rent"],
+        }
+    )
+
+    tags = transform.explode_financial_transaction_tags(financial_transactions)
+    lazy_tags = transform.explode_financial_transaction_tags(
+        financial_transactions.lazy()
+    ).collect()
+
+    assert tags.rows() == [("a", "food"), ("a", "coffee"), ("d", "rent")]
+    assert lazy_tags.equals(tags)
+
+
+def test_with_row_hash_changes_only_with_hashed_content():
+    loaded_ts = datetime(2024, 10, 1, tzinfo=timezone.utc)
+    transactions = pl.DataFrame(
+        {
+            "id": [1, 2],
+            "amount": [1.5, None],
+            "landing_loaded_ts": [loaded_ts, loaded_ts],
+            "lifedb_loaded_ts": [loaded_ts, loaded_ts],
+        }
+    )
+    restamped = transactions.with_columns(
+        pl.lit(datetime(2024, 10, 2, tzinfo=timezone.utc)).alias(col)
+        for col in ("landing_loaded_ts", "lifedb_loaded_ts")
+    )
+    changed = transactions.with_columns(pl.Series("amount", [1.5, 2.0]))
+
+    def get_hashes(df):
+        return (
+            transform.with_row_hash(df, exclude=["landing_loaded_ts"])
+            .get_column(transform.ROW_HASH_COLUMN)
+            .to_list()
+        )
+
+    assert get_hashes(transactions) == get_hashes(restamped)
+    assert get_hashes(transactions)[0] == get_hashes(changed)[0]
+    assert get_hashes(transactions)[1] != get_hashes(changed)[1]
+    assert get_hashes(transactions.lazy().collect()) == get_hashes(transactions)
+
+
+def test_with_row_hash_hashes_categoricals_by_value():
+    transactions = pl.DataFrame({"id": [1, 2], "status": ["cleared", "pending"]})
+    categorical = transactions.with_columns(pl.col("status").cast(pl.Categorical))
+
+    assert transform.with_row_hash(categorical)[transform.ROW_HASH_COLUMN].equals(
+        transform.with_row_hash(transactions)[transform.ROW_HASH_COLUMN]
+    )